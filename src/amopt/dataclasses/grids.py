@@ -11,3 +11,23 @@ def time_grid(T, Nt):
     dt = T / Nt
     t = dt * np.arange(0, Nt + 1, 1)
     return t
+
+
+# Non-uniform grid on [0, Smax] whose nodes cluster around the given centres (e.g. strike and spot).
+# Node spacing follows the density sum_k 1 / sqrt(alpha^2 + (S - c_k)^2), i.e. a sinh-stretched grid for a single
+# centre: alpha sets the width of the fine region, smaller alpha => stronger clustering.
+def sinh_stock_grid(Smax, steps, centres, alpha):
+    centres = np.atleast_1d(np.asarray(centres, dtype=float))
+
+    def stretch(S):
+        return np.sum(np.arcsinh((S[:, None] - centres) / alpha), axis=1)
+
+    # Invert the monotone stretching function on a fine sample of [0, Smax]
+    S_fine = np.linspace(0, Smax, 64 * steps + 1)
+    xi_fine = stretch(S_fine)
+    xi_fine = (xi_fine - xi_fine[0]) / (xi_fine[-1] - xi_fine[0])
+
+    S = np.interp(np.linspace(0, 1, steps + 1), xi_fine, S_fine)
+    S[0] = 0.0
+    S[-1] = Smax
+    return S
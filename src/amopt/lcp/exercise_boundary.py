@@ -0,0 +1,75 @@
+import numpy as np
+
+
+def boundary_tolerance(K):
+    """Time value below which a node counts as exercised."""
+    return max(1e-10, 1e-6 * K)
+
+
+def exercise_region(option_type, s_grid, boundary):
+    """Nodes on the exercise side of a boundary located by exercise_boundary (below it for puts, above it for
+    calls), excluding the spatial boundary nodes."""
+    if option_type.lower() == 'call':
+        region = s_grid > boundary
+    else:
+        region = s_grid < boundary
+
+    region[[0, -1]] = False
+    return region
+
+
+def exercise_boundary(option_type, s_grid, V, payoff, tol):
+    """
+        Locates the early-exercise boundary of one or many time slices at once. A node is in the continuation region
+        when its time value V - payoff exceeds tol; the boundary is the stock price where the time value crosses tol,
+        linearly interpolated between the last exercised and the first continuation node (puts exercise below the
+        boundary, calls above it). The spatial boundary nodes are excluded. A slice without an exercise region returns
+        the interior grid end on the exercise side, a slice that is exercised everywhere the opposite end.
+
+        Parameters:
+            option_type (string): 'call' or 'put'
+            s_grid (np.ndarray): spatial grid of shape (n_nodes,)
+            V (np.ndarray): option values of shape (n_nodes,) or (n_nodes, n_slices)
+            payoff (np.ndarray): payoff on s_grid
+            tol (float): time value threshold, see boundary_tolerance
+
+        Returns:
+            (float or np.ndarray) boundary of each slice, of shape V.shape[1:]
+        """
+    S_int = s_grid[1:-1]
+    diff = V[1:-1] - payoff[1:-1].reshape((-1,) + (1,) * (V.ndim - 1))
+    n_int = len(S_int)
+
+    continuation = diff > tol
+    any_continuation = continuation.any(axis=0)
+    all_continuation = continuation.all(axis=0)
+
+    # STEP 1: Bracketing nodes - last continuation node for calls, first continuation node for puts
+    if option_type.lower() == 'call':
+        lower = n_int - 1 - np.argmax(continuation[::-1], axis=0)
+        upper = lower + 1
+        no_exercise, all_exercise = S_int[-1], S_int[0]
+    else:
+        upper = np.argmax(continuation, axis=0)
+        lower = upper - 1
+        no_exercise, all_exercise = S_int[0], S_int[-1]
+
+    # The bracket runs off the grid when the continuation region reaches the end on the exercise side
+    off_grid = (lower < 0) | (upper >= n_int)
+    lower = np.clip(lower, 0, n_int - 1)
+    upper = np.clip(upper, 0, n_int - 1)
+
+    # STEP 2: Interpolate where the time value crosses tol
+    d0 = np.take_along_axis(diff, lower[None], axis=0)[0] if diff.ndim > 1 else diff[lower]
+    d1 = np.take_along_axis(diff, upper[None], axis=0)[0] if diff.ndim > 1 else diff[upper]
+    s0, s1 = S_int[lower], S_int[upper]
+
+    flat = d1 == d0
+    weight = np.clip((tol - d0) / np.where(flat, 1.0, d1 - d0), 0.0, 1.0)
+    boundary = np.where(flat, s0, s0 + weight * (s1 - s0))
+
+    boundary = np.where(off_grid, no_exercise, boundary)
+    boundary = np.where(all_continuation, no_exercise, boundary)
+    boundary = np.where(any_continuation, boundary, all_exercise)
+
+    return boundary[()]
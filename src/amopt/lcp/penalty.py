@@ -1,5 +1,10 @@
 import numpy as np
 
+from amopt.uniform.tridiagonal import explicit_rhs, solve_interior
+from amopt.uniform.workspace import Workspace
+from amopt.pricers.pde_solver import collect_slices, march_time_step, slice_stride
+from amopt.lcp.exercise_boundary import exercise_boundary, exercise_region, boundary_tolerance
+
 
 def apply_boundary_conditions(option_type, V, S, K, r, q, T, n, dt):
     tau = T - n * dt
@@ -12,112 +17,196 @@ def apply_boundary_conditions(option_type, V, S, K, r, q, T, n, dt):
         V[-1] = 0
 
 
-def reset_thomas_arrays(c_star, d_star):
-    c_star.fill(0.0)
-    d_star.fill(0.0)
+# Crank–Nicolson penalty PDE solver, the tri-diagonal systems are solved by the kernels in amopt.uniform.tridiagonal
+#
+# penalty is the penalty parameter lambda, every time step runs a policy iteration on the penalised system that stops
+# once the exercise set is stable, the iterate moves by less than tolerance, or after max_iter solves. With
+# return_iterations=True the number of solves per time step is returned alongside the surface.
+# With store_surface=False only the t=0 slice is kept and returned as an (n_nodes, 1) array.
+# workspace (amopt.uniform.workspace.Workspace) provides reusable buffers for the march.
+def penalty_pde_solver(option_type,
+                       L_imp, D_imp, U_imp,
+                       L_exp, D_exp, U_exp,
+                       K, spatial_grid,
+                       T, r, q, time_intervals,
+                       penalty=1e3, tolerance=1e-6, max_iter=50, return_iterations=False, store_surface=True,
+                       workspace=None
+                       ):
+    iterations = np.zeros(time_intervals, dtype=int)
+    slices = penalty_pde_slices(option_type, L_imp, D_imp, U_imp, L_exp, D_exp, U_exp,
+                                K, spatial_grid, T, r, q, time_intervals,
+                                penalty=penalty, tolerance=tolerance, max_iter=max_iter,
+                                every=slice_stride(time_intervals, store_surface), iteration_log=iterations,
+                                workspace=workspace)
 
+    # Returning a 2D array of option values against stock prices and time
+    V_S_t = collect_slices(slices, len(spatial_grid), time_intervals, store_surface)
 
-# Crank–Nicolson PDE solver with Thomas algorithm for tri-diagonal systems
-def penalty_pde_solver(option_type,
+    if return_iterations:
+        return V_S_t, iterations
+
+    return V_S_t
+
+
+# Generator form of penalty_pde_solver: yields (n, V^n) from maturity back to t=0 as each slice is computed.
+# With every=k only every k-th time index is yielded, the maturity and t=0 slices are always yielded.
+# iteration_log, if given, is an array of length time_intervals that receives the number of solves per step.
+# boundary_log, if given, is an array of length time_intervals that receives the exercise boundary of every slice as
+# the march computes it (see exercise_boundary), whether or not the slice is yielded.
+# The march and its policy iterations work in buffers taken from workspace (allocated once when not given), a slice is
+# copied only when it is yielded.
+# initial=(tau0, V0) starts the march from the slice V0 at time to maturity tau0 instead of the payoff, the
+# time_intervals - 1 steps then run from tau0 to T (see march_time_step), so marches of different step sizes chain.
+# warm_start, if given, is an array of length time_intervals holding the exercise boundary of a neighbouring march on
+# the same grid (its boundary_log, e.g. the unbumped contract of a Greek); the exercise set implied by the boundary at
+# each time index seeds that step's policy iteration instead of the previous slice.
+def penalty_pde_slices(option_type,
                        L_imp, D_imp, U_imp,
                        L_exp, D_exp, U_exp,
                        K, spatial_grid,
-                       T, r, q, time_intervals
+                       T, r, q, time_intervals,
+                       penalty=1e3, tolerance=1e-6, max_iter=50, every=1, iteration_log=None,
+                       boundary_log=None, workspace=None, initial=None, warm_start=None
                        ):
-    dt = T / time_intervals
+    dt = march_time_step(T, time_intervals, initial)
 
     # Penalty must be large otherwise lambda = 0 => European Option
-    _lambda = 1e3
-    tolerance = 1e-6
+    if penalty <= 0:
+        raise ValueError("penalty must be positive")
+    if max_iter < 1:
+        raise ValueError("max_iter must be at least 1")
 
-    R = np.zeros(len(spatial_grid))
-    V_new = np.zeros(len(spatial_grid))
-    c_star = np.zeros(len(spatial_grid))
-    d_star = np.zeros(len(spatial_grid))
-    V_S_t = np.zeros((len(spatial_grid), time_intervals))
+    if workspace is None:
+        workspace = Workspace()
+    n_nodes = len(spatial_grid)
+
+    R = workspace.zeros('rhs', n_nodes)
+    V = workspace.get('V', n_nodes)
+    V_new = workspace.zeros('V_new', n_nodes)
+    payoff = workspace.get('payoff', n_nodes)
 
     # STEP 1: Initialise option value at MATURITY i.e. when t = T, V = payoff - comparing element-wise
     if option_type.lower() == 'call':
-        V = np.maximum(spatial_grid - K, 0.0)
-        payoff = np.maximum(spatial_grid - K, 0.0)
+        np.maximum(spatial_grid - K, 0.0, out=payoff)
     else:
-        V = np.maximum(K - spatial_grid, 0.0)
-        payoff = np.maximum(K - spatial_grid, 0.0)
+        np.maximum(K - spatial_grid, 0.0, out=payoff)
+
+    V[:] = payoff if initial is None else initial[1]
+    if boundary_log is not None:
+        boundary_tol = boundary_tolerance(K)
+        boundary_log[time_intervals - 1] = exercise_boundary(option_type, spatial_grid, V, payoff, boundary_tol)
 
-    # Store maturity
-    V_S_t[:, -1] = payoff.copy()
+    # Yield maturity
+    yield time_intervals - 1, V.copy()
 
     # March backwards: solve for n = N-2 ... 0 (t=T-dt ... 0)
     for n in range(time_intervals - 2, -1, -1):
 
         # OLD solution is V^{n+1}
-        V_old = V.copy()
-        apply_boundary_conditions(option_type, V_old, spatial_grid, K, r, q, T, n + 1, dt)
+        apply_boundary_conditions(option_type, V, spatial_grid, K, r, q, T, n + 1, dt)
 
         # NEW-time boundary values (time n) for implicit RHS injection
-        V_new.fill(0.0)
         apply_boundary_conditions(option_type, V_new, spatial_grid, K, r, q, T, n, dt)
         bc_lo = V_new[0]
         bc_hi = V_new[-1]
 
-        # Initial guess for V^n: start from old solution (good warm start)
-        V_guess = V_old.copy()
-
-        constraint = np.inf
-        while constraint > tolerance:
-
-            V_guess_old = V_guess.copy()
-
-            # Exercise indicator based on current guess at time n
-            exercise = (payoff > V_guess).astype(float)
-            exercise[0] = 0.0
-            exercise[-1] = 0.0
-
-            # Build RHS using OLD solution (time n+1)
-            R.fill(0.0)
-            for k in range(1, len(spatial_grid) - 1):
-                R[k] = (
-                        L_exp[k] * V_old[k - 1]
-                        + D_exp[k] * V_old[k]
-                        + U_exp[k] * V_old[k + 1]
-                        + _lambda * dt * payoff[k] * exercise[k]
-                )
-
-            # Inject NEW-time BC into RHS (implicit operator boundary contribution)
-            R[1] -= L_imp[1] * bc_lo
-            R[-2] -= U_imp[-2] * bc_hi
-
-            reset_thomas_arrays(c_star, d_star)
-
-            # Thomas with penalised diagonal
-            denom = D_imp[1] + _lambda * dt * exercise[1]
-            d_star[1] = R[1] / denom
-            c_star[1] = U_imp[1] / denom
-
-            for i in range(2, len(spatial_grid) - 1):
-                denom = (D_imp[i] + _lambda * dt * exercise[i]) - c_star[i - 1] * L_imp[i]
-                c_star[i] = U_imp[i] / denom
-                d_star[i] = (R[i] - d_star[i - 1] * L_imp[i]) / denom
-
-            # Back substitution
-            V_new.fill(0.0)
-            V_new[-2] = d_star[-2]
-            for i in range(len(spatial_grid) - 3, 0, -1):
-                V_new[i] = d_star[i] - c_star[i] * V_new[i + 1]
-
-            # Apply hard constraint and reapply BC
-            V_new = np.maximum(V_new, payoff)
-            V_new[0] = bc_lo
-            V_new[-1] = bc_hi
-
-            V_guess = V_new.copy()
-            constraint = np.max(np.abs(V_guess - V_guess_old))
-
-        # Store solution at time n
-        V_S_t[:, n] = V_guess
-        V = V_guess.copy()
-
-    # time is marching backwards hence we reverse the time column so that we are going forwards in time
-
-    # Returning a 2D array of option values against stock prices and time
-    return V_S_t
+        # Build RHS using OLD solution (time n+1) once, only the penalty term changes between policy iterations
+        explicit_rhs(L_exp, D_exp, U_exp, V, out=R)
+
+        # Inject NEW-time BC into RHS (implicit operator boundary contribution)
+        R[1] -= L_imp[1] * bc_lo
+        R[-2] -= U_imp[-2] * bc_hi
+
+        # Initial guess for V^n: start from old solution (good warm start), with the neighbouring march's exercise set
+        # when given
+        exercise = None
+        if warm_start is not None:
+            exercise = exercise_region(option_type, spatial_grid, warm_start[n])
+        V_step, step_iterations = penalty_time_step(L_imp, D_imp, U_imp, R, payoff, V, bc_lo, bc_hi,
+                                                    penalty * dt, tolerance, max_iter, workspace=workspace,
+                                                    exercise=exercise)
+        if iteration_log is not None:
+            iteration_log[n] = step_iterations
+
+        # Apply hard constraint and reapply BC; the old solution is no longer needed, so its buffer receives the
+        # solution at time n (V_new stays the boundary scratch buffer)
+        np.maximum(V_step, payoff, out=V)
+        V[0] = bc_lo
+        V[-1] = bc_hi
+
+        if boundary_log is not None:
+            boundary_log[n] = exercise_boundary(option_type, spatial_grid, V, payoff, boundary_tol)
+
+        if n % every == 0:
+            yield n, V.copy()
+
+
+def penalty_time_step(L_imp, D_imp, U_imp, R, payoff, V_guess, bc_lo, bc_hi, penalty_dt, tolerance, max_iter,
+                      workspace=None, exercise=None):
+    """
+        Policy iteration for one implicit step of the penalised problem
+            (A + P(V)) V = R + P(V) payoff,   P(V) = penalty_dt * diag(payoff > V)
+
+        Parameters:
+            L_imp, D_imp, U_imp (np.ndarray): implicit Crank–Nicolson coefficients
+            R (np.ndarray): explicit right-hand side with the NEW-time boundary values already injected
+            payoff (np.ndarray): exercise value on the grid
+            V_guess (np.ndarray): warm start used for the first exercise set
+            bc_lo, bc_hi (float): NEW-time boundary values
+            penalty_dt (float): penalty parameter times the time step
+            tolerance (float): stop once the iterate moves by less than this value
+            max_iter (int): maximum number of tri-diagonal solves
+            workspace (Workspace): buffers of the penalised system and of the iterates
+            exercise (np.ndarray): boolean exercise set of the first solve, by default the nodes where payoff > V_guess
+
+        Returns:
+            (np.ndarray, int) unprojected solution (a workspace buffer) and the number of solves performed
+        """
+    if workspace is None:
+        workspace = Workspace()
+    n_nodes = len(R)
+
+    # Penalised diagonal and right-hand side, rebuilt in place on every iteration
+    penalty_term = workspace.get('penalty_term', n_nodes)
+    D_penalised = workspace.get('penalty_diagonal', n_nodes)
+    R_penalised = workspace.get('penalty_rhs', n_nodes)
+    change = workspace.get('penalty_change', n_nodes)
+
+    # The iterates alternate between two buffers, V_guess is only read
+    V = V_guess
+    V_new = workspace.get('penalty_iterate', n_nodes)
+    V_spare = workspace.get('penalty_iterate_spare', n_nodes)
+
+    # Exercise indicator based on current guess at time n
+    if exercise is None:
+        exercise = payoff > V
+        exercise[0] = False
+        exercise[-1] = False
+    exercise_new = np.empty_like(exercise)
+
+    for iteration in range(1, max_iter + 1):
+        np.multiply(exercise, penalty_dt, out=penalty_term)
+        np.add(D_imp, penalty_term, out=D_penalised)
+        np.multiply(penalty_term, payoff, out=R_penalised)
+        R_penalised += R
+
+        # Solve with penalised diagonal
+        solve_interior(L_imp, D_penalised, U_imp, R_penalised, out=V_new, workspace=workspace)
+        V_new[0] = bc_lo
+        V_new[-1] = bc_hi
+
+        np.subtract(V_new, V, out=change)
+        largest_change = np.max(np.abs(change, out=change))
+        V, V_new = V_new, (V_spare if V is V_guess else V)
+
+        # The exercise set is read from the unprojected iterate, a stable set means the next solve would repeat this one
+        np.greater(payoff, V, out=exercise_new)
+        exercise_new[0] = False
+        exercise_new[-1] = False
+
+        if largest_change <= tolerance or np.array_equal(exercise_new, exercise):
+            break
+
+        exercise, exercise_new = exercise_new, exercise
+
+    return V, iteration
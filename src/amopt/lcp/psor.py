@@ -0,0 +1,243 @@
+import numpy as np
+from scipy.linalg import solve_banded
+
+from amopt.lcp.penalty import apply_boundary_conditions
+from amopt.uniform.tridiagonal import explicit_rhs
+from amopt.uniform.workspace import Workspace
+from amopt.pricers.pde_solver import collect_slices, march_time_step, slice_stride
+from amopt.uniform.jit import use_jit, brennan_schwartz_eliminate
+from amopt.lcp.exercise_boundary import exercise_boundary, boundary_tolerance
+
+
+# Crank–Nicolson LCP solver: every implicit step is solved as the linear complementarity problem
+#     A V >= R,  V >= payoff,  (A V - R) . (V - payoff) = 0
+# either iteratively with projected SOR or directly with the Brennan–Schwartz algorithm.
+# With store_surface=False only the t=0 slice is kept and returned as an (n_nodes, 1) array.
+# workspace (amopt.uniform.workspace.Workspace) provides reusable buffers for the march.
+def lcp_pde_solver(option_type,
+                   L_imp, D_imp, U_imp,
+                   L_exp, D_exp, U_exp,
+                   K, spatial_grid,
+                   T, r, q, time_intervals,
+                   method='brennan_schwartz', omega=1.2, tolerance=1e-8, max_iter=500, store_surface=True,
+                   workspace=None
+                   ):
+    slices = lcp_pde_slices(option_type, L_imp, D_imp, U_imp, L_exp, D_exp, U_exp,
+                            K, spatial_grid, T, r, q, time_intervals,
+                            method=method, omega=omega, tolerance=tolerance, max_iter=max_iter,
+                            every=slice_stride(time_intervals, store_surface), workspace=workspace)
+
+    return collect_slices(slices, len(spatial_grid), time_intervals, store_surface)
+
+
+# Generator form of lcp_pde_solver: yields (n, V^n) from maturity back to t=0 as each slice is computed.
+# With every=k only every k-th time index is yielded, the maturity and t=0 slices are always yielded.
+# iteration_log, if given, receives the number of PSOR sweeps per step (1 for Brennan–Schwartz).
+# boundary_log, if given, receives the exercise boundary of every slice, as in penalty_pde_slices.
+# The march swaps two solution buffers (taken from workspace when given) and copies a slice only when it is yielded.
+# initial=(tau0, V0) starts the march from a given slice, as in penalty_pde_slices.
+def lcp_pde_slices(option_type,
+                   L_imp, D_imp, U_imp,
+                   L_exp, D_exp, U_exp,
+                   K, spatial_grid,
+                   T, r, q, time_intervals,
+                   method='brennan_schwartz', omega=1.2, tolerance=1e-8, max_iter=500, every=1, iteration_log=None,
+                   boundary_log=None, workspace=None, initial=None
+                   ):
+    if method not in ('brennan_schwartz', 'psor'):
+        raise ValueError("method must be 'brennan_schwartz' or 'psor'")
+
+    dt = march_time_step(T, time_intervals, initial)
+
+    if workspace is None:
+        workspace = Workspace()
+    n_nodes = len(spatial_grid)
+
+    R = workspace.zeros('rhs', n_nodes)
+    V = workspace.get('V', n_nodes)
+    V_new = workspace.zeros('V_new', n_nodes)
+    payoff = workspace.get('payoff', n_nodes)
+
+    # Interior tri-diagonal system, unchanged across time steps
+    L_int, D_int, U_int = L_imp[1:-1], D_imp[1:-1], U_imp[1:-1]
+
+    # STEP 1: Initialise option value at MATURITY i.e. when t = T, V = payoff
+    if option_type.lower() == 'call':
+        np.maximum(spatial_grid - K, 0.0, out=payoff)
+    else:
+        np.maximum(K - spatial_grid, 0.0, out=payoff)
+
+    V[:] = payoff if initial is None else initial[1]
+    if boundary_log is not None:
+        boundary_tol = boundary_tolerance(K)
+        boundary_log[time_intervals - 1] = exercise_boundary(option_type, spatial_grid, V, payoff, boundary_tol)
+
+    yield time_intervals - 1, V.copy()
+
+    # The Brennan–Schwartz elimination only depends on the matrix, so it is done once for the whole march
+    if method == 'brennan_schwartz':
+        factor = brennan_schwartz_factor(option_type, L_int, D_int, U_int)
+
+    # March backwards: solve for n = N-2 ... 0
+    for n in range(time_intervals - 2, -1, -1):
+
+        # OLD solution is V^{n+1}
+        apply_boundary_conditions(option_type, V, spatial_grid, K, r, q, T, n + 1, dt)
+
+        # NEW-time boundary values (time n) for implicit RHS injection
+        apply_boundary_conditions(option_type, V_new, spatial_grid, K, r, q, T, n, dt)
+
+        # Build RHS using OLD solution (time n+1) and inject NEW-time BC
+        explicit_rhs(L_exp, D_exp, U_exp, V, out=R)
+        R[1] -= L_imp[1] * V_new[0]
+        R[-2] -= U_imp[-2] * V_new[-1]
+
+        if method == 'brennan_schwartz':
+            V_new[1:-1] = brennan_schwartz_solve(factor, R[1:-1], payoff[1:-1])
+            step_iterations = 1
+        else:
+            # Warm start from the old solution
+            V_new[1:-1] = np.maximum(V[1:-1], payoff[1:-1])
+            step_iterations = psor_solve(L_int, D_int, U_int, R[1:-1], payoff[1:-1], V_new[1:-1],
+                                         omega=omega, tolerance=tolerance, max_iter=max_iter)
+
+        if iteration_log is not None:
+            iteration_log[n] = step_iterations
+
+        # The old buffer is reused for the next solve
+        V, V_new = V_new, V
+
+        if boundary_log is not None:
+            boundary_log[n] = exercise_boundary(option_type, spatial_grid, V, payoff, boundary_tol)
+
+        if n % every == 0:
+            yield n, V.copy()
+
+
+def psor_solve(L, D, U, R, payoff, V, omega=1.2, tolerance=1e-8, max_iter=500):
+    """
+        Projected SOR for the interior tri-diagonal LCP, updating V in place. Nodes are swept in red-black order,
+        which for a tri-diagonal matrix converges like the natural ordering while each half-sweep is a single
+        vectorised update.
+
+        Parameters:
+            L, D, U (np.ndarray): interior sub-, main and super-diagonal (L[0] and U[-1] are ignored)
+            R (np.ndarray): right-hand side with boundary contributions already injected
+            payoff (np.ndarray): obstacle (exercise value) on the interior nodes
+            V (np.ndarray): initial guess, overwritten by the solution
+            omega (float): relaxation parameter in (0, 2)
+            tolerance (float): stop once the largest update of a sweep falls below this value
+            max_iter (int): maximum number of sweeps
+
+        Returns:
+            (int) number of sweeps performed
+        """
+    n = len(V)
+
+    # Zero padding removes the need for special cases at the first and last interior node
+    x = np.zeros(n + 2)
+    x[1:-1] = V
+
+    for iteration in range(1, max_iter + 1):
+        largest_update = 0.0
+
+        for colour in (0, 1):
+            i = slice(colour, n, 2)
+            node = slice(colour + 1, n + 1, 2)
+            left = slice(colour, n, 2)
+            right = slice(colour + 2, n + 2, 2)
+
+            gauss_seidel = (R[i] - L[i] * x[left] - U[i] * x[right]) / D[i]
+            updated = np.maximum(payoff[i], x[node] + omega * (gauss_seidel - x[node]))
+
+            largest_update = max(largest_update, np.max(np.abs(updated - x[node]), initial=0.0))
+            x[node] = updated
+
+        if largest_update < tolerance:
+            break
+
+    V[:] = x[1:-1]
+    return iteration
+
+
+def brennan_schwartz_factor(option_type, L, D, U):
+    """Eliminates the tri-diagonal matrix towards the exercise region - the upper diagonal for puts (exercise at low
+    S) and the lower diagonal for calls - so that brennan_schwartz_solve can substitute starting from the exercise
+    region. Calls are handled as a mirrored put."""
+    is_call = option_type.lower() == 'call'
+    if is_call:
+        L, D, U = U[::-1], D[::-1], L[::-1]
+
+    n = len(D)
+    if use_jit():
+        d_prime, multiplier = brennan_schwartz_eliminate(*(np.ascontiguousarray(x, dtype=float) for x in (L, D, U)))
+    else:
+        d_prime = np.zeros(n)
+        multiplier = np.zeros(n)
+
+        d_prime[-1] = D[-1]
+        for i in range(n - 2, -1, -1):
+            multiplier[i] = U[i] / d_prime[i + 1]
+            d_prime[i] = D[i] - multiplier[i] * L[i + 1]
+
+    # Banded storage of the unit upper bi-diagonal system r'_i + m_i r'_{i+1} = R_i
+    ab_rhs = np.zeros((2, n))
+    ab_rhs[0, 1:] = multiplier[:-1]
+    ab_rhs[1] = 1.0
+
+    return is_call, L, d_prime, ab_rhs
+
+
+def brennan_schwartz_solve(factor, R, payoff):
+    """
+        Direct O(N) Brennan–Schwartz solve of the interior LCP for a vanilla put/call, whose exercise region is a
+        single interval touching the low (put) or high (call) end of the grid.
+
+        Parameters:
+            factor (tuple): output of brennan_schwartz_factor
+            R (np.ndarray): right-hand side with boundary contributions already injected
+            payoff (np.ndarray): obstacle (exercise value) on the interior nodes
+
+        Returns:
+            (np.ndarray) interior solution
+        """
+    is_call, L, d_prime, ab_rhs = factor
+    if is_call:
+        R, payoff = R[::-1], payoff[::-1]
+
+    n = len(d_prime)
+
+    # Reduced right-hand side after the elimination - row i now reads L_i V_{i-1} + d'_i V_i = r'_i
+    r_prime = solve_banded((0, 1), ab_rhs, R, check_finite=False)
+
+    # Substitution starts inside the exercise region: while the candidate value built on V_{i-1} = payoff_{i-1}
+    # does not exceed the payoff, the node is exercised
+    candidate = np.empty(n)
+    candidate[0] = r_prime[0] / d_prime[0]
+    candidate[1:] = (r_prime[1:] - L[1:] * payoff[:-1]) / d_prime[1:]
+
+    continuation = np.nonzero(candidate > payoff)[0]
+    V = payoff.copy()
+    if len(continuation) == 0:
+        return V[::-1] if is_call else V
+
+    k = continuation[0]
+    V[k] = candidate[k]
+
+    # Continuation region: plain lower bi-diagonal substitution
+    if k + 1 < n:
+        ab = np.zeros((2, n - k - 1))
+        ab[0] = d_prime[k + 1:]
+        ab[1, :-1] = L[k + 2:]
+        rhs = r_prime[k + 1:].copy()
+        rhs[0] -= L[k + 1] * V[k]
+        V[k + 1:] = solve_banded((1, 0), ab, rhs, check_finite=False)
+
+        # A vanilla payoff has a single exercise interval, if the projection binds again further out finish the
+        # substitution node by node
+        violated = np.nonzero(V[k + 1:] < payoff[k + 1:])[0]
+        if len(violated) > 0:
+            for i in range(k + 1 + violated[0], n):
+                V[i] = max(payoff[i], (r_prime[i] - L[i] * V[i - 1]) / d_prime[i])
+
+    return V[::-1] if is_call else V
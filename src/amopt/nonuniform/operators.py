@@ -0,0 +1,27 @@
+import numpy as np
+
+
+# Black–Scholes spatial operator on a non-uniform grid. With h_m = S_i - S_{i-1} and h_p = S_{i+1} - S_i the
+# three-point first and second derivative weights are
+#   V_S  ~ (-h_p / (h_m (h_m + h_p))) V_{i-1} + ((h_p - h_m) / (h_m h_p)) V_i + (h_m / (h_p (h_m + h_p))) V_{i+1}
+#   V_SS ~ (2 / (h_m (h_m + h_p))) V_{i-1} - (2 / (h_m h_p)) V_i + (2 / (h_p (h_m + h_p))) V_{i+1}
+# which reduce to the central differences of amopt.uniform.operators when h_m = h_p.
+def bs_nonuniform_spatial_operator(S, r, q, sigma):
+    S = np.asarray(S, dtype=float)
+
+    L = np.zeros(np.broadcast_shapes(S.shape, np.shape(r), np.shape(q), np.shape(sigma)))
+    D = np.zeros(L.shape)
+    U = np.zeros(L.shape)
+
+    h_m = S[..., 1:-1] - S[..., :-2]
+    h_p = S[..., 2:] - S[..., 1:-1]
+    S_int = S[..., 1:-1]
+
+    alpha = 0.5 * sigma**2 * S_int**2
+    beta = (r - q) * S_int
+
+    L[..., 1:-1] = (2 * alpha - beta * h_p) / (h_m * (h_m + h_p))
+    D[..., 1:-1] = (-2 * alpha + beta * (h_p - h_m)) / (h_m * h_p) - r
+    U[..., 1:-1] = (2 * alpha + beta * h_m) / (h_p * (h_m + h_p))
+
+    return L, D, U
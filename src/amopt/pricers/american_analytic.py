@@ -0,0 +1,300 @@
+import numpy as np
+from scipy.special import ndtr
+
+from amopt.pricers.closed_form import euro_vanilla_price, euro_vanilla_greeks
+
+ANALYTIC_METHODS = ('baw', 'bjerksund_stensland', 'ju_zhong')
+
+# Gauss–Legendre rule for the bivariate normal integral of bjerksund_stensland_price (|rho| is fixed at ~0.786 there)
+_GL_NODES, _GL_WEIGHTS = np.polynomial.legendre.leggauss(20)
+
+
+def american_analytic_price(kind, S, K, r, q, sigma, T, method='ju_zhong'):
+    """
+        Analytic approximation of American option prices, for screening large chains before escalating the contracts
+        that matter to american_fd_pricer or american_binomial_price. Every method is vectorised: all inputs broadcast
+        and a whole chain is priced in one call.
+
+        Parameters:
+            kind (string or array of strings): 'call' or 'put', per contract or for the whole chain
+            S, K, r, q, sigma, T (float or array): contract and market parameters, broadcast against each other
+            method (string): 'baw' (Barone-Adesi–Whaley), 'bjerksund_stensland' (2002) or 'ju_zhong'
+
+        Returns:
+            (float or np.ndarray) option prices with the broadcast shape of the inputs
+        """
+    if method == 'baw':
+        return baw_price(kind, S, K, r, q, sigma, T)
+    if method == 'bjerksund_stensland':
+        return bjerksund_stensland_price(kind, S, K, r, q, sigma, T)
+    if method == 'ju_zhong':
+        return ju_zhong_price(kind, S, K, r, q, sigma, T)
+
+    raise ValueError("method must be 'baw', 'bjerksund_stensland' or 'ju_zhong'")
+
+
+def baw_price(kind, S, K, r, q, sigma, T):
+    """Barone-Adesi–Whaley quadratic approximation: the early-exercise premium is A (S / S*)**lambda, with the critical
+    price S* from value matching and smooth pasting. Accurate to a few cents for maturities up to about a year."""
+    phi, S, K, r, q, sigma, T, early = _broadcast_american(kind, S, K, r, q, sigma, T)
+
+    lam, _ = quadratic_exponent(phi, r, q, sigma, T)
+    S_star = critical_price(phi, K, r, q, sigma, T, lam)
+
+    # Early exercise premium at S*, from the smooth-pasting condition
+    delta_star = euro_vanilla_greeks(_kind(phi), S_star, K, r, T, sigma, q)['delta']
+    A = phi * S_star * (1 - phi * delta_star) / lam
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        premium = A * (S / S_star) ** lam
+
+    return _assemble(phi, S, K, r, q, sigma, T, early, S_star, premium)
+
+
+def ju_zhong_price(kind, S, K, r, q, sigma, T):
+    """Ju–Zhong approximation: the Barone-Adesi–Whaley premium with the critical price S* unchanged, corrected by a
+    second-order term 1 / (1 - chi) in log-moneyness that accounts for the time dependence the quadratic method
+    ignores. Markedly more accurate than BAW at longer maturities for about the same cost."""
+    phi, S, K, r, q, sigma, T, early = _broadcast_american(kind, S, K, r, q, sigma, T)
+
+    lam, h = quadratic_exponent(phi, r, q, sigma, T)
+    S_star = critical_price(phi, K, r, q, sigma, T, lam)
+
+    beta = 2 * (r - q) / sigma ** 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # STEP 1: Premium scale h A_h from value matching at S*
+        euro_star = euro_vanilla_greeks(_kind(phi), S_star, K, r, T, sigma, q)
+        hA = phi * (S_star - K) - euro_star['price']
+
+        # STEP 2: Second-order correction chi = b ln(S/S*)**2 + c ln(S/S*). alpha = 2r / sigma^2 is folded into
+        # every term that divides by h or r, so that all of them keep a finite limit at r = 0
+        alpha_over_h = _alpha_over_h(r, sigma, T)
+        root = np.sqrt((beta - 1) ** 2 + 4 * alpha_over_h)
+        alpha_d_lam = -phi * alpha_over_h ** 2 / root
+        denominator = 2 * lam + beta - 1
+
+        # alpha dV_E/dh at S*, with dh/dT = r exp(-rT) and dV_E/dT = -theta
+        alpha_dV_dh = -2 * euro_star['theta'] * np.exp(r * T) / sigma ** 2
+
+        b = (1 - h) * alpha_d_lam / (2 * denominator)
+        c = -(1 - h) / denominator * (alpha_dV_dh / hA + alpha_over_h + alpha_d_lam / denominator)
+
+        log_moneyness = np.log(S / S_star)
+        chi = b * log_moneyness ** 2 + c * log_moneyness
+
+        premium = hA * (S / S_star) ** lam / (1 - chi)
+
+    return _assemble(phi, S, K, r, q, sigma, T, early, S_star, premium)
+
+
+def bjerksund_stensland_price(kind, S, K, r, q, sigma, T):
+    """Bjerksund–Stensland (2002) approximation: the exercise boundary is approximated by a flat trigger on each of
+    two sub-periods split at t1 = (sqrt(5) - 1) T / 2. Puts are priced as calls through the American put–call
+    transformation P(S, K, r, q) = C(K, S, q, r). A lower bound on the American price, typically within a few cents."""
+    phi, S, K, r, q, sigma, T, early = _broadcast_american(kind, S, K, r, q, sigma, T)
+
+    # Put-call transformation: swap spot/strike and rate/dividend yield
+    is_call = phi > 0
+    spot = np.where(is_call, S, K)
+    strike = np.where(is_call, K, S)
+    rate = np.where(is_call, r, q)
+    dividend = np.where(is_call, q, r)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        price = _bjerksund_stensland_call(spot, strike, rate, dividend, sigma, T)
+
+    european = euro_vanilla_price(_kind(phi), S, K, r, T, sigma, q)
+    intrinsic = np.maximum(phi * (S - K), 0.0)
+
+    # The approximation is a lower bound, it never goes below the European value
+    price = np.where(early, np.maximum(price, european), european)
+    return np.where(T <= 0, intrinsic, price)[()]
+
+
+def critical_price(phi, K, r, q, sigma, T, lam, tolerance=1e-8, max_iter=50):
+    """
+        Critical stock price S* of the quadratic approximation, solving value matching with smooth pasting,
+        phi (S* - K) = V_E(S*) + phi (1 - phi delta_E(S*)) S* / lam, by a vectorised Newton iteration from the
+        Barone-Adesi–Whaley seed. Contracts that have converged are frozen while the rest iterate.
+
+        Parameters:
+            phi (np.ndarray): +1 for calls, -1 for puts
+            K, r, q, sigma, T (np.ndarray): broadcast contract parameters
+            lam (np.ndarray): exponent of the premium, see quadratic_exponent
+            tolerance (float): relative change of S* at which a contract stops iterating
+            max_iter (int): iteration cap
+
+        Returns:
+            (np.ndarray) critical prices
+        """
+    shape = np.shape(K)
+    phi, K, r, q, sigma, T, lam = (np.ravel(x) for x in (phi, K, r, q, sigma, T, lam))
+    kind = _kind(phi)
+    b = r - q
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # STEP 1: Seed from the perpetual boundary K lam_inf / (lam_inf - 1)
+        lam_inf, _ = quadratic_exponent(phi, r, q, sigma, np.inf)
+        S_inf = K * lam_inf / (lam_inf - 1)
+        decay = (b * T + phi * 2 * sigma * np.sqrt(T)) * K / (K - S_inf)
+        S_star = S_inf + (K - S_inf) * np.exp(decay)
+
+        # STEP 2: Newton on f(S) = phi (S - K) - V_E(S) - phi (1 - phi delta_E(S)) S / lam
+        active = np.isfinite(S_star) & (S_star > 0)
+        for _ in range(max_iter):
+            if not np.any(active):
+                break
+
+            euro = euro_vanilla_greeks(kind[active], S_star[active], K[active], r[active], T[active], sigma[active],
+                                       q[active])
+            p, s, l = phi[active], S_star[active], lam[active]
+            exercise_gap = 1 - p * euro['delta']
+
+            f = p * (s - K[active]) - euro['price'] - p * exercise_gap * s / l
+            f_prime = p * exercise_gap * (1 - 1 / l) + s * euro['gamma'] / l
+
+            # Damped step keeps S* positive
+            step = np.clip(f / f_prime, -0.5 * s, 0.5 * s)
+            S_star[active] = s - step
+
+            converged = np.abs(step) <= tolerance * s
+            active[np.flatnonzero(active)[converged]] = False
+
+    return S_star.reshape(shape)
+
+
+def quadratic_exponent(phi, r, q, sigma, T):
+    """Exponent lambda of the quadratic approximation, the root of sigma^2/2 l(l-1) + (r-q) l - r/h = 0 with the sign
+    of phi, and h = 1 - exp(-rT)."""
+    beta = 2 * (r - q) / sigma ** 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h = -np.expm1(-r * np.where(r == 0, 0.0, T))
+        lam = 0.5 * (-(beta - 1) + phi * np.sqrt((beta - 1) ** 2 + 4 * _alpha_over_h(r, sigma, T)))
+
+    return lam, h
+
+
+def _alpha_over_h(r, sigma, T):
+    """alpha / h = 2 r / (sigma^2 (1 - exp(-rT))), with its limit 2 / (sigma^2 T) at r = 0 (0 for a perpetual)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r_safe = np.where(r == 0, 1.0, r)
+        ratio = 2 * r_safe / (sigma ** 2 * -np.expm1(-r_safe * T))
+        return np.where(r == 0, 2 / (sigma ** 2 * T), ratio)
+
+
+def _bjerksund_stensland_call(S, K, r, q, sigma, T):
+    b = r - q
+    sigma2 = sigma ** 2
+    t1 = 0.5 * (np.sqrt(5) - 1) * T
+
+    # STEP 1: Flat exercise triggers I1 (on [0, t1]) and I2 (on [t1, T])
+    beta = (0.5 - b / sigma2) + np.sqrt((b / sigma2 - 0.5) ** 2 + 2 * r / sigma2)
+    B_inf = beta / (beta - 1) * K
+    B_0 = np.maximum(K, r / (r - b) * K)
+
+    h1 = -(b * t1 + 2 * sigma * np.sqrt(t1)) * K ** 2 / ((B_inf - B_0) * B_0)
+    h2 = -(b * T + 2 * sigma * np.sqrt(T)) * K ** 2 / ((B_inf - B_0) * B_0)
+    I1 = B_0 + (B_inf - B_0) * (1 - np.exp(h1))
+    I2 = B_0 + (B_inf - B_0) * (1 - np.exp(h2))
+    alpha1 = (I1 - K) * I1 ** -beta
+    alpha2 = (I2 - K) * I2 ** -beta
+
+    # STEP 2: Bjerksund–Stensland (2002) call below the trigger
+    args = (S, r, b, sigma, T, t1, I1, I2)
+    price = (alpha2 * S ** beta
+             - alpha2 * _bs_phi(S, t1, beta, I2, I2, r, b, sigma)
+             + _bs_phi(S, t1, 1, I2, I2, r, b, sigma)
+             - _bs_phi(S, t1, 1, I1, I2, r, b, sigma)
+             - K * _bs_phi(S, t1, 0, I2, I2, r, b, sigma)
+             + K * _bs_phi(S, t1, 0, I1, I2, r, b, sigma)
+             + alpha1 * _bs_phi(S, t1, beta, I1, I2, r, b, sigma)
+             - alpha1 * _bs_psi(beta, I1, *args)
+             + _bs_psi(1, I1, *args)
+             - _bs_psi(1, K, *args)
+             - K * _bs_psi(0, I1, *args)
+             + K * _bs_psi(0, K, *args))
+
+    return np.where(S >= I2, S - K, price)
+
+
+def _bs_phi(S, t, gamma, H, I, r, b, sigma):
+    sqrt_t = sigma * np.sqrt(t)
+    lam = (-r + gamma * b + 0.5 * gamma * (gamma - 1) * sigma ** 2) * t
+    d = -(np.log(S / H) + (b + (gamma - 0.5) * sigma ** 2) * t) / sqrt_t
+    kappa = 2 * b / sigma ** 2 + 2 * gamma - 1
+
+    return np.exp(lam) * S ** gamma * (ndtr(d) - (I / S) ** kappa * ndtr(d - 2 * np.log(I / S) / sqrt_t))
+
+
+def _bs_psi(gamma, H, S, r, b, sigma, T, t1, I1, I2):
+    drift = b + (gamma - 0.5) * sigma ** 2
+    sqrt_t1 = sigma * np.sqrt(t1)
+    sqrt_T = sigma * np.sqrt(T)
+    rho = np.sqrt(t1 / T)
+    lam = (-r + gamma * b + 0.5 * gamma * (gamma - 1) * sigma ** 2) * T
+    kappa = 2 * b / sigma ** 2 + 2 * gamma - 1
+
+    e1 = (np.log(S / I1) + drift * t1) / sqrt_t1
+    e2 = (np.log(I2 ** 2 / (S * I1)) + drift * t1) / sqrt_t1
+    e3 = (np.log(S / I1) - drift * t1) / sqrt_t1
+    e4 = (np.log(I2 ** 2 / (S * I1)) - drift * t1) / sqrt_t1
+    f1 = (np.log(S / H) + drift * T) / sqrt_T
+    f2 = (np.log(I2 ** 2 / (S * H)) + drift * T) / sqrt_T
+    f3 = (np.log(I1 ** 2 / (S * H)) + drift * T) / sqrt_T
+    f4 = (np.log(S * I1 ** 2 / (H * I2 ** 2)) + drift * T) / sqrt_T
+
+    return np.exp(lam) * S ** gamma * (bivariate_normal_cdf(-e1, -f1, rho)
+                                       - (I2 / S) ** kappa * bivariate_normal_cdf(-e2, -f2, rho)
+                                       - (I1 / S) ** kappa * bivariate_normal_cdf(-e3, -f3, -rho)
+                                       + (I1 / I2) ** kappa * bivariate_normal_cdf(-e4, -f4, -rho))
+
+
+def bivariate_normal_cdf(a, b, rho):
+    """P(X <= a, Y <= b) for standard normals with correlation rho, vectorised. Uses Plackett's identity
+    M(a, b, rho) = N(a) N(b) + 1/(2 pi) int_0^rho exp(-(a^2 - 2abr + b^2) / (2(1 - r^2))) / sqrt(1 - r^2) dr with a
+    20-point Gauss–Legendre rule, accurate to ~1e-12 for |rho| up to about 0.9."""
+    a, b, rho = (np.asarray(x, dtype=float)[..., None] for x in (a, b, rho))
+    r = 0.5 * rho * (_GL_NODES + 1)
+    one_minus_r2 = 1 - r ** 2
+
+    integrand = np.exp(-(a ** 2 - 2 * a * b * r + b ** 2) / (2 * one_minus_r2)) / np.sqrt(one_minus_r2)
+    integral = 0.5 * rho[..., 0] * np.sum(_GL_WEIGHTS * integrand, axis=-1)
+
+    return (ndtr(a[..., 0]) * ndtr(b[..., 0]) + integral / (2 * np.pi))[()]
+
+
+def _broadcast_american(kind, S, K, r, q, sigma, T):
+    """Broadcast inputs as float arrays, phi = +1 for calls and -1 for puts, and the mask of contracts where early
+    exercise can be optimal (calls need q > 0, puts need r > 0)."""
+    kind = np.asarray(kind)
+    if not np.all(np.isin(kind, ['call', 'put'])):
+        raise ValueError("kind must be 'call' or 'put'")
+
+    is_call, S, K, r, q, sigma, T = (np.array(x, dtype=float) for x in np.broadcast_arrays(
+        kind == 'call', S, K, r, q, sigma, T))
+    phi = np.where(is_call > 0, 1.0, -1.0)
+    early = np.where(phi > 0, q > 0, r > 0) & (T > 0)
+
+    return phi, S, K, r, q, sigma, T, early
+
+
+def _kind(phi):
+    return np.where(phi > 0, 'call', 'put')
+
+
+def _assemble(phi, S, K, r, q, sigma, T, early, S_star, premium):
+    """European price plus premium in the continuation region, intrinsic value beyond S*, European price where early
+    exercise is never optimal."""
+    european = euro_vanilla_price(_kind(phi), S, K, r, T, sigma, q)
+    intrinsic = np.maximum(phi * (S - K), 0.0)
+
+    continuation = phi * (S_star - S) > 0
+    american = np.where(continuation, european + premium, intrinsic)
+
+    # A critical price that could not be found must not silently turn into the payoff
+    american = np.where(np.isfinite(S_star), american, european)
+
+    price = np.where(early, american, european)
+    return np.where(T <= 0, intrinsic, price)[()]
@@ -1,9 +1,12 @@
 import numpy as np
 
+from amopt.pricers.closed_form import euro_vanilla_price
+from amopt.uniform.jit import use_jit, binomial_induction
+
 
 # For a non-dividend paying option it is never optimal to exercise the option early because the continuation
 # value is usually worth more
-def american_binomial_price(kind, S, K, r, q, sigma, T, steps):
+def american_binomial_price(kind, S, K, r, q, sigma, T, steps, smooth=False, tree='crr'):
     """
             Calculates the price of an American option using a two-step binomial tree.
 
@@ -16,57 +19,133 @@ def american_binomial_price(kind, S, K, r, q, sigma, T, steps):
                 sigma (float): stock price volatility
                 T (float): time to maturity (in years)
                 steps (int): number of time steps in the binomial tree
+                smooth (bool): binomial Black–Scholes (BBS) tree, the continuation value one step before maturity
+                    is the Black–Scholes price over dt
+                tree (string): lattice parameters, 'crr' (Cox–Ross–Rubinstein) or 'lr' (Leisen–Reimer, an even
+                    number of steps is rounded up to the next odd one)
 
             Returns:
                 (float) price of the put/call option
             """
+    return american_binomial_batch_price(kind, S, K, r, q, sigma, T, steps, smooth=smooth, tree=tree)[()]
+
+
+def american_binomial_batch_price(kind, S, K, r, q, sigma, T, steps, smooth=False, tree='crr'):
+    """
+            Calculates the prices of many American options at once, every contract being a row of the same
+            vectorised backward induction.
+
+            Parameters:
+                kind (string or array of strings): 'call' or 'put', per contract or for the whole batch
+                S, K, r, q, sigma, T (float or array): contract and market parameters, broadcast against each other
+                steps (int): number of time steps in the binomial tree
+                smooth (bool): binomial Black–Scholes (BBS) tree instead of plain CRR
+                tree (string): 'crr' or 'lr' lattice parameters, as in american_binomial_price
+
+            Returns:
+                (np.ndarray) option prices with the broadcast shape of the inputs
+            """
+    kind, S, K, r, q, sigma, T = np.broadcast_arrays(np.asarray(kind, dtype=str), S, K, r, q, sigma, T)
+    shape = S.shape
+    is_call = (kind == 'call').ravel()
+    S, K, r, q, sigma, T = (np.asarray(x, dtype=float).ravel() for x in (S, K, r, q, sigma, T))
+
+    steps, u, d, p, disc = binomial_tree_parameters(tree, S, K, r, q, sigma, T, steps)
+
+    smoothing = (r, q, sigma, T / steps) if smooth else None
+    prices = binomial_backward_induction(is_call, S, K, u, d, p, disc, steps, american=True, smoothing=smoothing)
+    return prices.reshape(shape)
+
+
+def binomial_tree_parameters(tree, S, K, r, q, sigma, T, steps):
+    """Up/down factors, up probability and one-step discount of a recombining tree, per contract. 'crr' is the
+    Cox–Ross–Rubinstein lattice; 'lr' is the Leisen–Reimer lattice, whose probabilities come from the Peizer–Pratt
+    inversion of d1 and d2 so that the tree is centred on the strike and converges at second order without odd/even
+    oscillation. LR needs an odd number of steps, so steps is returned with the (possibly rounded up) value used.
+    Far from the money with little time left the inversion saturates to 0 or 1 and the LR lattice degenerates; those
+    contracts fall back to the CRR lattice."""
+    if tree not in ('crr', 'lr'):
+        raise ValueError("tree must be 'crr' or 'lr'")
+
     steps = int(steps)
+    if tree == 'lr' and steps % 2 == 0:
+        steps += 1
+
     dt = T / steps
-    u = np.exp(sigma * np.sqrt(dt))
-    d = np.exp(-sigma * np.sqrt(dt))
     a = np.exp((r - q) * dt)
+    disc = np.exp(-r * dt)
 
+    u = np.exp(sigma * np.sqrt(dt))
+    d = np.exp(-sigma * np.sqrt(dt))
     # risk neutral probability discounted by dividend yield
     p = (a - d) / (u - d)
 
-    q_prob = 1 - p
-    disc = np.exp(-r * dt)
+    if tree == 'lr':
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+        d2 = d1 - sigma * np.sqrt(T)
+        p_lr = peizer_pratt_inversion(d2, steps)
+        p_bar = peizer_pratt_inversion(d1, steps)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u_lr = a * p_bar / p_lr
+            d_lr = (a - p_lr * u_lr) / (1 - p_lr)
+
+        # Saturated probabilities give NaN or u <= a, d >= a: keep CRR for those contracts
+        valid = (d_lr < a) & (a < u_lr)
+        u, d, p = (np.where(valid, lr, crr) for lr, crr in ((u_lr, u), (d_lr, d), (p_lr, p)))
+
+    return steps, u, d, p, disc
 
-    # Calculate stock prices up until last node/maturity when t=T
-    terminal_asset_prices = S * d ** np.arange(steps, -1, -1) * u ** np.arange(0, steps + 1)
 
-    # calculate option values at each node of the tree
-    c_maturity = np.maximum(terminal_asset_prices - K, 0)
-    p_maturity = np.maximum(K - terminal_asset_prices, 0)
+def peizer_pratt_inversion(z, steps):
+    """Peizer–Pratt method 2 inversion: the binomial probability whose tail over steps (odd) trials matches N(z)."""
+    return 0.5 + np.sign(z) * np.sqrt(0.25 - 0.25 * np.exp(-(z / (steps + 1 / 3 + 0.1 / (steps + 1))) ** 2
+                                                             * (steps + 1 / 6)))
 
-    # At maturity (t=T) the option's value should equal the payoff vector
-    if kind == 'call':
-        option_values_next = c_maturity
+
+def binomial_backward_induction(is_call, S, K, u, d, p, disc, steps, american=True, smoothing=None):
+    """Recombining-tree backward induction shared by the binomial pricers. All contract inputs are arrays of shape
+    (n_options,), every tree level is handled as one (n_options, i+1) slice operation. With smoothing=(r, q, sigma, dt)
+    the values one step before maturity are Black–Scholes prices over dt (BBS tree) instead of the induction from the
+    terminal payoff."""
+    # Compiled row-by-row induction on the numba backend
+    if use_jit() and smoothing is None:
+        return binomial_induction(np.where(is_call, 1.0, -1.0), *(np.ascontiguousarray(x, dtype=float)
+                                                                  for x in (S, K, u, d, p, disc)), steps, american)
+
+    q_prob = 1 - p
+    sign = np.where(is_call, 1.0, -1.0)[:, None]
+
+    # Precompute the node-price lattice: the asset price at level i after j up moves is S * d**i * (u/d)**j
+    powers = np.arange(0, steps + 1)
+    down_moves = S[:, None] * d[:, None] ** powers
+    up_ratio = (u / d)[:, None] ** powers
+
+    if smoothing is None:
+        # At maturity (t=T) the option's value should equal the payoff vector
+        option_values = np.maximum(sign * (down_moves[:, steps:steps + 1] * up_ratio - K[:, None]), 0.0)
+        last_level = steps
     else:
-        option_values_next = p_maturity
+        # BBS: one step before maturity the continuation value is the Black–Scholes price with dt to expiry
+        r, q, sigma, dt = (x[:, None] for x in smoothing)
+        last_level = steps - 1
+        nodes = down_moves[:, last_level:last_level + 1] * up_ratio[:, 0:last_level + 1]
+        option_values = euro_vanilla_price(np.where(is_call, 'call', 'put')[:, None], nodes, K[:, None], r, dt,
+                                           sigma, q)
+        if american:
+            option_values = np.maximum(option_values, np.maximum(sign * (nodes - K[:, None]), 0.0))
+
+    p = p[:, None]
+    q_prob = q_prob[:, None]
+    disc = disc[:, None]
 
     # Work backwards through tree from the final price of the option to its present time stopping at i=0
-    # i refers to the timestep
-    for i in range(steps, 0, -1):
-        option_values_now = np.zeros(i)
-        # j refers to the number of times the stock price moves up
-        for j in range(0, i, 1):
-            # Calculate intrinsic (exercise) value at each node (i, j)
-            asset_price = S * u ** j * d ** (i - j)
-
-            # Calculate payoff of option at time j - exercise value
-            if kind == 'call':
-                exercise = np.maximum(asset_price - K, 0)
-            else:
-                exercise = np.maximum(K - asset_price, 0)
-
-            # Calculate the value of holding the option
-            continuation = disc * (p * option_values_next[j + 1] + q_prob * option_values_next[j])
-
-            # Compare the intrinsic value of the option against the discounted expected value of its two children
-            option_values_now[j] = np.maximum(exercise, continuation)
-
-        # Shrink the option_values to be of size t=i-1
-        option_values_next = option_values_now
-
-    return option_values_next[0]
+    for i in range(last_level - 1, -1, -1):
+        # Look at all up node children [1:i+2] and all down node children [0:i+1] - value of holding the option
+        option_values = disc * (p * option_values[:, 1:i + 2] + q_prob * option_values[:, 0:i + 1])
+
+        if american:
+            # Compare the discounted expected value of the two children against the intrinsic (exercise) value
+            exercise = np.maximum(sign * (down_moves[:, i:i + 1] * up_ratio[:, 0:i + 1] - K[:, None]), 0.0)
+            option_values = np.maximum(option_values, exercise)
+
+    return option_values[:, 0]
@@ -1,54 +1,118 @@
-from amopt.dataclasses.grids import time_grid, stock_grid
-from amopt.uniform.operators import bs_spatial_operator
-from amopt.pricers.pde_operator import crank_nicholson_exp_coefficients, crank_nicholson_imp_coefficients
-from amopt.lcp.penalty import penalty_pde_solver
-from amopt.pricers.pde_solver import time_marching_pde_solver
+from amopt.pricers.pde_operator import build_cn_operator
+from amopt.lcp.penalty import penalty_pde_slices
+from amopt.lcp.psor import lcp_pde_slices
+from amopt.pricers.pde_solver import time_marching_pde_slices, collect_slices, march_time_step, slice_stride
+from amopt.pricers.interpolation import interpolate_slice, floor_at_payoff
+from amopt.uniform.workspace import Workspace
 
 import numpy as np
 
 
-def american_fd_pricer(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals):
+def american_fd_pricer(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals, lcp_method='penalty',
+                       grid='uniform', grid_alpha=None, interpolation='cubic', align_spot=False, dtype=np.float64,
+                       workspace=None):
     """The pricing logic is intentionally split into two functions.
         american_fd_pricer provides a simple, user-facing API that returns a single option price at a given spot, while
         american_fd_surface exposes the full finite-difference solution and spatial grid.
         This separation keeps the public interface clean while enabling robust testing and validation, such as
         free-boundary enforcement, convergence checks, and intrinsic value comparisons, which require access to the
-        entire price surface rather than a single interpolated value."""
+        entire price surface rather than a single interpolated value.
 
-    fd_prices, s_grid = american_fd_surface(option_type, K, r, q, sigma, T, stock_intervals, time_intervals)
-    # Find which grid price is closest to the actual spot price S
-    idx = np.argmin(np.abs(s_grid - S))
+        S may be an array of spots, all priced from the same solve. The t=0 slice is evaluated at S with the given
+        interpolation ('nearest', 'linear', 'quadratic' or 'cubic'); align_spot=True rescales the grid so that a
+        single spot S is exactly a grid node. The interpolated price is floored at the payoff at S.
 
-    # Extract option value when t=0
-    price = fd_prices[idx, 0]
+        dtype selects the working precision of the march (np.float32 halves its memory traffic), workspace
+        (amopt.uniform.workspace.Workspace) provides buffers to reuse across calls and its dtype takes precedence.
+        The price is interpolated in double precision either way."""
 
-    return price
+    # Only the t=0 slice is needed, so the surface is not stored
+    fd_prices, s_grid = american_fd_surface(option_type, K, r, q, sigma, T, stock_intervals, time_intervals,
+                                            lcp_method=lcp_method, store_surface=False,
+                                            grid=grid, grid_centres=np.append(K, S), grid_alpha=grid_alpha,
+                                            align_to=S if align_spot else None, dtype=dtype, workspace=workspace)
+
+    # Interpolate the option value when t=0 at the actual spot price S
+    price = interpolate_slice(s_grid, fd_prices[:, 0].astype(float), S, method=interpolation)
+
+    return floor_at_payoff(option_type, price, S, K)
 
 
 # The solver is split into a surface-level function and a scalar pricer to keep the public API simple while allowing
 # tests to access the full grid for convergence, boundary, and payoff validation.
-def american_fd_surface(option_type, K, r, q, sigma, T, stock_intervals, time_intervals):
-    dt = T / time_intervals
+# lcp_method selects the early-exercise engine: 'penalty' (penalty_pde_solver), or 'psor' / 'brennan_schwartz'
+# (lcp_pde_solver, one projected solve per time step).
+# With store_surface=False only the t=0 slice is kept, fd_prices then has shape (n_nodes, 1).
+# grid='sinh' clusters the spatial nodes around grid_centres (the strike by default), grid_alpha sets the width of the
+# fine region - see build_spatial_operator.
+# align_to rescales the grid so that the given price (e.g. the spot) is exactly a grid node.
+# boundary_log, if given, receives the exercise boundary of every time index as the solver marches.
+# dtype / workspace select the working precision and the reusable buffers of the march, as in american_fd_pricer.
+def american_fd_surface(option_type, K, r, q, sigma, T, stock_intervals, time_intervals, lcp_method='penalty',
+                        store_surface=True, grid='uniform', grid_centres=None, grid_alpha=None, align_to=None,
+                        boundary_log=None, dtype=np.float64, workspace=None):
+    slices, s_grid = american_fd_slices(option_type, K, r, q, sigma, T, stock_intervals, time_intervals,
+                                        lcp_method=lcp_method, every=slice_stride(time_intervals, store_surface),
+                                        grid=grid, grid_centres=grid_centres, grid_alpha=grid_alpha, align_to=align_to,
+                                        boundary_log=boundary_log, dtype=dtype, workspace=workspace)
+
+    fd_prices = collect_slices(slices, len(s_grid), time_intervals, store_surface)
+
+    return fd_prices, s_grid
+
+
+# Streaming form of american_fd_surface: returns a generator of (n, V^n) time slices, marching from maturity back to
+# t=0, together with the spatial grid. With every=k only every k-th time index (plus maturity and t=0) is yielded.
+# boundary_log (an array of length time_intervals) is filled with the exercise boundary of every time index.
+# The march runs in the workspace's dtype (a new Workspace(dtype) when none is given), the returned grid stays float64.
+# initial=(tau0, V0) continues a march from the slice V0 (on the same grid) at time to maturity tau0 instead of starting
+# from the payoff, with time_intervals - 1 steps from tau0 to T (see march_time_step).
+# warm_start (the boundary_log of a neighbouring march) seeds the policy iteration of lcp_method='penalty', see
+# penalty_pde_slices. The other methods ignore it: Brennan–Schwartz and the European march are direct solves, and the
+# PSOR sweeps are spent converging the continuation region, which an exercise set does not shorten.
+def american_fd_slices(option_type, K, r, q, sigma, T, stock_intervals, time_intervals, lcp_method='penalty',
+                       every=1, grid='uniform', grid_centres=None, grid_alpha=None, align_to=None, boundary_log=None,
+                       dtype=np.float64, workspace=None, initial=None, warm_start=None):
+    if lcp_method not in ('penalty', 'psor', 'brennan_schwartz'):
+        raise ValueError("lcp_method must be 'penalty', 'psor' or 'brennan_schwartz'")
+
+    dt = march_time_step(T, time_intervals, initial)
     Smax = 4 * K
 
-    s_grid = stock_grid(Smax, stock_intervals)
-    # t_grid = time_grid(T, time_intervals)
+    if grid_centres is None:
+        grid_centres = K
 
-    L, D, U = bs_spatial_operator(s_grid, r, q, sigma)
+    # Grid and Crank–Nicolson coefficients, reused from the operator cache when the market state repeats
+    s_grid, (L_imp, D_imp, U_imp), (L_exp, D_exp, U_exp) = build_cn_operator(grid, Smax, stock_intervals, r, q, sigma,
+                                                                              dt, centres=grid_centres,
+                                                                              alpha=grid_alpha, align_to=align_to)
+    # t_grid = time_grid(T, time_intervals)
 
-    L_imp, D_imp, U_imp = crank_nicholson_imp_coefficients(L, D, U, dt)
-    L_exp, D_exp, U_exp = crank_nicholson_exp_coefficients(L, D, U, dt)
+    # Coefficients and grid in the working precision
+    if workspace is None:
+        workspace = Workspace(dtype)
+    L_imp, D_imp, U_imp, L_exp, D_exp, U_exp, march_grid = (np.asarray(x).astype(workspace.dtype, copy=False)
+                                                            for x in (L_imp, D_imp, U_imp, L_exp, D_exp, U_exp,
+                                                                      s_grid))
 
     # Financial logic: no early exercise for calls with zero dividends
     # For a call option with no dividends early-exercise is never optimal
     # Calls should only be exercised if dividends make holding suboptimal
     if q == 0 and option_type.lower() == 'call':
-        fd_prices = time_marching_pde_solver(option_type, L_imp, D_imp, U_imp,
-                                             L_exp, D_exp, U_exp,
-                                             K, s_grid, T, r, q, time_intervals)
+        slices = time_marching_pde_slices(option_type, L_imp, D_imp, U_imp,
+                                          L_exp, D_exp, U_exp,
+                                          K, march_grid, T, r, q, time_intervals, every=every,
+                                          workspace=workspace, boundary_log=boundary_log, initial=initial)
+    elif lcp_method == 'penalty':
+        slices = penalty_pde_slices(option_type, L_imp, D_imp, U_imp,
+                                    L_exp, D_exp, U_exp,
+                                    K, march_grid, T, r, q, time_intervals, every=every,
+                                    boundary_log=boundary_log, workspace=workspace, initial=initial,
+                                    warm_start=warm_start)
     else:
-        fd_prices = penalty_pde_solver(option_type, L_imp, D_imp, U_imp,
-                                       L_exp, D_exp, U_exp,
-                                       K, s_grid, T, r, q, time_intervals)
+        slices = lcp_pde_slices(option_type, L_imp, D_imp, U_imp,
+                                L_exp, D_exp, U_exp,
+                                K, march_grid, T, r, q, time_intervals, method=lcp_method, every=every,
+                                boundary_log=boundary_log, workspace=workspace, initial=initial)
 
-    return fd_prices, s_grid
+    return slices, s_grid
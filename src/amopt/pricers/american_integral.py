@@ -0,0 +1,236 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import ndtr
+
+from amopt.pricers.closed_form import euro_vanilla_price
+from amopt.pricers.american_analytic import critical_price, quadratic_exponent
+
+
+def american_alo_price(option_type, S, K, r, q, sigma, T, collocation_points=32, quadrature_points=64,
+                       integration_points=256, tolerance=1e-12, max_iter=100):
+    """
+        American option price from the early-exercise boundary integral equation, solved with the spectral
+        collocation method of Andersen, Lake and Offengeim (2016). The boundary is held as a Chebyshev interpolant
+        of H = ln(B / X)**2 in sqrt(time to maturity), refined by the FP-B fixed-point iteration with Gauss–Legendre
+        quadrature of its integrals, and the price is the European value plus the early-exercise premium integral.
+        With the default sizes prices are converged to a few 1e-9 or better (strike 100), spots next to the exercise
+        boundary included, at a fixed cost per contract: all spots of one contract share the boundary solve. Close to
+        the boundary the premium integrand jumps near expiry, so the premium integral gets the most points.
+
+        A contract costs a few milliseconds (about 4-5 ms with the default sizes, about 2 ms with 8/16/64 points),
+        not well under one: the ~16 fixed-point iterations to tolerance each evaluate the boundary integrals on a
+        32 x 64 node array, and at these sizes the time goes to NumPy call overhead rather than arithmetic.
+
+        Calls are priced as puts through the put-call symmetry C(S, K, r, q) = P(K, S, q, r), using homogeneity to
+        solve one boundary with strike 1 for all spots. Constant r, q and sigma only.
+
+        Parameters:
+            option_type (string): 'call' or 'put'
+            S (float or array): spot price(s)
+            K, r, q, sigma, T (float): contract and market parameters
+            collocation_points (int): Chebyshev degree n of the boundary interpolant (n + 1 nodes)
+            quadrature_points (int): Gauss–Legendre points of the boundary integrals
+            integration_points (int): Gauss–Legendre points of the premium integral
+            tolerance (float): change of the boundary (relative to the strike) at which the iteration stops
+            max_iter (int): iteration cap of the fixed-point iteration
+
+        Returns:
+            (float or np.ndarray) option prices with the shape of S
+        """
+    option_type = option_type.lower()
+    if option_type not in ('call', 'put'):
+        raise ValueError("option_type must be 'call' or 'put'")
+
+    S = np.asarray(S, dtype=float)
+
+    # STEP 1: Reduce to a put - a call is a put on the strike struck at the spot, with r and q swapped
+    if option_type == 'call':
+        put_spot, put_strike, scale, put_r, put_q = K / S, 1.0, S, q, r
+    else:
+        put_spot, put_strike, scale, put_r, put_q = S, K, 1.0, r, q
+
+    european = euro_vanilla_price(option_type, S, K, r, T, sigma, q)
+    if T <= 0 or put_r <= 0:
+        # Expired, or early exercise is never optimal (puts need r > 0, calls need q > 0)
+        return np.asarray(np.maximum(european, np.maximum(np.where(option_type == 'call', S - K, K - S), 0.0)))[()]
+
+    # STEP 2: Exercise boundary of the put and early-exercise premium at every spot
+    boundary = _put_boundary(put_strike, put_r, put_q, sigma, T, collocation_points, quadrature_points, tolerance,
+                             max_iter)
+    premium = _put_premium(np.atleast_1d(put_spot), put_strike, put_r, put_q, sigma, T, boundary,
+                           integration_points)
+    premium = premium.reshape(np.shape(put_spot))
+
+    price = european + scale * premium
+
+    # Inside the exercise region the value is the payoff
+    exercised = put_spot <= boundary(T)
+    intrinsic = scale * np.maximum(put_strike - put_spot, 0.0)
+    return np.where(exercised, intrinsic, price)[()]
+
+
+def american_alo_boundary(option_type, K, r, q, sigma, T, tau, collocation_points=32, quadrature_points=64,
+                          tolerance=1e-12, max_iter=100):
+    """
+        Early-exercise boundary B(tau) of american_alo_price, at time(s) to maturity tau in [0, T]. A put is exercised
+        below the boundary, a call above it; the call boundary follows from the put boundary with r and q swapped,
+        B_call(tau) = K**2 / B_put(tau). Without early exercise the boundary is 0 (puts) or infinite (calls).
+
+        Parameters:
+            option_type (string): 'call' or 'put'
+            K, r, q, sigma, T (float): contract and market parameters
+            tau (float or array): times to maturity
+            collocation_points, quadrature_points, tolerance, max_iter: as in american_alo_price
+
+        Returns:
+            (float or np.ndarray) boundary with the shape of tau
+        """
+    option_type = option_type.lower()
+    if option_type not in ('call', 'put'):
+        raise ValueError("option_type must be 'call' or 'put'")
+
+    put_r, put_q = (q, r) if option_type == 'call' else (r, q)
+    tau = np.asarray(tau, dtype=float)
+
+    if put_r <= 0:
+        return np.full(tau.shape, np.inf if option_type == 'call' else 0.0)[()]
+
+    boundary = _put_boundary(K, put_r, put_q, sigma, T, collocation_points, quadrature_points, tolerance, max_iter)
+    B = boundary(tau)
+    return (K ** 2 / B if option_type == 'call' else B)[()]
+
+
+def _put_boundary(K, r, q, sigma, T, n, l, tolerance, max_iter):
+    """Solves the put boundary on Chebyshev nodes in sqrt(tau) and returns it as a function of tau."""
+    # Boundary at expiry: K, capped at K r / q when the dividend yield exceeds the rate
+    X = K * min(1.0, r / q) if q > 0 else K
+
+    # STEP 1: Collocation and quadrature nodes, only the scaling by T depends on the contract
+    z, w, theta, interpolation = _collocation_rule(n, l)
+    tau = T * (1 + z) ** 2 / 4
+    u = tau[:, None] * np.sin(theta) ** 2
+    elapsed = tau[:, None] * np.cos(theta) ** 2
+    du_dy = tau[:, None] * np.pi / 4 * np.sin(2 * theta)
+
+    # STEP 2: Initial guess from the closed-form Barone-Adesi–Whaley seed of the critical price, the fixed point
+    # converges from it as fast as from the Newton-refined critical price
+    phi = -np.ones(n + 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lam, _ = quadratic_exponent(phi, r, q, sigma, tau)
+        B = critical_price(phi, np.full(n + 1, K), np.full(n + 1, r), np.full(n + 1, q), np.full(n + 1, sigma),
+                           tau, lam, max_iter=0)
+    B = np.where(np.isfinite(B) & (B > 0), np.minimum(B, X), X)
+    B[tau == 0] = X
+
+    # STEP 3: FP-B fixed-point iteration B = K exp(-(r-q) tau) N(tau, B) / D(tau, B) on the nodes with tau > 0
+    live = tau > 0
+    sqrt_tau = np.sqrt(tau[live])
+    u, elapsed, du_dy, interpolation = u[live], elapsed[live], du_dy[live], interpolation[live]
+
+    # du / sqrt(tau - u) = sqrt(tau) pi / 2 sin(theta) dy
+    singular_dy = sqrt_tau[:, None] * np.pi / 2 * np.sin(theta) / sigma
+    discount_r = w * np.exp(r * u)
+    discount_q = w * np.exp(q * u)
+
+    for _ in range(max_iter):
+        # Boundary at the quadrature nodes from the Chebyshev interpolant of H = ln(B / X)**2
+        B_u = X * np.exp(-np.sqrt(np.maximum(interpolation @ np.log(B / X) ** 2, 0.0)))
+
+        d_minus, d_plus = _d_pm(elapsed, B[live, None] / B_u, r, q, sigma)
+        d_minus_K, d_plus_K = _d_pm(tau[live], B[live] / K, r, q, sigma)
+
+        N = _pdf(d_minus_K) / (sigma * sqrt_tau) + r * np.sum(discount_r * _pdf(d_minus) * singular_dy, axis=1)
+        D = (_pdf(d_plus_K) / (sigma * sqrt_tau) + ndtr(d_plus_K)
+             + q * np.sum(discount_q * (ndtr(d_plus) * du_dy + _pdf(d_plus) * singular_dy), axis=1))
+
+        B_new = B.copy()
+        B_new[live] = np.minimum(K * np.exp(-(r - q) * tau[live]) * N / D, X)
+
+        change = np.max(np.abs(B_new - B)) / K
+        B = B_new
+        if change <= tolerance:
+            break
+
+    return _chebyshev_boundary(np.log(B / X) ** 2, X, T)
+
+
+def _put_premium(S, K, r, q, sigma, T, boundary, p):
+    """Early-exercise premium of the put at spots S, the integral over the remaining life of the interest earned on
+    the strike minus the dividends lost while the spot is below the boundary."""
+    # Same substitution u = T sin(theta)**2 as the boundary integrals
+    y, w = _gauss_legendre(p)
+    theta = np.pi * (1 - y) / 4
+    u = T * np.sin(theta) ** 2
+    elapsed = T * np.cos(theta) ** 2
+    B_u = boundary(u)
+    du_dy = T * np.pi / 4 * np.sin(2 * theta)
+
+    d_minus, d_plus = _d_pm(elapsed, S[:, None] / B_u, r, q, sigma)
+    integrand = (r * K * np.exp(-r * elapsed) * ndtr(-d_minus)
+                 - q * S[:, None] * np.exp(-q * elapsed) * ndtr(-d_plus))
+
+    return np.sum(w * du_dy * integrand, axis=1)
+
+
+def _chebyshev_boundary(H, X, T):
+    """Chebyshev interpolant through H on the nodes cos(i pi / n), returned as the boundary X exp(-sqrt(H)) as a
+    function of tau."""
+    coefficients = _chebyshev_transform(len(H) - 1) @ H
+
+    def boundary(tau):
+        z = 2 * np.sqrt(np.clip(tau, 0.0, T) / T) - 1
+        return X * np.exp(-np.sqrt(np.maximum(np.polynomial.chebyshev.chebval(z, coefficients), 0.0)))
+
+    return boundary
+
+
+# The nodes, weights and matrices below depend only on the sizes, so they are built once per size and shared
+# (read-only) by every contract
+@lru_cache(maxsize=32)
+def _collocation_rule(n, l):
+    """Collocation nodes z_i = cos(i pi / n) (z = 2 sqrt(tau / T) - 1), Gauss–Legendre weights, the substitution
+    angle theta = pi (1 - y) / 4 of the quadrature nodes u = tau sin(theta)**2, and the (n + 1, l, n + 1) matrix
+    mapping H on the collocation nodes to its Chebyshev interpolant at every quadrature node."""
+    z = np.cos(np.arange(n + 1) * np.pi / n)
+    y, w = _gauss_legendre(l)
+    theta = np.pi * (1 - y) / 4
+
+    # At u = tau sin(theta)**2, 2 sqrt(u / T) - 1 = (1 + z) sin(theta) - 1
+    z_u = (1 + z)[:, None] * np.sin(theta) - 1
+    interpolation = np.polynomial.chebyshev.chebvander(z_u, n) @ _chebyshev_transform(n)
+
+    return _read_only(z, w, theta, interpolation)
+
+
+@lru_cache(maxsize=32)
+def _chebyshev_transform(n):
+    """Discrete cosine transform of the extrema grid: Chebyshev coefficients = matrix @ nodal values."""
+    i = np.arange(n + 1)
+    transform = 2 / n * np.cos(np.outer(i, i) * np.pi / n)
+
+    # Halve the first and last node and coefficient
+    transform[:, [0, -1]] *= 0.5
+    transform[[0, -1], :] *= 0.5
+
+    return _read_only(transform)[0]
+
+
+@lru_cache(maxsize=32)
+def _gauss_legendre(points):
+    return _read_only(*np.polynomial.legendre.leggauss(points))
+
+
+def _read_only(*arrays):
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+def _d_pm(tau, ratio, r, q, sigma):
+    d_minus = (np.log(ratio) + (r - q - 0.5 * sigma ** 2) * tau) / (sigma * np.sqrt(tau))
+    return d_minus, d_minus + sigma * np.sqrt(tau)
+
+
+def _pdf(x):
+    return np.exp(-0.5 * x ** 2) / np.sqrt(2 * np.pi)
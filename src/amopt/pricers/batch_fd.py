@@ -0,0 +1,199 @@
+from amopt.dataclasses.grids import stock_grid
+from amopt.uniform.operators import bs_spatial_operator
+from amopt.uniform.tridiagonal import explicit_rhs, solve_interior
+from amopt.uniform.workspace import Workspace
+from amopt.pricers.pde_operator import crank_nicholson_exp_coefficients, crank_nicholson_imp_coefficients
+from amopt.pricers.interpolation import interpolate_slice, floor_at_payoff
+
+import numpy as np
+
+
+def european_fd_batch_pricer(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals,
+                             interpolation='cubic', dtype=np.float64, workspace=None):
+    """
+        Prices a batch of European options with one stacked Crank–Nicolson solve.
+
+        Parameters:
+            option_type (string or array of strings): 'call' or 'put', per contract or for the whole batch
+            S, K, r, q, sigma, T (float or array): contract and market parameters, broadcast against each other
+            stock_intervals (int): number of spatial intervals on each contract's [0, 4K] grid
+            time_intervals (int): number of time intervals
+            interpolation (string): how each t=0 slice is evaluated at S ('nearest', 'linear', 'quadratic', 'cubic')
+            dtype (np.dtype): working precision of the solve, np.float32 halves its memory traffic
+            workspace (Workspace): buffers to reuse across calls, its dtype takes precedence over dtype
+
+        Returns:
+            (np.ndarray) option prices with the broadcast shape of the inputs
+        """
+    return _fd_batch_price(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals, american=False,
+                           interpolation=interpolation, dtype=dtype, workspace=workspace)
+
+
+def american_fd_batch_pricer(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals,
+                             interpolation='cubic', dtype=np.float64, workspace=None):
+    """
+        Prices a batch of American options with one stacked penalty solve. As in american_fd_surface, calls with
+        zero dividends are priced without the early-exercise constraint.
+
+        Parameters:
+            option_type (string or array of strings): 'call' or 'put', per contract or for the whole batch
+            S, K, r, q, sigma, T (float or array): contract and market parameters, broadcast against each other
+            stock_intervals (int): number of spatial intervals on each contract's [0, 4K] grid
+            time_intervals (int): number of time intervals
+            interpolation (string): how each t=0 slice is evaluated at S ('nearest', 'linear', 'quadratic', 'cubic')
+            dtype (np.dtype): working precision of the solve, np.float32 halves its memory traffic
+            workspace (Workspace): buffers to reuse across calls, its dtype takes precedence over dtype
+
+        Returns:
+            (np.ndarray) option prices with the broadcast shape of the inputs
+        """
+    return _fd_batch_price(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals, american=True,
+                           interpolation=interpolation, dtype=dtype, workspace=workspace)
+
+
+def _fd_batch_price(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals, american,
+                    interpolation='cubic', dtype=np.float64, workspace=None):
+    option_type, S, K, r, q, sigma, T = np.broadcast_arrays(np.char.lower(np.asarray(option_type, dtype=str)),
+                                                            S, K, r, q, sigma, T)
+    shape = S.shape
+
+    if not np.all(np.isin(option_type, ['call', 'put'])):
+        raise ValueError("option_type must be 'call' or 'put'")
+
+    is_call = (option_type == 'call').ravel()
+    S, K, r, q, sigma, T = (np.asarray(x, dtype=float).ravel() for x in (S, K, r, q, sigma, T))
+
+    if american:
+        # Financial logic: no early exercise for calls with zero dividends
+        early_exercise = ~(is_call & (q == 0))
+    else:
+        early_exercise = np.zeros(len(S), dtype=bool)
+
+    if workspace is None:
+        workspace = Workspace(dtype)
+
+    V, s_grid = fd_batch_solve(is_call, K, r, q, sigma, T, stock_intervals, time_intervals, early_exercise,
+                               workspace=workspace)
+
+    # Interpolate each contract's t=0 slice at its spot price (in double precision whatever the solve used)
+    prices = interpolate_slice(s_grid.astype(float), V.astype(float), S, method=interpolation)
+    if american:
+        prices = floor_at_payoff(option_type.ravel(), prices, S, K)
+
+    return prices.reshape(shape)
+
+
+def fd_batch_solve(is_call, K, r, q, sigma, T, stock_intervals, time_intervals, early_exercise, workspace=None):
+    """Stacked counterpart of american_fd_surface: each row is one contract on its own [0, 4K] grid. Only the two
+    time slices needed by the march are kept, and the t=0 slice is returned with the (n_options, n_nodes) grids.
+    The march runs in the workspace's precision, the returned slice is a copy in that dtype."""
+    if workspace is None:
+        workspace = Workspace()
+
+    dt = T / time_intervals
+    Smax = 4 * K
+
+    s_grid = stock_grid(Smax[:, None], stock_intervals)
+
+    L, D, U = bs_spatial_operator(s_grid, r[:, None], q[:, None], sigma[:, None])
+
+    L_imp, D_imp, U_imp = crank_nicholson_imp_coefficients(L, D, U, dt[:, None])
+    L_exp, D_exp, U_exp = crank_nicholson_exp_coefficients(L, D, U, dt[:, None])
+
+    # Coefficients and grid in the working precision
+    L_imp, D_imp, U_imp, L_exp, D_exp, U_exp, s_grid = (x.astype(workspace.dtype, copy=False)
+                                                        for x in (L_imp, D_imp, U_imp, L_exp, D_exp, U_exp, s_grid))
+
+    V = batch_penalty_pde_solver(is_call, L_imp, D_imp, U_imp, L_exp, D_exp, U_exp,
+                                 K, s_grid, T, r, q, time_intervals, early_exercise, workspace=workspace)
+
+    return V.copy(), s_grid
+
+
+def apply_batch_boundary_conditions(is_call, V, S, K, r, q, tau):
+    V[:, 0] = np.where(is_call, 0.0, K * np.exp(-r * tau))
+    V[:, -1] = np.where(is_call, S[:, -1] * np.exp(-q * tau) - K * np.exp(-r * tau), 0.0)
+
+
+# Stacked Crank–Nicolson / penalty solver: every row is marched by the same time loop and every step is a single
+# block tri-diagonal solve, so the Python overhead per step is shared by the whole batch. Rows without early exercise
+# are solved once per step, exactly as time_marching_pde_solver does, the rest follow penalty_pde_solver.
+# The slices live in workspace buffers (swapped between steps, no per-step copies) of the workspace's dtype; the
+# returned t=0 slice is a workspace buffer.
+def batch_penalty_pde_solver(is_call, L_imp, D_imp, U_imp, L_exp, D_exp, U_exp,
+                             K, spatial_grid, T, r, q, time_intervals, early_exercise,
+                             penalty=1e3, tolerance=1e-6, max_iter=50, workspace=None):
+    dt = T / time_intervals
+
+    if workspace is None:
+        workspace = Workspace()
+    dtype = workspace.dtype
+
+    R = workspace.zeros('rhs', spatial_grid.shape)
+    V_new = workspace.zeros('V_new', spatial_grid.shape)
+    V_guess = workspace.get('V_guess', spatial_grid.shape)
+
+    # STEP 1: Initialise option value at maturity (payoff)
+    payoff = np.where(is_call[:, None], np.maximum(spatial_grid - K[:, None], 0.0),
+                      np.maximum(K[:, None] - spatial_grid, 0.0)).astype(dtype, copy=False)
+    V = workspace.get('V', spatial_grid.shape)
+    V[:] = payoff
+
+    # Penalty only acts on rows with early exercise, the boundary nodes are never penalised
+    penalty_dt = np.where(early_exercise, penalty * dt, 0.0).astype(dtype)[:, None]
+    penalty_mask = np.ones(spatial_grid.shape[1], dtype=bool)
+    penalty_mask[[0, -1]] = False
+
+    # STEP 2: March backwards: solve for n = N-2 ... 0
+    for n in range(time_intervals - 2, -1, -1):
+
+        # V is the OLD solution at time n+1, so apply BC at n+1
+        apply_batch_boundary_conditions(is_call, V, spatial_grid, K, r, q, T - (n + 1) * dt)
+
+        # NEW-time boundary values (time n) for implicit RHS injection
+        apply_batch_boundary_conditions(is_call, V_new, spatial_grid, K, r, q, T - n * dt)
+        bc_lo = V_new[:, 0].copy()
+        bc_hi = V_new[:, -1].copy()
+
+        # STEP 3: Build RHS using OLD solution once and inject NEW-time BC
+        explicit_rhs(L_exp, D_exp, U_exp, V, out=R)
+        R[:, 1] -= L_imp[:, 1] * bc_lo
+        R[:, -2] -= U_imp[:, -2] * bc_hi
+
+        # STEP 4: Policy iteration, rows drop out of the batch once their exercise set is stable
+        V_guess[:] = V
+        exercise = (payoff > V_guess) & penalty_mask
+        active = np.ones(len(K), dtype=bool)
+
+        for iteration in range(max_iter):
+            # Plain slicing avoids copying the whole batch while every row is still iterating, the full batch
+            # also solves inside the workspace
+            full = np.all(active)
+            rows = slice(None) if full else active
+
+            penalty_term = penalty_dt[rows] * exercise[rows]
+            V_iter = solve_interior(L_imp[rows], D_imp[rows] + penalty_term, U_imp[rows],
+                                    R[rows] + penalty_term * payoff[rows],
+                                    out=workspace.get('V_iter', spatial_grid.shape) if full else None,
+                                    workspace=workspace if full else None)
+            V_iter[:, 0] = bc_lo[rows]
+            V_iter[:, -1] = bc_hi[rows]
+
+            change = np.max(np.abs(V_iter - V_guess[rows]), axis=1)
+            exercise_new = (payoff[rows] > V_iter) & penalty_mask
+            stable = np.all(exercise_new == exercise[rows], axis=1)
+
+            V_guess[rows] = V_iter
+            exercise[rows] = exercise_new
+            active[rows] = early_exercise[rows] & (change > tolerance) & ~stable
+
+            if not np.any(active):
+                break
+
+        # STEP 5: Apply hard constraint (early-exercise rows only), reapply BC and update solution
+        np.maximum(V_guess, payoff, out=V_guess, where=early_exercise[:, None])
+        V_guess[:, 0] = bc_lo
+        V_guess[:, -1] = bc_hi
+        V, V_guess = V_guess, V
+
+    return V
@@ -1,7 +1,11 @@
 import numpy as np
+from scipy.special import gammaln
 
+from amopt.pricers.american_binomial import binomial_tree_parameters
+from amopt.pricers.closed_form import euro_vanilla_price
 
-def european_binomial_price(kind, S, K, r, q, sigma, T, steps):
+
+def european_binomial_price(kind, S, K, r, q, sigma, T, steps, smooth=False, tree='crr'):
     """
         Calculates the price of a European option using a two-step binomial tree.
 
@@ -14,41 +18,63 @@ def european_binomial_price(kind, S, K, r, q, sigma, T, steps):
             sigma (float): stock price volatility
             T (float): time to maturity (in years)
             steps (int): number of time steps in the binomial tree
+            smooth (bool): binomial Black–Scholes (BBS) tree, the last step is replaced by the Black–Scholes price
+                over one time step, which removes the odd/even oscillation of the CRR tree
+            tree (string): lattice parameters, 'crr' (Cox–Ross–Rubinstein) or 'lr' (Leisen–Reimer, an even number
+                of steps is rounded up to the next odd one)
 
         Returns:
             (float) price of the put/call option
         """
-    dt = T/steps
-    u = np.exp(sigma * np.sqrt(dt))
-    d = 1 / u
-    # risk neutral probability discounted by dividend yield
-    p = (np.exp((r-q)*dt) - d) / (u - d)
-    q_prob = 1 - p
-    disc = np.exp(-r * dt)
-
-    # Calculate the stock prices at the last node/maturity
-    asset_prices = S * d ** np.arange(steps, -1, -1) * u ** (np.arange(0, steps+1, 1))
-
-    # calculate option values at each node of the tree
-    c_terminal_payoff = np.maximum(asset_prices - K, np.zeros(steps+1))
-    p_terminal_payoff = np.maximum(K-asset_prices, np.zeros(steps+1))
-
-    # Work backwards through tree from the final price of the option to its present time stopping at i=1
-    if kind == 'call':
-        payoff = c_terminal_payoff
-    else:
-        payoff = p_terminal_payoff
+    return european_binomial_batch_price(kind, S, K, r, q, sigma, T, steps, smooth=smooth, tree=tree)[()]
+
+
+def european_binomial_batch_price(kind, S, K, r, q, sigma, T, steps, smooth=False, tree='crr'):
+    """
+        Calculates the prices of many European options at once. Without early exercise the backward induction of a
+        tree collapses to one discounted, binomially weighted sum over the terminal values,
+
+            V = disc**N * sum_j C(N, j) p**j (1-p)**(N-j) payoff(S d**(N-j) u**j),
+
+        so each contract costs O(N) instead of O(N^2). The weights are formed in log space with log-gamma binomial
+        coefficients, which keeps them finite at 10^5+ steps where C(N, j) and p**j over/underflow.
 
-    for i in range(steps, 0, -1):
-        right_children = payoff[1:i + 1]
-        left_children = payoff[0:i]
+        Parameters:
+            kind (string or array of strings): 'call' or 'put', per contract or for the whole batch
+            S, K, r, q, sigma, T (float or array): contract and market parameters, broadcast against each other
+            steps (int): number of time steps in the binomial tree
+            smooth (bool): binomial Black–Scholes (BBS) tree, the sum runs over the Black–Scholes values one step
+                before maturity
+            tree (string): 'crr' or 'lr' lattice parameters, as in european_binomial_price
 
-        # Look at all up node children [1:i+1] and all down node children [0:i] for each timestep - triangular matrix
-        # Replace payoff vector with the shrunken version
+        Returns:
+            (np.ndarray) option prices with the broadcast shape of the inputs
+        """
+    kind, S, K, r, q, sigma, T = np.broadcast_arrays(np.asarray(kind, dtype=str), S, K, r, q, sigma, T)
+    shape = S.shape
+    is_call = (kind == 'call').ravel()
+    S, K, r, q, sigma, T = (np.asarray(x, dtype=float).ravel()[:, None] for x in (S, K, r, q, sigma, T))
 
-        payoff = disc * (p * right_children + q_prob * left_children)
+    steps, u, d, p, disc = binomial_tree_parameters(tree, S, K, r, q, sigma, T, steps)
 
-    # return the root node which is the option price today
-    return payoff[0]
+    # The log weights need 0 < p < 1, which CRR loses once |r - q| sqrt(T / steps) exceeds about sigma
+    if not np.all((p > 0) & (p < 1)):
+        raise ValueError("up probability outside (0, 1): sigma is too low for r - q at this step size, "
+                         "increase steps")
+
+    # STEP 1: Level whose values are summed, the terminal payoff or (BBS) the Black–Scholes values one step earlier
+    level = steps - 1 if smooth else steps
+    j = np.arange(level + 1)
+    nodes = S * np.exp((level - j) * np.log(d) + j * np.log(u))
+
+    if smooth:
+        values = euro_vanilla_price(np.where(is_call, 'call', 'put')[:, None], nodes, K, r, T / steps, sigma, q)
+    else:
+        values = np.maximum(np.where(is_call[:, None], nodes - K, K - nodes), 0.0)
 
+    # STEP 2: Log-space binomial weights including the discounting over the summed levels
+    log_weights = (gammaln(level + 1) - gammaln(j + 1) - gammaln(level - j + 1)
+                   + j * np.log(p) + (level - j) * np.log1p(-p) + level * np.log(disc))
 
+    prices = np.sum(np.exp(log_weights) * values, axis=1)
+    return prices.reshape(shape)
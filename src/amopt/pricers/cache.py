@@ -0,0 +1,132 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class LRUCache:
+    """
+        Bounded least-recently-used cache for numerical set-up work (grids, operators, solved slices). Entries are
+        evicted oldest-first once either the number of entries or their total array size exceeds its limit. Cached
+        arrays are made read-only so that a caller cannot corrupt an entry shared with later calls.
+
+        Parameters:
+            max_entries (int): maximum number of entries, None for no limit
+            max_bytes (int): maximum total nbytes of the cached arrays, None for no limit
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def nbytes(self):
+        return sum(self._sizes.values())
+
+    def get(self, key, default=None):
+        if key not in self._entries:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key, value):
+        value = _read_only(value)
+        size = _nbytes(value)
+
+        # An entry larger than the whole cache is returned to the caller but never stored
+        if self.max_bytes is not None and size > self.max_bytes:
+            return value
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = value
+        self._sizes[key] = size
+        self._evict()
+        return value
+
+    def get_or_build(self, key, build):
+        """Returns the cached value for key, calling build() and caching its result on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, build())
+        return value
+
+    def invalidate(self, predicate=None):
+        """Drops every entry, or only those whose key satisfies predicate(key). Returns the number dropped."""
+        keys = [key for key in self._entries if predicate is None or predicate(key)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        self.invalidate()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self._entries), 'nbytes': self.nbytes}
+
+    def _remove(self, key):
+        del self._entries[key]
+        del self._sizes[key]
+
+    def _evict(self):
+        while self._entries and ((self.max_entries is not None and len(self._entries) > self.max_entries) or
+                                 (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+
+_MISSING = object()
+
+
+def _read_only(value):
+    if isinstance(value, np.ndarray):
+        value = value.view()
+        value.flags.writeable = False
+        return value
+    if isinstance(value, tuple):
+        return tuple(_read_only(v) for v in value)
+    return value
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sum(_nbytes(v) for v in value)
+    return 0
+
+
+def cache_key(*values):
+    """Hashable key from scalars, arrays and None: floats are normalised so that 0.05 and np.float64(0.05) agree, and
+    arrays are keyed on their contents."""
+    key = []
+    for value in values:
+        if value is None or isinstance(value, str):
+            key.append(value)
+        elif np.ndim(value) == 0:
+            key.append(float(value))
+        else:
+            key.append(tuple(np.asarray(value, dtype=float).ravel().tolist()))
+    return tuple(key)
+
+
+# Shared cache of assembled grids and Crank–Nicolson coefficients, see build_cn_operator
+OPERATOR_CACHE = LRUCache(max_entries=64, max_bytes=64 * 2 ** 20)
@@ -1,26 +1,94 @@
 import numpy as np
-from scipy import stats
+from scipy.special import ndtr
 
 # Take into account dividend yield discounting option price read about this
 
 
 def euro_vanilla_price(kind, S, K, r, T, sigma, q):
+    """Black–Scholes price of a European call/put. All inputs broadcast, so a whole option chain can be priced in one
+    call; scalar inputs return a scalar."""
+    is_call, S, K, r, T, sigma, q = _broadcast_inputs(kind, S, K, r, T, sigma, q)
+
     # Accounting for edge cases where the option is at expiry or there's no uncertainty otherwise the BS-formula breaks
-    if T <= 0:
-        return max(S - K, 0) if kind == "call" else max(K - S, 0)
+    expired = T <= 0
+    T_safe = np.where(expired, 1.0, T)
 
-    d1 = 1/(sigma * np.sqrt(T)) * (np.log(S/K) + (r - q + sigma**2/2) * T)
-    d2 = d1 - sigma * np.sqrt(T)
+    d1, d2 = _d1_d2(S, K, r, T_safe, sigma, q)
+    df_q = np.exp(-q * T_safe)
+    df_r = np.exp(-r * T_safe)
+
+    call = S * df_q * ndtr(d1) - K * df_r * ndtr(d2)
+    put = K * df_r * ndtr(-d2) - S * df_q * ndtr(-d1)
+
+    price = np.where(is_call, call, put)
+    intrinsic = np.where(is_call, np.maximum(S - K, 0), np.maximum(K - S, 0))
+
+    return np.where(expired, intrinsic, price)[()]
+
+
+def euro_vanilla_greeks(kind, S, K, r, T, sigma, q):
+    """
+        Black–Scholes price and analytic Greeks of European calls/puts, evaluated in one vectorised pass.
+
+        Parameters:
+            kind (string or array of strings): 'call' or 'put', per contract or for the whole chain
+            S, K, r, T, sigma, q (float or array): broadcast against each other
 
-    call = S * np.exp(-q*T) * stats.norm.cdf(d1) - K * np.exp(-r*T) * stats.norm.cdf(d2)
-    put = K * np.exp(-r*T) * stats.norm.cdf(-d2) - S * np.exp(-q*T) * stats.norm.cdf(-d1)
+        Returns:
+            (dict) 'price', 'delta', 'gamma', 'vega', 'theta' and 'rho'. Vega and rho are per unit change in sigma and
+            r, theta is the derivative with respect to calendar time per year.
+        """
+    is_call, S, K, r, T, sigma, q = _broadcast_inputs(kind, S, K, r, T, sigma, q)
 
-    if kind == 'call':
-        return call
-    elif kind == 'put':
-        return put
-    else:
+    expired = T <= 0
+    T_safe = np.where(expired, 1.0, T)
+    sqrt_T = np.sqrt(T_safe)
+
+    d1, d2 = _d1_d2(S, K, r, T_safe, sigma, q)
+    df_q = np.exp(-q * T_safe)
+    df_r = np.exp(-r * T_safe)
+    pdf_d1 = np.exp(-0.5 * d1 ** 2) / np.sqrt(2 * np.pi)
+
+    # Sign convention: +1 for calls, -1 for puts, so N(sign * d) covers both payoffs
+    sign = np.where(is_call, 1.0, -1.0)
+    N_d1 = ndtr(sign * d1)
+    N_d2 = ndtr(sign * d2)
+
+    price = sign * (S * df_q * N_d1 - K * df_r * N_d2)
+    delta = sign * df_q * N_d1
+    gamma = df_q * pdf_d1 / (S * sigma * sqrt_T)
+    vega = S * df_q * pdf_d1 * sqrt_T
+    theta = (-S * df_q * pdf_d1 * sigma / (2 * sqrt_T)
+             - sign * r * K * df_r * N_d2
+             + sign * q * S * df_q * N_d1)
+    rho = sign * K * T_safe * df_r * N_d2
+
+    # At expiry only the payoff (and its slope) is left
+    intrinsic = np.maximum(sign * (S - K), 0)
+    in_the_money = sign * (S - K) > 0
+    zero = np.zeros(np.shape(price))
+
+    return {
+        'price': np.where(expired, intrinsic, price)[()],
+        'delta': np.where(expired, np.where(in_the_money, sign, 0.0), delta)[()],
+        'gamma': np.where(expired, zero, gamma)[()],
+        'vega': np.where(expired, zero, vega)[()],
+        'theta': np.where(expired, zero, theta)[()],
+        'rho': np.where(expired, zero, rho)[()],
+    }
+
+
+def _broadcast_inputs(kind, S, K, r, T, sigma, q):
+    kind = np.asarray(kind)
+    if not np.all(np.isin(kind, ['call', 'put'])):
         raise ValueError("kind must be 'call' or 'put'")
 
+    is_call, S, K, r, T, sigma, q = np.broadcast_arrays(kind == 'call', *(np.asarray(x, dtype=float)
+                                                                          for x in (S, K, r, T, sigma, q)))
+    return is_call, S, K, r, T, sigma, q
 
 
+def _d1_d2(S, K, r, T, sigma, q):
+    d1 = 1/(sigma * np.sqrt(T)) * (np.log(S/K) + (r - q + sigma**2/2) * T)
+    d2 = d1 - sigma * np.sqrt(T)
+    return d1, d2
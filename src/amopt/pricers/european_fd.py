@@ -1,38 +1,36 @@
-from amopt.dataclasses.grids import time_grid, stock_grid
-from amopt.uniform.operators import bs_spatial_operator
-from amopt.pricers.pde_operator import crank_nicholson_exp_coefficients, crank_nicholson_imp_coefficients
+from amopt.dataclasses.grids import time_grid
+from amopt.pricers.pde_operator import build_cn_operator
 from amopt.pricers.pde_solver import time_marching_pde_solver
+from amopt.pricers.interpolation import interpolate_slice
 
 import numpy as np
 
 
 # STEP 1: Create function that accepts market parameters and returns an option value
-def european_fd_pricer(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals):
+# grid='sinh' clusters the spatial nodes around the strike and spot (grid_alpha sets the width of the fine region)
+# S may be an array of spots priced from the same solve, interpolation selects how the t=0 slice is evaluated at S
+# ('nearest', 'linear', 'quadratic' or 'cubic') and align_spot=True places a single spot S exactly on a grid node.
+def european_fd_pricer(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals, grid='uniform',
+                       grid_alpha=None, interpolation='cubic', align_spot=False):
 
     # Set value for Smax to truncate the numerical model to an upper boundary instead of infinity - allowing computation
     dt = T / time_intervals
     Smax = 4 * K
 
-    # STEP 2: Construct time and space grid
-    s_grid = stock_grid(Smax, stock_intervals)
+    # STEP 2: Construct time and space grid, STEP 3: Build PDE operator and STEP 4: Create Crank-Nicolson coefficients
+    # (reused from the operator cache when the grid and market state repeat)
+    s_grid, (L_imp, D_imp, U_imp), (L_exp, D_exp, U_exp) = build_cn_operator(grid, Smax, stock_intervals, r, q, sigma,
+                                                                              dt, centres=np.append(K, S),
+                                                                              alpha=grid_alpha,
+                                                                              align_to=S if align_spot else None)
     t_grid = time_grid(T, time_intervals)
 
-    # STEP 3: Build PDE operator
-    L, D, U = bs_spatial_operator(s_grid, r, q, sigma)
+    # STEP 5: Call PDE solver, only the t=0 slice is kept
+    european_fd_prices = time_marching_pde_solver(option_type, L_imp, D_imp, U_imp, L_exp, D_exp, U_exp, K, s_grid, T, r, q, time_intervals,
+                                                  store_surface=False)
 
-    # STEP 4: Create Crank-Nicolson coefficients
-    L_imp, D_imp, U_imp = crank_nicholson_imp_coefficients(L, D, U, dt)
-    L_exp, D_exp, U_exp = crank_nicholson_exp_coefficients(L, D, U, dt)
-
-    # STEP 5: Call PDE solver
-    european_fd_prices = time_marching_pde_solver(option_type, L_imp, D_imp, U_imp, L_exp, D_exp, U_exp, K, s_grid, T, r, q, time_intervals)
-
-    # STEP 6: Return option price at S0 and t=0 - this is already the case for the array we've produced
-    # Find index of grid point closest to S0
-    idx = np.argmin(np.abs(s_grid - S))
-
-    # Extract option price at S0
-    price = european_fd_prices[idx, 0]
+    # STEP 6: Return option price at S0 and t=0 - interpolate the t=0 slice at S0
+    price = interpolate_slice(s_grid, european_fd_prices[:, 0], S, method=interpolation)
 
     return price
 
@@ -0,0 +1,73 @@
+from amopt.pricers.american_fd import american_fd_slices
+from amopt.pricers.pde_solver import collect_slices, slice_stride
+from amopt.pricers.interpolation import interpolate_slice, floor_at_payoff
+
+import numpy as np
+
+
+def american_fd_greeks(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals, lcp_method='penalty',
+                       grid='uniform', grid_alpha=None, interpolation='cubic', sigma_bump=1e-3, rate_bump=1e-4):
+    """
+        Price and Greeks of an American option read off the finite-difference solution instead of bump-and-reprice.
+
+        Delta and gamma are derivatives of the interpolating polynomial of the t=0 slice, theta is a second-order
+        one-sided difference of the three slices nearest t=0 (only these are streamed out of the march, the surface
+        is never stored). Vega and rho are central differences of two neighbour solves each, run on the same spatial
+        grid and keeping only their t=0 slice. The neighbour solves are warm-started from the exercise boundary the
+        base solve records at every step: with lcp_method='penalty' their policy iterations then mostly settle after
+        one tri-diagonal solve per step instead of two, so a full risk line costs about three base solves of
+        tri-diagonal work (five marches) instead of a reprice for every bumped input. Brennan–Schwartz and PSOR
+        neighbours are not warm-started (see american_fd_slices).
+
+        Parameters:
+            option_type (string): 'call' or 'put'
+            S (float or array): spot price(s), all read from the same solves
+            K, r, q, sigma, T (float): contract and market parameters
+            stock_intervals, time_intervals (int): grid resolution, as in american_fd_pricer
+            lcp_method, grid, grid_alpha, interpolation: as in american_fd_pricer
+            sigma_bump (float): absolute volatility shift used for vega
+            rate_bump (float): absolute interest-rate shift used for rho
+
+        Returns:
+            (dict) 'price', 'delta', 'gamma', 'vega', 'theta' and 'rho', with the conventions of euro_vanilla_greeks:
+            vega and rho per unit change in sigma and r, theta the derivative with respect to calendar time per year
+        """
+    if time_intervals < 3:
+        raise ValueError("time_intervals must be at least 3 to estimate theta")
+
+    dt = T / time_intervals
+    grid_kwargs = dict(lcp_method=lcp_method, grid=grid, grid_centres=np.append(K, S), grid_alpha=grid_alpha)
+
+    # STEP 1: Base solve in two pieces, so that only the slices at t = 2dt, dt and 0 leave the march: up to t = 2dt
+    # keeping its last slice, then the last two steps continuing from it. The exercise boundary of every step is
+    # recorded for the neighbour solves (boundary_log views keep the time indices of a single march)
+    boundary = np.zeros(time_intervals)
+    march, s_grid = american_fd_slices(option_type, K, r, q, sigma, T - 2 * dt, stock_intervals, time_intervals - 2,
+                                       every=slice_stride(time_intervals - 2, store_surface=False),
+                                       boundary_log=boundary[2:], **grid_kwargs)
+    V_2dt = collect_slices(march, len(s_grid), time_intervals - 2, store_surface=False)[:, 0]
+    march, _ = american_fd_slices(option_type, K, r, q, sigma, T, stock_intervals, 3, initial=(T - 2 * dt, V_2dt),
+                                  boundary_log=boundary[:3], **grid_kwargs)
+    near_t0 = dict(march)
+
+    # STEP 2: Space derivatives from the interpolating polynomial of the t=0 slice
+    price = floor_at_payoff(option_type, interpolate_slice(s_grid, near_t0[0], S, method=interpolation), S, K)
+    delta = interpolate_slice(s_grid, near_t0[0], S, method=interpolation, derivative=1)
+    gamma = interpolate_slice(s_grid, near_t0[0], S, method=interpolation, derivative=2)
+
+    # STEP 3: Theta, dV/dt at t=0 from the first three time levels
+    V_t = [interpolate_slice(s_grid, near_t0[n], S, method=interpolation) for n in (0, 1, 2)]
+    theta = (-3 * V_t[0] + 4 * V_t[1] - V_t[2]) / (2 * dt)
+
+    # STEP 4: Vega and rho from neighbour solves on the same grid, warm-started from the base exercise boundary
+    def t0_price(r_, sigma_):
+        march, bumped_grid = american_fd_slices(option_type, K, r_, q, sigma_, T, stock_intervals, time_intervals,
+                                                every=slice_stride(time_intervals, store_surface=False),
+                                                warm_start=boundary, **grid_kwargs)
+        V = collect_slices(march, len(bumped_grid), time_intervals, store_surface=False)
+        return interpolate_slice(bumped_grid, V[:, 0], S, method=interpolation)
+
+    vega = (t0_price(r, sigma + sigma_bump) - t0_price(r, sigma - sigma_bump)) / (2 * sigma_bump)
+    rho = (t0_price(r + rate_bump, sigma) - t0_price(r - rate_bump, sigma)) / (2 * rate_bump)
+
+    return {'price': price, 'delta': delta, 'gamma': gamma, 'vega': vega, 'theta': theta, 'rho': rho}
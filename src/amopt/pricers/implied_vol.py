@@ -0,0 +1,151 @@
+from amopt.pricers.closed_form import euro_vanilla_price, euro_vanilla_greeks
+from amopt.pricers.batch_fd import american_fd_batch_pricer
+from amopt.pricers.american_binomial import american_binomial_batch_price
+
+import numpy as np
+
+
+def european_implied_vol(option_type, price, S, K, r, q, T, tolerance=1e-10, max_iter=50, sigma_bounds=(1e-4, 5.0)):
+    """
+        Black–Scholes implied volatility of a chain of European quotes, inverted with safeguarded Newton steps on the
+        analytic vega.
+
+        Parameters:
+            option_type (string or array of strings): 'call' or 'put'
+            price, S, K, r, q, T (float or array): quoted prices and contract parameters, broadcast against each other
+            tolerance (float): absolute price error at which a quote is converged
+            max_iter (int): maximum number of Newton steps
+            sigma_bounds (tuple): volatility search interval
+
+        Returns:
+            (np.ndarray or float) implied volatilities, NaN where the quote is outside the prices reachable within
+            sigma_bounds or has not converged after max_iter steps
+        """
+    option_type, price, S, K, r, q, T = _broadcast_chain(option_type, price, S, K, r, q, T)
+
+    def price_and_vega(rows, sigma):
+        greeks = euro_vanilla_greeks(option_type[rows], S[rows], K[rows], r[rows], T[rows], sigma, q[rows])
+        return greeks['price'], greeks['vega']
+
+    def bound_prices(sigma):
+        return euro_vanilla_price(option_type, S, K, r, T, sigma, q)
+
+    # Brenner–Subrahmanyam at-the-money approximation as the starting point
+    initial = np.sqrt(2 * np.pi / T) * price / S
+
+    vols = _implied_vol_search(price_and_vega, bound_prices, price, initial, tolerance, max_iter, sigma_bounds)
+    return vols.reshape(np.shape(price))[()]
+
+
+def american_implied_vol(option_type, price, S, K, r, q, T, engine='fd', stock_intervals=200, time_intervals=200,
+                         steps=500, tolerance=1e-6, max_iter=20, sigma_bounds=(1e-3, 3.0)):
+    """
+        Implied volatility of a chain of American quotes. Every Newton iteration prices all quotes that have not yet
+        converged in one batched solve, one contract per quote. The vega is the secant through the quote's previous
+        two iterates, so it comes out of the solves the search makes anyway. The first step, which has no previous
+        iterate yet, uses the analytic European vega. The European implied volatility of the quote is the starting
+        point, each iteration restarts from the previous iterate, and converged quotes drop out of the batch.
+
+        Parameters:
+            option_type (string or array of strings): 'call' or 'put'
+            price, S, K, r, q, T (float or array): quoted prices and contract parameters, broadcast against each other
+            engine (string): 'fd' (american_fd_batch_pricer) or 'binomial' (american_binomial_batch_price)
+            stock_intervals, time_intervals (int): FD grid resolution
+            steps (int): number of binomial steps
+            tolerance (float): absolute price error at which a quote is converged
+            max_iter (int): maximum number of Newton steps
+            sigma_bounds (tuple): volatility search interval
+
+        Returns:
+            (np.ndarray or float) implied volatilities, NaN where the quote is outside the prices reachable within
+            sigma_bounds or has not converged after max_iter steps
+        """
+    if engine not in ('fd', 'binomial'):
+        raise ValueError("engine must be 'fd' or 'binomial'")
+
+    option_type, price, S, K, r, q, T = _broadcast_chain(option_type, price, S, K, r, q, T)
+
+    def batch_price(rows, sigma):
+        contract = (option_type[rows], S[rows], K[rows], r[rows], q[rows], sigma, T[rows])
+        if engine == 'fd':
+            return american_fd_batch_pricer(*contract, stock_intervals, time_intervals)
+        return american_binomial_batch_price(*contract, steps)
+
+    # Last iterate priced for every quote, the secant vega of the next step runs through it
+    last_sigma = np.full(len(price), np.nan)
+    last_model = np.full(len(price), np.nan)
+
+    def price_and_vega(rows, sigma):
+        model = batch_price(rows, sigma)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vega = (model - last_model[rows]) / (sigma - last_sigma[rows])
+
+        # No previous iterate (or a degenerate secant): the European vega at the same volatility
+        first = ~np.isfinite(vega) | (vega <= 0)
+        if np.any(first):
+            vega[first] = euro_vanilla_greeks(option_type[rows][first], S[rows][first], K[rows][first], r[rows][first],
+                                              T[rows][first], sigma[first], q[rows][first])['vega']
+
+        last_sigma[rows] = sigma
+        last_model[rows] = model
+        return model, vega
+
+    def bound_prices(sigma):
+        return batch_price(np.arange(len(price)), np.full(len(price), sigma))
+
+    # The European implied volatility of the American quote, the early-exercise premium only pushes it up
+    initial = european_implied_vol(option_type, price, S, K, r, q, T, sigma_bounds=sigma_bounds)
+    initial = np.where(np.isfinite(initial), initial, 0.5 * (sigma_bounds[0] + sigma_bounds[1]))
+
+    vols = _implied_vol_search(price_and_vega, bound_prices, price, np.atleast_1d(initial), tolerance, max_iter,
+                               sigma_bounds)
+    return vols.reshape(np.shape(price))[()]
+
+
+def _broadcast_chain(option_type, price, S, K, r, q, T):
+    option_type = np.char.lower(np.asarray(option_type, dtype=str))
+    if not np.all(np.isin(option_type, ['call', 'put'])):
+        raise ValueError("option_type must be 'call' or 'put'")
+
+    option_type, price, S, K, r, q, T = np.broadcast_arrays(option_type, *(np.asarray(x, dtype=float)
+                                                                          for x in (price, S, K, r, q, T)))
+    return (option_type.ravel(),) + tuple(x.ravel() for x in (price, S, K, r, q, T))
+
+
+def _implied_vol_search(price_and_vega, bound_prices, target, initial, tolerance, max_iter, sigma_bounds):
+    """Newton iteration safeguarded by a per-quote bracket: a step that leaves the bracket (or meets a non-positive
+    vega) is replaced by bisection. Quotes drop out of the batch as soon as their price error is within tolerance,
+    quotes still outside it after max_iter steps are NaN like unreachable ones."""
+    n = len(target)
+    lo = np.full(n, float(sigma_bounds[0]))
+    hi = np.full(n, float(sigma_bounds[1]))
+
+    # Quotes outside the price range spanned by the bounds have no implied volatility
+    reachable = ((target >= bound_prices(sigma_bounds[0]) - tolerance) &
+                 (target <= bound_prices(sigma_bounds[1]) + tolerance))
+
+    sigma = np.clip(initial, lo, hi)
+    active = reachable.copy()
+
+    for iteration in range(max_iter):
+        rows = np.nonzero(active)[0]
+        if len(rows) == 0:
+            break
+
+        model, vega = price_and_vega(rows, sigma[rows])
+        error = model - target[rows]
+
+        # Prices increase with volatility, so the sign of the error tells which side of the root sigma is on
+        hi[rows] = np.where(error > 0, sigma[rows], hi[rows])
+        lo[rows] = np.where(error < 0, sigma[rows], lo[rows])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = sigma[rows] - error / vega
+        outside = ~np.isfinite(newton) | (vega <= 0) | (newton <= lo[rows]) | (newton >= hi[rows])
+        step = np.where(outside, 0.5 * (lo[rows] + hi[rows]), newton)
+
+        converged = np.abs(error) <= tolerance
+        sigma[rows] = np.where(converged, sigma[rows], step)
+        active[rows] = ~converged
+
+    return np.where(reachable & ~active, sigma, np.nan)
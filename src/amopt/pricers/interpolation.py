@@ -0,0 +1,102 @@
+import numpy as np
+
+# Number of grid nodes used by each interpolation scheme
+INTERPOLATION_POINTS = {'nearest': 1, 'linear': 2, 'quadratic': 3, 'cubic': 4}
+
+
+def interpolate_slice(s_grid, values, S, method='cubic', derivative=0):
+    """
+        Evaluates a price slice (or its first/second derivative in S) at arbitrary spots with a local Lagrange
+        polynomial through the nodes surrounding each spot. Works on uniform and non-uniform grids. Spots outside
+        their grid raise a ValueError, the polynomial would extrapolate there without bound.
+
+        Parameters:
+            s_grid (np.ndarray): grid of shape (n_nodes,), or one grid per row of shape (n_rows, n_nodes)
+            values (np.ndarray): option values on the grid, same shape as s_grid
+            S (float or array): spots; with per-row grids there is one spot per row
+            method (string): 'nearest', 'linear', 'quadratic' or 'cubic'
+            derivative (int): 0 for the value, 1 for dV/dS, 2 for d2V/dS2
+
+        Returns:
+            (np.ndarray or float) interpolated values with the shape of S
+        """
+    if method not in INTERPOLATION_POINTS:
+        raise ValueError("method must be 'nearest', 'linear', 'quadratic' or 'cubic'")
+
+    n_points = INTERPOLATION_POINTS[method]
+    if derivative >= n_points:
+        raise ValueError("interpolation method '%s' cannot provide derivative %d" % (method, derivative))
+
+    S = np.asarray(S, dtype=float)
+    s_grid = np.asarray(s_grid, dtype=float)
+    values = np.asarray(values)
+
+    # Flatten spots, and broadcast a single grid against them so that every spot has its own row
+    spots = S.ravel()
+    if s_grid.ndim == 1:
+        s_rows = np.broadcast_to(s_grid, (len(spots), len(s_grid)))
+        v_rows = np.broadcast_to(values, (len(spots), len(s_grid)))
+    else:
+        s_rows, v_rows = s_grid, values
+
+    outside = (spots < s_rows[:, 0]) | (spots > s_rows[:, -1])
+    if np.any(outside):
+        raise ValueError("spot outside the solved grid [%g, %g]" % (s_rows[outside, 0].min(),
+                                                                      s_rows[outside, -1].max()))
+
+    nodes = lagrange_stencil(s_rows, spots, n_points)
+    weights = lagrange_weights(np.take_along_axis(s_rows, nodes, axis=1), spots, derivative)
+
+    interpolated = np.sum(weights * np.take_along_axis(v_rows, nodes, axis=1), axis=1)
+    return interpolated.reshape(S.shape)[()]
+
+
+def floor_at_payoff(option_type, values, S, K):
+    """American values interpolated at S, floored at the exercise value there: a stencil straddling the kink of the
+    slice at the exercise boundary can dip below the payoff, which the American value never does. option_type and K
+    broadcast against S."""
+    is_call = np.char.lower(np.asarray(option_type, dtype=str)) == 'call'
+    S = np.asarray(S, dtype=float)
+    payoff = np.maximum(np.where(is_call, S - K, K - S), 0.0)
+    return np.maximum(values, payoff)[()]
+
+
+def lagrange_stencil(s_rows, spots, n_points):
+    """Indices of the n_points grid nodes surrounding each spot, shape (n_spots, n_points)."""
+    n_nodes = s_rows.shape[1]
+
+    if n_points % 2 == 1:
+        # Odd stencils are centred on the nearest node
+        centre = np.argmin(np.abs(s_rows - spots[:, None]), axis=1)
+        start = centre - n_points // 2
+    else:
+        # Even stencils straddle the spot
+        right = np.sum(s_rows < spots[:, None], axis=1)
+        start = right - n_points // 2
+
+    start = np.clip(start, 0, n_nodes - n_points)
+    return start[:, None] + np.arange(n_points)
+
+
+def lagrange_weights(nodes, spots, derivative=0):
+    """Weights w_j such that sum_j w_j V(nodes_j) is the value (derivative=0), slope (1) or curvature (2) at each spot
+    of the Lagrange polynomial through the nodes. nodes has shape (n_spots, n_points)."""
+    n_points = nodes.shape[1]
+    distance = spots[:, None] - nodes
+    weights = np.zeros(nodes.shape)
+
+    for j in range(n_points):
+        others = [k for k in range(n_points) if k != j]
+        denominator = np.prod([nodes[:, j] - nodes[:, k] for k in others], axis=0)
+
+        if derivative == 0:
+            numerator = np.prod([distance[:, k] for k in others], axis=0)
+        elif derivative == 1:
+            numerator = sum(np.prod([distance[:, k] for k in others if k != a], axis=0) for a in others)
+        else:
+            numerator = sum(np.prod([distance[:, k] for k in others if k not in (a, b)], axis=0)
+                            for a in others for b in others if a != b)
+
+        weights[:, j] = numerator / denominator
+
+    return weights
@@ -0,0 +1,119 @@
+from amopt.uniform.operators import bs_log_operator
+from amopt.uniform.tridiagonal import factorise_tridiagonal, solve_factorised
+from amopt.pricers.interpolation import interpolate_slice, floor_at_payoff
+
+import numpy as np
+
+
+def log_fd_pricer(option_type, S, K, r, q, sigma, T, space_intervals, time_intervals, american=True, n_std=5,
+                  interpolation='cubic'):
+    """
+        Prices options with the log-space Crank–Nicolson engine. All contracts share r, q, sigma and T, hence one
+        x = ln S grid and one factorised step matrix; each distinct strike is a right-hand-side column of the same
+        march.
+
+        Parameters:
+            option_type (string): 'call' or 'put'
+            S, K (float or array): spot and strike prices, broadcast against each other
+            r, q, sigma, T (float): market parameters and time to maturity shared by every contract
+            space_intervals (int): number of intervals of the x = ln S grid
+            time_intervals (int): number of Crank–Nicolson steps from maturity to t=0
+            american (bool): enforce early exercise (calls with q=0 are priced as European, as in american_fd_surface)
+            n_std (float): half-width of the grid beyond the spots/strikes, in standard deviations sigma * sqrt(T)
+            interpolation (string): how the t=0 values are evaluated at ln S ('nearest', 'linear', 'quadratic', 'cubic')
+
+        Returns:
+            (np.ndarray or float) option prices with the broadcast shape of S and K
+        """
+    S, K = np.broadcast_arrays(np.asarray(S, dtype=float), np.asarray(K, dtype=float))
+
+    strikes, strike_idx = np.unique(K, return_inverse=True)
+    x_grid = log_space_grid(S, strikes, sigma, T, space_intervals, n_std)
+
+    V = log_space_pde_solver(option_type, strikes, x_grid, T, r, q, sigma, time_intervals, american=american)
+
+    # Interpolate each contract's strike column at x = ln S
+    column = strike_idx.ravel()
+    x_rows = np.broadcast_to(x_grid, (len(column), len(x_grid)))
+    prices = interpolate_slice(x_rows, V[:, column].T, np.log(S.ravel()), method=interpolation).reshape(S.shape)
+    if american:
+        prices = floor_at_payoff(option_type, prices, S, K)
+    return prices[()]
+
+
+def log_space_grid(S, K, sigma, T, space_intervals, n_std=5):
+    """Uniform grid in x = ln S covering every spot and strike with n_std standard deviations either side."""
+    width = n_std * sigma * np.sqrt(T)
+    x_lo = min(np.min(np.log(S)), np.min(np.log(K))) - width
+    x_hi = max(np.max(np.log(S)), np.max(np.log(K))) + width
+
+    return np.linspace(x_lo, x_hi, space_intervals + 1)
+
+
+# Crank–Nicolson solver in x = ln S. The implicit matrix has constant coefficients, so it is factorised once and every
+# time step is a single LAPACK substitution sweep shared by all strikes (one column each). Marches time_intervals
+# steps of dt = T / time_intervals and returns the t=0 values, shape (n_nodes, n_strikes).
+def log_space_pde_solver(option_type, K, x_grid, T, r, q, sigma, time_intervals, american=True):
+    K = np.atleast_1d(np.asarray(K, dtype=float))
+    is_call = option_type.lower() == 'call'
+
+    # Financial logic: no early exercise for calls with zero dividends
+    early_exercise = american and not (is_call and q == 0)
+
+    dt = T / time_intervals
+    dx = x_grid[1] - x_grid[0]
+    S = np.exp(x_grid)[:, None]
+
+    # STEP 1: Constant-coefficient operator and Crank–Nicolson weights
+    l, d, u = bs_log_operator(dx, r, q, sigma)
+    l_imp, d_imp, u_imp = -0.5 * dt * l, 1 - 0.5 * dt * d, -0.5 * dt * u
+    l_exp, d_exp, u_exp = 0.5 * dt * l, 1 + 0.5 * dt * d, 0.5 * dt * u
+
+    # STEP 2: Factorise the implicit interior matrix once for the whole march
+    n_int = len(x_grid) - 2
+    factor = factorise_tridiagonal(np.full(n_int - 1, l_imp), np.full(n_int, d_imp), np.full(n_int - 1, u_imp))
+
+    # STEP 3: Initialise option value at maturity (payoff), one column per strike
+    if is_call:
+        payoff = np.maximum(S - K, 0.0)
+    else:
+        payoff = np.maximum(K - S, 0.0)
+
+    V = payoff.copy()
+
+    # STEP 4: March from maturity (tau = 0) back to t=0 (tau = T)
+    for step in range(1, time_intervals + 1):
+        bc_lo, bc_hi = log_space_boundary_values(is_call, S[0, 0], S[-1, 0], K, r, q, step * dt, early_exercise)
+
+        # Explicit half-step on the interior nodes and NEW-time BC injection
+        R = l_exp * V[:-2] + d_exp * V[1:-1] + u_exp * V[2:]
+        R[0] -= l_imp * bc_lo
+        R[-1] -= u_imp * bc_hi
+
+        V_new = np.empty_like(V)
+        V_new[1:-1] = solve_factorised(factor, R)
+        V_new[0] = bc_lo
+        V_new[-1] = bc_hi
+
+        # Early exercise: project onto the payoff
+        if early_exercise:
+            V_new = np.maximum(V_new, payoff)
+
+        V = V_new
+
+    return V
+
+
+def log_space_boundary_values(is_call, S_lo, S_hi, K, r, q, tau, early_exercise):
+    if is_call:
+        bc_lo = np.zeros(len(K))
+        bc_hi = S_hi * np.exp(-q * tau) - K * np.exp(-r * tau)
+        if early_exercise:
+            bc_hi = np.maximum(bc_hi, S_hi - K)
+    else:
+        bc_lo = K * np.exp(-r * tau) - S_lo * np.exp(-q * tau)
+        bc_hi = np.zeros(len(K))
+        if early_exercise:
+            bc_lo = np.maximum(bc_lo, K - S_lo)
+
+    return bc_lo, bc_hi
@@ -0,0 +1,73 @@
+from amopt.pricers.american_fd import american_fd_slices
+from amopt.pricers.pde_operator import build_cn_operator
+from amopt.pricers.pde_solver import collect_slices, slice_stride
+from amopt.pricers.interpolation import interpolate_slice, floor_at_payoff
+
+import numpy as np
+
+
+def american_fd_maturity_ladder(option_type, S, K, r, q, sigma, expiries, stock_intervals, time_intervals,
+                                lcp_method='penalty', grid='uniform', grid_alpha=None, interpolation='cubic'):
+    """
+        Prices one contract for a whole ladder of expiries with a single backward march. With constant r, q and
+        sigma, the slice reached after marching a time-to-maturity tau from the payoff is the t=0 price for maturity
+        tau, so the march runs once to the longest expiry and records the slice as it passes each shorter one.
+
+        The time step targets longest_expiry / time_intervals and is adjusted between consecutive expiries so that
+        every expiry is a time node (piecewise-constant dt, see maturity_schedule). Each piece is an american_fd_slices
+        march continuing from the slice where the previous piece stopped, the first one from the payoff at tau = 0.
+        Every expiry is therefore marched in full, unlike american_fd_pricer whose march stops one step short of T.
+
+        Parameters:
+            option_type (string): 'call' or 'put'
+            S (float or array): spot price(s)
+            K, r, q, sigma (float): contract and market parameters
+            expiries (sequence): times to maturity, in any order
+            stock_intervals (int): number of spatial intervals
+            time_intervals (int): number of time steps to the longest expiry
+            lcp_method, grid, grid_alpha, interpolation: as in american_fd_pricer
+
+        Returns:
+            (np.ndarray) prices of shape (len(expiries),) + shape of S, in the order of expiries
+        """
+    expiries = np.asarray(expiries, dtype=float)
+    if np.any(expiries <= 0):
+        raise ValueError("expiries must be positive")
+
+    ladder = np.unique(expiries)
+    schedule = maturity_schedule(ladder, time_intervals)
+    grid_kwargs = dict(lcp_method=lcp_method, grid=grid, grid_centres=np.append(K, S), grid_alpha=grid_alpha)
+
+    # STEP 1: Payoff at tau = 0 on the grid of the march ([0, 4K] as in american_fd_slices, whatever the step)
+    s_grid = build_cn_operator(grid, 4 * K, stock_intervals, r, q, sigma, schedule[0][1],
+                               centres=grid_kwargs['grid_centres'], alpha=grid_alpha)[0]
+    if option_type.lower() == 'call':
+        V = np.maximum(s_grid - K, 0.0)
+    else:
+        V = np.maximum(K - s_grid, 0.0)
+
+    # STEP 2: March each piece of the schedule with its own time step, keeping the slice at every expiry
+    tau = 0.0
+    slices = []
+    for expiry, dt, steps in schedule:
+        piece, _ = american_fd_slices(option_type, K, r, q, sigma, expiry, stock_intervals, steps + 1,
+                                      every=slice_stride(steps + 1, store_surface=False), initial=(tau, V),
+                                      **grid_kwargs)
+        V = collect_slices(piece, len(s_grid), steps + 1, store_surface=False)[:, 0]
+        tau = expiry
+        slices.append(V)
+
+    # STEP 3: Interpolate every expiry's slice at the spot(s), back in the caller's order
+    prices = np.array([interpolate_slice(s_grid, V_T, S, method=interpolation) for V_T in slices])
+    prices = floor_at_payoff(option_type, prices, S, K)
+    return prices[np.searchsorted(ladder, expiries)]
+
+
+def maturity_schedule(expiries, time_intervals):
+    """Piecewise-constant time steps hitting every expiry: returns (expiry, dt, steps) for each gap between
+    consecutive sorted expiries, with dt as close as possible to expiries[-1] / time_intervals."""
+    target_dt = expiries[-1] / time_intervals
+    gaps = np.diff(np.append(0.0, expiries))
+    steps = np.maximum(1, np.rint(gaps / target_dt).astype(int))
+
+    return [(float(expiry), float(gap / n), int(n)) for expiry, gap, n in zip(expiries, gaps, steps)]
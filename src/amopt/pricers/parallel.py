@@ -0,0 +1,82 @@
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+import os
+
+from amopt.pricers.batch_fd import american_fd_batch_pricer, european_fd_batch_pricer
+
+import numpy as np
+
+
+def parallel_fd_price(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals, american=True,
+                      n_workers=None, chunk_size=None, min_parallel=64, executor=None):
+    """
+        Prices an option chain across a process pool. Contracts are split into chunks, every worker prices its chunk
+        with the stacked batch solver and writes the prices straight into a shared-memory array, so only the contract
+        inputs are pickled and nothing is sent back to the parent.
+
+        Parameters:
+            option_type, S, K, r, q, sigma, T (string/float or array): broadcast against each other, as in
+                american_fd_batch_pricer
+            stock_intervals, time_intervals (int): grid resolution of every contract
+            american (bool): American (american_fd_batch_pricer) or European (european_fd_batch_pricer) prices
+            n_workers (int): pool size when no executor is given (also used for chunk sizing), defaults to the number
+                of CPUs
+            chunk_size (int): contracts per task, defaults to an even split into four tasks per worker
+            min_parallel (int): batches smaller than this are priced in-process
+            executor (ProcessPoolExecutor): pool to reuse across calls; when None a pool is created for this call
+
+        Returns:
+            (np.ndarray) option prices with the broadcast shape of the inputs
+        """
+    option_type, S, K, r, q, sigma, T = np.broadcast_arrays(np.asarray(option_type, dtype=str), S, K, r, q, sigma, T)
+    shape = S.shape
+    contracts = [np.ascontiguousarray(x).ravel() for x in (option_type, S, K, r, q, sigma, T)]
+    n_options = len(contracts[1])
+
+    # Small batches: the pool start-up and task overhead would dominate
+    if n_options < min_parallel or n_workers == 1:
+        return _batch_pricer(american)(*contracts, stock_intervals, time_intervals).reshape(shape)
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, int(np.ceil(n_options / (4 * n_workers))))
+
+    results = shared_memory.SharedMemory(create=True, size=n_options * np.dtype(float).itemsize)
+    own_executor = executor is None
+    try:
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=n_workers)
+
+        tasks = [executor.submit(_price_chunk, results.name, n_options, start, min(start + chunk_size, n_options),
+                                 [x[start:start + chunk_size] for x in contracts], stock_intervals, time_intervals,
+                                 american)
+                 for start in range(0, n_options, chunk_size)]
+        wait(tasks)
+        for task in tasks:
+            # Re-raises any worker exception in the parent
+            task.result()
+
+        prices = np.ndarray((n_options,), dtype=float, buffer=results.buf).copy()
+    finally:
+        if own_executor and executor is not None:
+            executor.shutdown()
+        results.close()
+        results.unlink()
+
+    return prices.reshape(shape)
+
+
+def _batch_pricer(american):
+    return american_fd_batch_pricer if american else european_fd_batch_pricer
+
+
+def _price_chunk(shm_name, n_options, start, stop, contracts, stock_intervals, time_intervals, american):
+    """Worker task: prices contracts [start, stop) and writes them into the parent's shared-memory result array."""
+    results = shared_memory.SharedMemory(name=shm_name)
+    try:
+        prices = np.ndarray((n_options,), dtype=float, buffer=results.buf)
+        prices[start:stop] = _batch_pricer(american)(*contracts, stock_intervals, time_intervals)
+        del prices
+    finally:
+        results.close()
@@ -1,29 +1,104 @@
 import numpy as np
 
+from amopt.dataclasses.grids import stock_grid, sinh_stock_grid
+from amopt.uniform.operators import bs_spatial_operator
+from amopt.nonuniform.operators import bs_nonuniform_spatial_operator
+from amopt.pricers.cache import OPERATOR_CACHE, cache_key
 
-def crank_nicholson_imp_coefficients(L, D, U, dt):
-    N = len(L)
-    L_imp = np.zeros(N)
-    D_imp = np.zeros(N)
-    U_imp = np.zeros(N)
 
-    for i in range(N):
-        L_imp[i] = -0.5 * dt * L[i]
-        D_imp[i] = 1 - 0.5 * dt * D[i]
-        U_imp[i] = -0.5 * dt * U[i]
+# The coefficients are built with array arithmetic so that stacked operators of shape (n_options, n_nodes) and
+# per-option time steps dt of shape (n_options, 1) are handled by the same code as a single option.
+def crank_nicholson_imp_coefficients(L, D, U, dt):
+    L_imp = -0.5 * dt * np.asarray(L)
+    D_imp = 1 - 0.5 * dt * np.asarray(D)
+    U_imp = -0.5 * dt * np.asarray(U)
 
     return L_imp, D_imp, U_imp
 
 
 def crank_nicholson_exp_coefficients(L, D, U, dt):
-    N = len(L)
-    L_exp = np.zeros(N)
-    D_exp = np.zeros(N)
-    U_exp = np.zeros(N)
-
-    for i in range(N):
-        L_exp[i] = 0.5 * dt * L[i]
-        D_exp[i] = 1 + 0.5 * dt * D[i]
-        U_exp[i] = 0.5 * dt * U[i]
+    L_exp = 0.5 * dt * np.asarray(L)
+    D_exp = 1 + 0.5 * dt * np.asarray(D)
+    U_exp = 0.5 * dt * np.asarray(U)
 
     return L_exp, D_exp, U_exp
+
+
+def build_spatial_operator(grid, Smax, stock_intervals, r, q, sigma, centres=None, alpha=None, align_to=None):
+    """
+        Builds the spatial grid and the matching Black–Scholes operator for the FD pricers.
+
+        Parameters:
+            grid (string): 'uniform' for an evenly spaced grid on [0, Smax], 'sinh' for a grid clustered around centres
+            Smax (float): upper truncation of the stock price axis
+            stock_intervals (int): number of spatial intervals
+            r, q, sigma (float): market parameters
+            centres (float or sequence): points the 'sinh' grid concentrates nodes around, e.g. strike and spot
+            alpha (float): width of the fine region of the 'sinh' grid, defaults to Smax / 40 (K / 10 when Smax = 4K)
+            align_to (float): if given, the grid is rescaled so that this price (e.g. the spot) is exactly a node
+
+        Returns:
+            (np.ndarray, tuple) spatial grid and the (L, D, U) operator diagonals
+        """
+    if grid == 'uniform':
+        s_grid = stock_grid(Smax, stock_intervals)
+    elif grid == 'sinh':
+        if alpha is None:
+            alpha = Smax / 40
+        s_grid = sinh_stock_grid(Smax, stock_intervals, centres, alpha)
+    else:
+        raise ValueError("grid must be 'uniform' or 'sinh'")
+
+    if align_to is not None:
+        s_grid = align_grid(s_grid, align_to)
+
+    if grid == 'uniform':
+        return s_grid, bs_spatial_operator(s_grid, r, q, sigma)
+
+    return s_grid, bs_nonuniform_spatial_operator(s_grid, r, q, sigma)
+
+
+def build_cn_operator(grid, Smax, stock_intervals, r, q, sigma, dt, centres=None, alpha=None, align_to=None,
+                      cache=OPERATOR_CACHE):
+    """
+        Spatial grid with the implicit and explicit Crank–Nicolson coefficients, memoised on the market state and
+        grid settings. Repeated pricing with the same grid, r, q, sigma and dt skips the set-up entirely; the cached
+        arrays are read-only.
+
+        Parameters:
+            grid, Smax, stock_intervals, r, q, sigma, centres, alpha, align_to: as in build_spatial_operator
+            dt (float): time step
+            cache (LRUCache): cache to consult, None to always rebuild
+
+        Returns:
+            (np.ndarray, tuple, tuple) spatial grid, (L_imp, D_imp, U_imp) and (L_exp, D_exp, U_exp)
+        """
+    def build():
+        s_grid, (L, D, U) = build_spatial_operator(grid, Smax, stock_intervals, r, q, sigma, centres=centres,
+                                                   alpha=alpha, align_to=align_to)
+        return (s_grid, crank_nicholson_imp_coefficients(L, D, U, dt),
+                crank_nicholson_exp_coefficients(L, D, U, dt))
+
+    if cache is None:
+        return build()
+
+    # The uniform grid does not depend on the centres or alpha, so they are left out of its key
+    if grid == 'uniform':
+        centres, alpha = None, None
+
+    key = cache_key('cn_operator', grid, Smax, stock_intervals, r, q, sigma, dt, centres, alpha, align_to)
+    return cache.get_or_build(key, build)
+
+
+def align_grid(s_grid, S):
+    """Rescales the grid so that its interior node closest to S lands exactly on S. Scaling keeps the grid's shape
+    (uniform stays uniform), only Smax moves by less than half a local grid spacing."""
+    if np.ndim(S) != 0:
+        raise ValueError("only a single spot can be aligned to the grid")
+    if not 0 < S < s_grid[-1]:
+        raise ValueError("spot must lie inside the grid to be aligned")
+
+    idx = np.argmin(np.abs(s_grid[1:-1] - S)) + 1
+    aligned = s_grid * (S / s_grid[idx])
+    aligned[idx] = S
+    return aligned
@@ -1,5 +1,9 @@
 import numpy as np
 
+from amopt.uniform.tridiagonal import explicit_rhs, solve_interior
+from amopt.uniform.workspace import Workspace
+from amopt.lcp.exercise_boundary import exercise_boundary, boundary_tolerance
+
 
 def apply_boundary_conditions(option_type, V, S, K, r, q, T, n, dt):
     tau = (T - n * dt)
@@ -12,30 +16,56 @@ def apply_boundary_conditions(option_type, V, S, K, r, q, T, n, dt):
         V[-1] = 0
 
 
-def reset_thomas_arrays(c_star, d_star):
-    c_star.fill(0.0)
-    d_star.fill(0.0)
-
-
-# Crank–Nicolson PDE solver with Thomas algorithm for tri-diagonal systems
+# Crank–Nicolson PDE solver, the tri-diagonal systems are solved by the kernels in amopt.uniform.tridiagonal
+# With store_surface=False only the slices needed by the march are kept and an (n_nodes, 1) array holding the t=0
+# slice is returned in place of the full (n_nodes, time_intervals) surface.
+# workspace (amopt.uniform.workspace.Workspace) provides reusable buffers for the march.
 def time_marching_pde_solver(option_type, L_imp, D_imp, U_imp, L_exp, D_exp, U_exp,
-                             K, spatial_grid, T, r, q, time_intervals):
-    dt = T / time_intervals
-
-    V_S_t = np.zeros((len(spatial_grid), time_intervals))
-    R = np.zeros(len(spatial_grid))
-    V_new = np.zeros(len(spatial_grid))
-    c_star = np.zeros(len(spatial_grid))
-    d_star = np.zeros(len(spatial_grid))
+                             K, spatial_grid, T, r, q, time_intervals, store_surface=True, workspace=None):
+    slices = time_marching_pde_slices(option_type, L_imp, D_imp, U_imp, L_exp, D_exp, U_exp,
+                                      K, spatial_grid, T, r, q, time_intervals,
+                                      every=slice_stride(time_intervals, store_surface), workspace=workspace)
+
+    return collect_slices(slices, len(spatial_grid), time_intervals, store_surface)
+
+
+# Generator form of time_marching_pde_solver: yields (n, V^n) from maturity back to t=0 as each slice is computed.
+# With every=k only every k-th time index is yielded, the maturity and t=0 slices are always yielded.
+# The march swaps two solution buffers (taken from workspace when given) and copies a slice only when it is yielded.
+# boundary_log, if given, receives the exercise boundary of every slice, as in penalty_pde_slices (for a European
+# march this is where the time value first drops to the exercise tolerance).
+# initial=(tau0, V0) starts the march from the slice V0 at time to maturity tau0 instead of the payoff, the
+# time_intervals - 1 steps then run from tau0 to T (see march_time_step), so marches of different step sizes chain.
+def time_marching_pde_slices(option_type, L_imp, D_imp, U_imp, L_exp, D_exp, U_exp,
+                             K, spatial_grid, T, r, q, time_intervals, every=1, workspace=None,
+                             boundary_log=None, initial=None):
+    dt = march_time_step(T, time_intervals, initial)
+
+    if workspace is None:
+        workspace = Workspace()
+    n_nodes = len(spatial_grid)
+
+    R = workspace.zeros('rhs', n_nodes)
+    V = workspace.get('V', n_nodes)
+    V_new = workspace.zeros('V_new', n_nodes)
 
     # STEP 1: Initialise option value at maturity (payoff) - comparing element-wise
     if option_type.lower() == 'call':
-        V = np.maximum(spatial_grid - K, 0.0)
+        np.maximum(spatial_grid - K, 0.0, out=V)
     else:
-        V = np.maximum(K - spatial_grid, 0.0)
+        np.maximum(K - spatial_grid, 0.0, out=V)
 
-    # Store maturity explicitly
-    V_S_t[:, -1] = V.copy()
+    if boundary_log is not None:
+        payoff = V.copy()
+    if initial is not None:
+        V[:] = initial[1]
+
+    if boundary_log is not None:
+        boundary_tol = boundary_tolerance(K)
+        boundary_log[time_intervals - 1] = exercise_boundary(option_type, spatial_grid, V, payoff, boundary_tol)
+
+    # Yield maturity explicitly
+    yield time_intervals - 1, V.copy()
 
     # STEP 2: March backwards in time using Crank–Nicolson
     # We solve for n = time_intervals-2 ... 0
@@ -50,41 +80,55 @@ def time_marching_pde_solver(option_type, L_imp, D_imp, U_imp, L_exp, D_exp, U_e
         bc_lo = V_new[0]
         bc_hi = V_new[-1]
 
-        # STEP 4: Reset RHS vector for current time step
-        R.fill(0.0)
-
-        for k in range(1, len(spatial_grid) - 1):
-            # STEP 5: Build RHS using explicit Crank–Nicolson operator (interior nodes)
-            R[k] = (L_exp[k] * V[k - 1]) + (D_exp[k] * V[k]) + (U_exp[k] * V[k + 1])
+        # STEP 4: Build RHS using explicit Crank–Nicolson operator (interior nodes)
+        explicit_rhs(L_exp, D_exp, U_exp, V, out=R)
 
+        # STEP 5: Inject NEW-time BC into RHS (implicit operator boundary contribution)
         R[1] -= L_imp[1] * bc_lo
         R[-2] -= U_imp[-2] * bc_hi
 
-        # STEP 6: Reset Thomas algorithm work arrays
-        reset_thomas_arrays(c_star, d_star)
+        # STEP 6: Solve the implicit tri-diagonal system on the interior nodes
+        solve_interior(L_imp, D_imp, U_imp, R, out=V_new, workspace=workspace)
 
-        # STEP 7: Initialise Thomas algorithm at first interior node
-        d_star[1] = R[1] / D_imp[1]
-        c_star[1] = U_imp[1] / D_imp[1]
+        apply_boundary_conditions(option_type, V_new, spatial_grid, K, r, q, T, n, dt)
 
-        for i in range(2, len(spatial_grid) - 1):
-            # STEP 8: Thomas forward elimination (remove lower diagonal)
-            denom = D_imp[i] - c_star[i - 1] * L_imp[i]
-            c_star[i] = U_imp[i] / denom
-            d_star[i] = (R[i] - d_star[i - 1] * L_imp[i]) / denom
+        # STEP 7: Update solution for next time step - the old buffer is reused for the next solve
+        V, V_new = V_new, V
 
-        # STEP 9: Clear new solution vector before back substitution
-        V_new.fill(0.0)
+        if boundary_log is not None:
+            boundary_log[n] = exercise_boundary(option_type, spatial_grid, V, payoff, boundary_tol)
 
-        # STEP 10: Thomas back substitution (solve upper-triangular system)
-        for i in range(len(spatial_grid) - 2, 0, -1):
-            V_new[i] = d_star[i] - c_star[i] * V_new[i + 1]
+        if n % every == 0:
+            yield n, V.copy()
+
+
+def march_time_step(T, time_intervals, initial=None):
+    """Time step of a slice march: T / time_intervals from the payoff (the march stops one step short of T), or the
+    time_intervals - 1 steps from the time to maturity tau0 of an initial slice (tau0, V0) to T."""
+    if initial is None:
+        return T / time_intervals
+
+    if time_intervals < 2:
+        raise ValueError("a march from an initial slice needs time_intervals of at least 2")
+    return (T - initial[0]) / (time_intervals - 1)
+
+
+def slice_stride(time_intervals, store_surface=True):
+    """every= for a march consumed by collect_slices: every slice for a surface, otherwise only maturity and t=0 (only
+    the t=0 slice has to leave the march)."""
+    return 1 if store_surface else time_intervals
 
-        apply_boundary_conditions(option_type, V_new, spatial_grid, K, r, q, T, n, dt)
 
-        V_S_t[:, n] = V_new
+def collect_slices(slices, n_nodes, time_intervals, store_surface=True):
+    """Consumes a (n, V^n) slice generator into the (n_nodes, time_intervals) surface, or into an (n_nodes, 1) array
+    holding only the t=0 slice when store_surface is False."""
+    if store_surface:
+        V_S_t = np.zeros((n_nodes, time_intervals))
+        for n, V in slices:
+            V_S_t[:, n] = V
+        return V_S_t
 
-        # STEP 12: Update solution for next time step
-        V = V_new.copy()
+    for n, V in slices:
+        pass
 
-    return V_S_t
+    return V[:, None]
@@ -0,0 +1,95 @@
+from amopt.pricers.american_fd import american_fd_pricer
+from amopt.pricers.european_fd import european_fd_pricer
+from amopt.pricers.american_binomial import american_binomial_price
+from amopt.pricers.binomial import european_binomial_price
+
+import numpy as np
+
+
+# Each pricer's leading error terms in the grid spacing h ~ 1 / resolution. The FD solvers march time_intervals - 1
+# steps of T / time_intervals, so their error carries an O(dt) term on top of the O(h^2) Crank–Nicolson error. The
+# smoothed (BBS) trees converge at first order without the odd/even oscillation of CRR, which is what makes the
+# two-point BBSR extrapolation work.
+RICHARDSON_SCHEMES = {
+    'american_fd': {'pricer': american_fd_pricer, 'orders': (1, 2), 'tree': False},
+    'european_fd': {'pricer': european_fd_pricer, 'orders': (1, 2), 'tree': False},
+    'american_binomial': {'pricer': american_binomial_price, 'orders': (1,), 'tree': True},
+    'european_binomial': {'pricer': european_binomial_price, 'orders': (1,), 'tree': True},
+}
+
+
+def richardson_price(pricer, option_type, S, K, r, q, sigma, T, resolution, ratio=2, orders=None, **pricer_kwargs):
+    """
+        Prices an option at len(orders) + 1 increasing resolutions and Richardson-extrapolates the results, so that
+        coarse solves reach the accuracy of a much finer grid.
+
+        FD pricers are run with stock_intervals = time_intervals = resolution * ratio**k (three levels by default,
+        rounded up to a multiple of 4 so that the strike is a node of the [0, 4K] grid at every level). Trees are run
+        with steps = resolution * ratio**k as BBS trees (smooth=True) unless smooth=False is passed; two levels give
+        the BBSR scheme 2 P(2N) - P(N).
+
+        Parameters:
+            pricer (string): 'american_fd', 'european_fd', 'american_binomial' or 'european_binomial'
+            option_type (string): 'call' or 'put'
+            S, K, r, q, sigma, T (float): contract and market parameters (S may be an array for the FD pricers)
+            resolution (int): coarsest number of grid intervals / tree steps
+            ratio (int): refinement ratio between levels
+            orders (tuple): error orders eliminated one after another, defaults to the pricer's known expansion
+            pricer_kwargs: passed on to the pricer, e.g. lcp_method or grid
+
+        Returns:
+            (float or np.ndarray, float or np.ndarray) extrapolated price and an estimate of its error
+        """
+    if pricer not in RICHARDSON_SCHEMES:
+        raise ValueError("pricer must be one of %s" % ", ".join(sorted(RICHARDSON_SCHEMES)))
+
+    scheme = RICHARDSON_SCHEMES[pricer]
+    if orders is None:
+        orders = scheme['orders']
+
+    if ratio < 2 or int(ratio) != ratio:
+        raise ValueError("ratio must be an integer of at least 2")
+
+    prices = []
+    for level in range(len(orders) + 1):
+        if scheme['tree']:
+            pricer_kwargs.setdefault('smooth', True)
+            steps = int(resolution) * ratio ** level
+            prices.append(scheme['pricer'](option_type, S, K, r, q, sigma, T, steps, **pricer_kwargs))
+        else:
+            intervals = 4 * int(np.ceil(resolution / 4)) * ratio ** level
+            prices.append(scheme['pricer'](option_type, S, K, r, q, sigma, T, intervals, intervals, **pricer_kwargs))
+
+    return richardson_extrapolate(prices, orders, ratio)
+
+
+def richardson_extrapolate(values, orders, ratio=2):
+    """
+        Richardson table for values computed with spacings h, h / ratio, h / ratio**2, ... whose error expands as
+        c_1 h**orders[0] + c_2 h**orders[1] + ...; each column eliminates the next term of the expansion.
+
+        Parameters:
+            values (sequence): results from coarsest to finest, at least len(orders) + 1 of them (scalars or arrays)
+            orders (tuple): error orders to eliminate, in increasing order
+            ratio (float): refinement ratio between consecutive values
+
+        Returns:
+            (float or np.ndarray, float or np.ndarray) extrapolated value and the size of the last correction, used as
+            its error estimate
+        """
+    if len(orders) == 0:
+        raise ValueError("at least one error order is needed")
+
+    column = [np.asarray(v, dtype=float) for v in values]
+    if len(column) < len(orders) + 1:
+        raise ValueError("%d orders need at least %d values" % (len(orders), len(orders) + 1))
+
+    for order in orders:
+        factor = ratio ** order
+        previous = column
+        column = [(factor * fine - coarse) / (factor - 1) for coarse, fine in zip(previous[:-1], previous[1:])]
+
+    # The last correction applied to the finest previous column
+    error = np.abs(column[-1] - previous[-1])
+
+    return column[-1][()], error[()]
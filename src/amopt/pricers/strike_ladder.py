@@ -0,0 +1,41 @@
+from amopt.pricers.american_fd import american_fd_surface
+from amopt.pricers.interpolation import interpolate_slice, floor_at_payoff
+
+import numpy as np
+
+
+def american_fd_strike_ladder(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals,
+                              lcp_method='penalty', grid='uniform', grid_alpha=None, interpolation='cubic'):
+    """
+        Prices a ladder of strikes with one normalised solve per distinct volatility. The Black–Scholes value is
+        homogeneous of degree one in (S, K), V(S, K) = K V(S / K, 1), so the K=1 problem on [0, 4] is solved once and
+        every strike sharing (r, q, sigma, T) is read off it at its moneyness S / K. Strikes with different smile vols
+        fall back to one solve per distinct sigma.
+
+        Parameters:
+            option_type (string): 'call' or 'put'
+            S (float): spot price
+            K (array): strikes
+            r, q, T (float): market parameters and time to maturity shared by the ladder
+            sigma (float or array): flat volatility, or one per strike
+            stock_intervals, time_intervals, lcp_method, grid, grid_alpha, interpolation: as in american_fd_pricer
+
+        Returns:
+            (np.ndarray or float) option prices with the broadcast shape of K and sigma
+        """
+    K, sigma = np.broadcast_arrays(np.asarray(K, dtype=float), np.asarray(sigma, dtype=float))
+    moneyness = S / K
+
+    prices = np.empty(K.shape)
+    for vol in np.unique(sigma):
+        in_group = sigma == vol
+
+        # Normalised solve (K=1); the sinh grid clusters around the strike and the ladder's moneyness points
+        V, s_grid = american_fd_surface(option_type, 1.0, r, q, vol, T, stock_intervals, time_intervals,
+                                        lcp_method=lcp_method, store_surface=False, grid=grid,
+                                        grid_centres=np.append(1.0, moneyness[in_group]), grid_alpha=grid_alpha)
+
+        normalised = interpolate_slice(s_grid, V[:, 0], moneyness[in_group], method=interpolation)
+        prices[in_group] = K[in_group] * floor_at_payoff(option_type, normalised, moneyness[in_group], 1.0)
+
+    return prices[()]
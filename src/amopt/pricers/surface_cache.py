@@ -0,0 +1,69 @@
+from amopt.pricers.american_fd import american_fd_surface
+from amopt.pricers.interpolation import interpolate_slice, floor_at_payoff
+from amopt.pricers.cache import LRUCache, cache_key
+
+
+# Solved t=0 slices keyed on the contract and grid, bounded by memory rather than by count
+SURFACE_CACHE = LRUCache(max_entries=None, max_bytes=256 * 2 ** 20)
+
+# Order of the fields after the 'american_fd_t0' tag in a surface cache key
+SURFACE_KEY_FIELDS = ('option_type', 'K', 'r', 'q', 'sigma', 'T', 'stock_intervals', 'time_intervals', 'lcp_method',
+                      'grid', 'grid_alpha')
+
+
+def cached_american_fd_price(option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals,
+                             lcp_method='penalty', grid='uniform', grid_alpha=None, interpolation='cubic',
+                             cache=SURFACE_CACHE):
+    """
+        American FD price served from a cache of solved t=0 slices. The first call for a contract solves it (surface
+        free) and stores the slice with its grid; later calls with the same (K, r, q, sigma, T) and grid settings only
+        interpolate the stored slice at the new spot(s).
+
+        The grid does not depend on the spot: the 'sinh' grid is clustered around K only, so prices on it can differ
+        slightly from american_fd_pricer, which also clusters around S. Uniform-grid prices are identical.
+
+        Parameters:
+            option_type, S, K, r, q, sigma, T, stock_intervals, time_intervals, lcp_method, grid, grid_alpha,
+            interpolation: as in american_fd_pricer
+            cache (LRUCache): cache of solved slices
+
+        Returns:
+            (float or np.ndarray) option price(s) at S
+        """
+    key = cache_key('american_fd_t0', option_type.lower(), K, r, q, sigma, T, stock_intervals, time_intervals,
+                    lcp_method, grid, grid_alpha)
+
+    def solve():
+        fd_prices, s_grid = american_fd_surface(option_type, K, r, q, sigma, T, stock_intervals, time_intervals,
+                                                lcp_method=lcp_method, store_surface=False, grid=grid,
+                                                grid_alpha=grid_alpha)
+        return s_grid, fd_prices[:, 0]
+
+    s_grid, V_t0 = cache.get_or_build(key, solve)
+
+    # interpolate_slice rejects spots outside the solved grid
+    price = interpolate_slice(s_grid, V_t0, S, method=interpolation)
+    return floor_at_payoff(option_type, price, S, K)
+
+
+def invalidate_surfaces(cache=SURFACE_CACHE, **fields):
+    """
+        Drops cached slices whose parameters match every given field, e.g. invalidate_surfaces(sigma=0.2) after a
+        volatility update or invalidate_surfaces(r=0.05, T=1.0). Without fields every cached slice is dropped.
+
+        Returns:
+            (int) number of slices dropped
+        """
+    unknown = set(fields) - set(SURFACE_KEY_FIELDS)
+    if unknown:
+        raise ValueError("unknown surface key fields: %s" % ", ".join(sorted(unknown)))
+
+    if 'option_type' in fields:
+        fields['option_type'] = fields['option_type'].lower()
+
+    wanted = {SURFACE_KEY_FIELDS.index(name) + 1: cache_key(value)[0] for name, value in fields.items()}
+
+    def matches(key):
+        return key[0] == 'american_fd_t0' and all(key[position] == value for position, value in wanted.items())
+
+    return cache.invalidate(matches)
@@ -0,0 +1,88 @@
+from amopt.pricers.american_analytic import (american_analytic_price, bjerksund_stensland_price,
+                                             bivariate_normal_cdf, ANALYTIC_METHODS)
+from amopt.pricers.american_fd import american_fd_pricer
+from amopt.pricers.closed_form import euro_vanilla_price
+
+import pytest
+import numpy as np
+from scipy.stats import multivariate_normal
+
+
+# (option type, r, q): the zero-rate call on a dividend payer exercises the r -> 0 limits of the quadratic methods
+MARKETS = [('call', 0.05, 0.03), ('put', 0.05, 0.03), ('call', 0.0, 0.05)]
+
+# BAW ignores the time dependence of the premium and is the least accurate deep in the money
+FD_TOLERANCE = {'baw': 0.15, 'bjerksund_stensland': 0.1, 'ju_zhong': 0.1}
+
+
+@pytest.fixture(scope='module')
+def fd_reference():
+    S = np.array([80.0, 90.0, 100.0, 110.0, 120.0])
+    return {market: (S, american_fd_pricer(market[0], S, 100, market[1], market[2], 0.25, 1.0, 400, 400))
+            for market in MARKETS}
+
+
+@pytest.mark.parametrize("method", ANALYTIC_METHODS)
+@pytest.mark.parametrize("market", MARKETS)
+def test_analytic_vs_fd_pricer(fd_reference, method, market):
+    S, fd_prices = fd_reference[market]
+    option_type, r, q = market
+    prices = american_analytic_price(option_type, S, 100, r, q, 0.25, 1.0, method=method)
+
+    assert prices == pytest.approx(fd_prices, abs=FD_TOLERANCE[method])
+
+
+@pytest.mark.parametrize("method", ANALYTIC_METHODS)
+@pytest.mark.parametrize("r, q", [(0.05, 0.03), (0.0, 0.05)])
+def test_no_arbitrage_bounds(method, r, q):
+    kind = np.array(['call', 'put'])[:, None]
+    S = np.linspace(60, 140, 17)
+    prices = american_analytic_price(kind, S, 100, r, q, 0.25, 2.0, method=method)
+    european = euro_vanilla_price(kind, S, 100, r, 2.0, 0.25, q)
+    intrinsic = np.maximum(np.where(kind == 'call', S - 100, 100 - S), 0.0)
+
+    assert np.all(prices >= european - 1e-12)
+    assert np.all(prices >= intrinsic - 1e-12)
+
+
+# Without dividends an American call is never exercised early
+@pytest.mark.parametrize("method", ANALYTIC_METHODS)
+def test_call_without_dividends_is_european(method):
+    price = american_analytic_price('call', 100, 100, 0.05, 0.0, 0.25, 1.0, method=method)
+
+    assert price == pytest.approx(euro_vanilla_price('call', 100, 100, 0.05, 1.0, 0.25, 0.0), rel=1e-12)
+
+
+@pytest.mark.parametrize("method", ANALYTIC_METHODS)
+def test_chain_matches_scalar_prices(method):
+    kinds = ['call', 'put', 'put', 'call']
+    S = [90.0, 100.0, 85.0, 120.0]
+    T = [0.5, 1.0, 2.0, 0.25]
+    prices = american_analytic_price(kinds, S, 100, 0.05, 0.03, 0.25, T, method=method)
+    scalar_prices = [american_analytic_price(k, s, 100, 0.05, 0.03, 0.25, t, method=method) for k, s, t in zip(kinds, S, T)]
+
+    assert prices == pytest.approx(scalar_prices, rel=1e-10)
+
+
+def test_deep_in_the_money_put_is_exercised():
+    assert american_analytic_price('put', 40, 100, 0.05, 0.0, 0.2, 1.0) == 60.0
+
+
+# Put-call transformation of Bjerksund–Stensland: P(S, K, r, q) = C(K, S, q, r)
+def test_bjerksund_stensland_put_call_transformation():
+    put = bjerksund_stensland_price('put', 95, 100, 0.06, 0.02, 0.3, 1.5)
+    call = bjerksund_stensland_price('call', 100, 95, 0.02, 0.06, 0.3, 1.5)
+
+    assert put == pytest.approx(call, rel=1e-12)
+
+
+@pytest.mark.parametrize("a, b, rho", [(0.3, -1.2, 0.786), (-2.0, 1.5, -0.786), (1.0, 1.0, 0.5), (-0.5, -3.0, 0.0)])
+def test_bivariate_normal_cdf(a, b, rho):
+    expected = multivariate_normal([0, 0], [[1, rho], [rho, 1]]).cdf([a, b])
+
+    assert bivariate_normal_cdf(a, b, rho) == pytest.approx(expected, abs=1e-8)
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        american_analytic_price('put', 100, 100, 0.05, 0.03, 0.25, 1.0, method='barone')
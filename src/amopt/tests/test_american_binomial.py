@@ -1,7 +1,8 @@
 import pytest
 import numpy as np
 
-from amopt.pricers.american_binomial import american_binomial_price
+from amopt.pricers.american_binomial import american_binomial_price, american_binomial_batch_price
+from amopt.pricers.american_fd import american_fd_pricer
 from amopt.pricers.european_fd import european_fd_pricer
 
 
@@ -72,4 +73,46 @@ def test_put_value_decreases_as_spot_price_increases(binomial_american_option_pr
     assert spot_increase_price <= binomial_american_option_price
 
 
+# The exercise value must be taken at the same tree level as the continuation value, otherwise puts are overpriced
+def test_binomial_american_put_vs_penalty_pde_solver():
+    binomial_price = american_binomial_price('put', 100, 100, 0.05, 0.02, 0.2, 1, 800)
+    fd_price = american_fd_pricer('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 200, 200)
 
+    assert binomial_price == pytest.approx(fd_price, rel=1e-2)
+
+
+def test_batch_price_matches_scalar_price():
+    kinds = ['call', 'put', 'put']
+    strikes = [90, 100, 120]
+    batch_prices = american_binomial_batch_price(kinds, 100, strikes, 0.05, 0.02, 0.2, 1, 400)
+    scalar_prices = [american_binomial_price(kind, 100, K, 0.05, 0.02, 0.2, 1, 400) for kind, K in zip(kinds, strikes)]
+
+    assert batch_prices == pytest.approx(scalar_prices, rel=1e-12)
+
+
+@pytest.mark.parametrize("tree, smooth", [('lr', False), ('crr', True)])
+def test_accelerated_trees_vs_fine_tree(tree, smooth):
+    reference = american_binomial_price('put', 100, 100, 0.05, 0.02, 0.2, 1, 10001, tree='lr')
+    price = american_binomial_price('put', 100, 100, 0.05, 0.02, 0.2, 1, 101, smooth=smooth, tree=tree)
+    crr_price = american_binomial_price('put', 100, 100, 0.05, 0.02, 0.2, 1, 101)
+
+    assert np.abs(price - reference) < np.abs(crr_price - reference)
+    assert price == pytest.approx(reference, abs=1e-2)
+
+
+def test_leisen_reimer_batch_matches_scalar():
+    strikes = [90, 100, 120]
+    batch_prices = american_binomial_batch_price('put', 100, strikes, 0.05, 0.02, 0.2, 1, 101, tree='lr')
+    scalar_prices = [american_binomial_price('put', 100, K, 0.05, 0.02, 0.2, 1, 101, tree='lr') for K in strikes]
+
+    assert batch_prices == pytest.approx(scalar_prices, rel=1e-12)
+
+
+# Far from the money close to expiry the Peizer–Pratt probabilities saturate, those contracts use the CRR lattice
+@pytest.mark.parametrize("K, T", [(150, 1e-3), (120, 1e-4), (50, 1e-3)])
+def test_leisen_reimer_saturated_contracts_are_finite(K, T):
+    price = american_binomial_price('put', 100, K, 0.05, 0.02, 0.2, T, 101, tree='lr')
+    crr_price = american_binomial_price('put', 100, K, 0.05, 0.02, 0.2, T, 101)
+
+    assert np.isfinite(price)
+    assert price == pytest.approx(crr_price, abs=1e-8)
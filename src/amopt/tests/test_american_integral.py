@@ -0,0 +1,76 @@
+from amopt.pricers.american_integral import american_alo_price, american_alo_boundary
+from amopt.pricers.american_fd import american_fd_pricer
+from amopt.pricers.american_binomial import american_binomial_price
+from amopt.pricers.boundary_extract import extract_boundary_curve
+from amopt.pricers.closed_form import euro_vanilla_price
+
+import pytest
+import numpy as np
+
+
+# 70 lies next to the put boundary at expiry (~69.7 for r=0.05, q=0.03), where the premium integral converges slowest
+@pytest.mark.parametrize("option_type, r, q", [('put', 0.05, 0.02), ('put', 0.05, 0.03), ('put', 0.03, 0.07),
+                                               ('call', 0.03, 0.06), ('call', 0.05, 0.03)])
+def test_price_is_converged(option_type, r, q):
+    S = np.array([70.0, 80.0, 100.0, 120.0])
+    price = american_alo_price(option_type, S, 100, r, q, 0.25, 1.0)
+    fine_price = american_alo_price(option_type, S, 100, r, q, 0.25, 1.0, collocation_points=64,
+                                    quadrature_points=160, integration_points=512)
+
+    assert price == pytest.approx(fine_price, abs=1e-8)
+
+
+@pytest.mark.parametrize("option_type", ['call', 'put'])
+def test_alo_vs_fd_pricer(option_type):
+    S = np.array([80.0, 90.0, 100.0, 110.0, 120.0])
+    fd_prices = american_fd_pricer(option_type, S, 100, 0.05, 0.03, 0.25, 1.0, 400, 400)
+
+    assert american_alo_price(option_type, S, 100, 0.05, 0.03, 0.25, 1.0) == pytest.approx(fd_prices, abs=2e-2)
+
+
+def test_alo_vs_leisen_reimer_tree():
+    tree_price = american_binomial_price('put', 100, 100, 0.05, 0.03, 0.25, 1.0, 10001, tree='lr')
+
+    assert american_alo_price('put', 100, 100, 0.05, 0.03, 0.25, 1.0) == pytest.approx(tree_price, abs=1e-4)
+
+
+# The FD boundary is located to within about one grid spacing (1.0 on [0, 400]) away from the last few steps before
+# expiry, where the boundary moves faster than one node per step
+@pytest.mark.parametrize("option_type, r, q", [('put', 0.05, 0.02), ('call', 0.03, 0.06)])
+def test_boundary_vs_extract_boundary_curve(option_type, r, q):
+    curve = extract_boundary_curve(option_type, 100, r, q, 0.25, 1.0, 400, 200)
+    tau = 1.0 - np.arange(200) / 200
+    boundary = american_alo_boundary(option_type, 100, r, q, 0.25, 1.0, tau)
+
+    assert curve[:190] == pytest.approx(boundary[:190], abs=1.5)
+
+
+# Put-call symmetry C(S, K, r, q) = P(K, S, q, r)
+def test_put_call_symmetry():
+    call = american_alo_price('call', 95, 100, 0.04, 0.06, 0.3, 1.5)
+    put = american_alo_price('put', 100, 95, 0.06, 0.04, 0.3, 1.5)
+
+    assert call == pytest.approx(put, rel=1e-8)
+
+
+def test_exercise_region_and_no_early_exercise():
+    boundary = american_alo_boundary('put', 100, 0.05, 0.02, 0.25, 1.0, 1.0)
+    assert american_alo_price('put', boundary - 5, 100, 0.05, 0.02, 0.25, 1.0) == pytest.approx(105 - boundary)
+
+    # Without dividends the call is European and its boundary is at infinity
+    european = euro_vanilla_price('call', 100, 100, 0.05, 1.0, 0.25, 0.0)
+    assert american_alo_price('call', 100, 100, 0.05, 0.0, 0.25, 1.0) == pytest.approx(european, rel=1e-12)
+    assert american_alo_boundary('call', 100, 0.05, 0.0, 0.25, 1.0, 0.5) == np.inf
+
+
+def test_invalid_option_type_raises():
+    with pytest.raises(ValueError):
+        american_alo_price('straddle', 100, 100, 0.05, 0.02, 0.25, 1.0)
+
+
+def test_option_type_is_case_insensitive():
+    assert american_alo_price('Call', 100, 100, 0.05, 0.08, 0.25, 1.0) == american_alo_price('call', 100, 100, 0.05,
+                                                                                             0.08, 0.25, 1.0)
+    assert american_alo_boundary('PUT', 100, 0.05, 0.02, 0.25, 1.0, 0.5) == american_alo_boundary('put', 100, 0.05,
+                                                                                                   0.02, 0.25, 1.0,
+                                                                                                   0.5)
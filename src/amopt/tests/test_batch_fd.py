@@ -0,0 +1,48 @@
+from amopt.pricers.batch_fd import american_fd_batch_pricer, european_fd_batch_pricer
+from amopt.pricers.american_fd import american_fd_pricer
+from amopt.pricers.european_fd import european_fd_pricer
+
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def option_chain():
+    option_types = ['call', 'put', 'call', 'put', 'call']
+    S = [100, 90, 110, 100, 95]
+    K = [100, 100, 105, 120, 90]
+    r = [0.05, 0.03, 0.05, 0.07, 0.05]
+    q = [0.02, 0.0, 0.0, 0.01, 0.03]
+    sigma = [0.2, 0.3, 0.25, 0.15, 0.2]
+    T = [1.0, 0.5, 2.0, 1.0, 0.25]
+
+    return option_types, S, K, r, q, sigma, T
+
+
+# The stacked solve must reproduce the one-contract-per-call pricers row by row
+def test_american_batch_matches_single_pricer(option_chain):
+    batch_prices = american_fd_batch_pricer(*option_chain, 80, 80)
+    single_prices = [american_fd_pricer(*contract, 80, 80) for contract in zip(*option_chain)]
+
+    assert batch_prices == pytest.approx(single_prices, abs=1e-10)
+
+
+def test_european_batch_matches_single_pricer(option_chain):
+    batch_prices = european_fd_batch_pricer(*option_chain, 80, 80)
+    single_prices = [european_fd_pricer(*contract, 80, 80) for contract in zip(*option_chain)]
+
+    assert batch_prices == pytest.approx(single_prices, abs=1e-10)
+
+
+def test_batch_broadcasts_strike_ladder():
+    K = np.array([[90.0, 100.0], [110.0, 120.0]])
+    prices = american_fd_batch_pricer('put', 100, K, 0.05, 0.02, 0.2, 1.0, 60, 60)
+
+    assert prices.shape == K.shape
+    # Put value increases with strike
+    assert np.all(np.diff(prices.ravel()) > 0)
+
+
+def test_batch_rejects_unknown_option_type():
+    with pytest.raises(ValueError):
+        american_fd_batch_pricer(['call', 'straddle'], 100, 100, 0.05, 0.02, 0.2, 1.0, 40, 40)
@@ -1,4 +1,6 @@
-from amopt.pricers.boundary_extract import extract_boundary_curve
+from amopt.pricers.boundary_extract import extract_boundary, extract_boundary_curve
+from amopt.pricers.american_fd import american_fd_surface
+from amopt.lcp.exercise_boundary import exercise_boundary, boundary_tolerance
 
 import pytest
 import numpy as np
@@ -103,17 +105,31 @@ def test_boundary_shifts_with_volatility():
     assert mean_high >= mean_low - 1e-6
 
 
+# One vectorised call over the surface equals scanning it column by column
+@pytest.mark.parametrize("option_type", ['call', 'put'])
+def test_vectorised_boundary_matches_column_scan(option_type):
+    V, s_grid = american_fd_surface(option_type, 100, 0.05, 0.04, 0.25, 1, 200, 50)
+    payoff = np.maximum(s_grid - 100, 0.0) if option_type == 'call' else np.maximum(100 - s_grid, 0.0)
+    tol = boundary_tolerance(100)
 
+    columns = [exercise_boundary(option_type, s_grid, V[:, n], payoff, tol) for n in range(V.shape[1])]
 
+    assert exercise_boundary(option_type, s_grid, V, payoff, tol) == pytest.approx(columns, abs=0)
 
 
+# The boundary recorded during the march equals the one read off the stored surface
+@pytest.mark.parametrize("lcp_method", ['penalty', 'psor', 'brennan_schwartz'])
+def test_boundary_log_matches_surface(lcp_method):
+    boundary_log = np.zeros(50)
+    V, s_grid = american_fd_surface('put', 100, 0.05, 0.02, 0.25, 1, 200, 50, lcp_method=lcp_method,
+                                    boundary_log=boundary_log)
+    surface_boundary = exercise_boundary('put', s_grid, V, np.maximum(100 - s_grid, 0.0), boundary_tolerance(100))
 
+    assert boundary_log == pytest.approx(surface_boundary, abs=1e-12)
 
 
+def test_boundary_at_t0_is_first_point_of_curve():
+    curve = extract_boundary_curve('put', 100, 0.05, 0.02, 0.25, 1, 200, 50)
 
-
-
-
-
-
-
+    assert extract_boundary('put', 100, 0.05, 0.02, 0.25, 1, 200, 50) == curve[0]
+    assert curve[0] < 100
@@ -0,0 +1,61 @@
+from amopt.pricers.cache import LRUCache, OPERATOR_CACHE
+from amopt.pricers.pde_operator import build_cn_operator
+from amopt.pricers.american_fd import american_fd_pricer
+
+import pytest
+import numpy as np
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.stats() == {'hits': 1, 'misses': 0, 'evictions': 1, 'entries': 2, 'nbytes': 0}
+
+
+def test_size_based_eviction():
+    cache = LRUCache(max_entries=None, max_bytes=2000)
+    for key in range(5):
+        cache.put(key, np.zeros(100))
+
+    assert len(cache) == 2
+    assert cache.nbytes == 1600
+    assert cache.evictions == 3
+
+    # Larger than the whole cache: returned, not stored
+    big = cache.put('big', np.zeros(1000))
+    assert big.shape == (1000,) and 'big' not in cache
+
+
+def test_cached_arrays_are_read_only():
+    cache = LRUCache()
+    value = cache.get_or_build('grid', lambda: (np.arange(3.0), np.ones(3)))
+
+    with pytest.raises(ValueError):
+        value[0][0] = 1.0
+
+
+def test_repeated_pricing_reuses_the_operator():
+    OPERATOR_CACHE.clear()
+    first = american_fd_pricer('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 80, 80)
+    second = american_fd_pricer('put', 105, 100, 0.05, 0.02, 0.2, 1.0, 80, 80)
+    bumped = american_fd_pricer('put', 100, 100, 0.05, 0.02, 0.21, 1.0, 80, 80)
+
+    assert OPERATOR_CACHE.stats()['hits'] == 1
+    assert OPERATOR_CACHE.stats()['misses'] == 2
+    assert first == american_fd_pricer('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 80, 80)
+    assert second < first < bumped
+
+
+def test_cached_operator_matches_a_fresh_build():
+    cached = build_cn_operator('sinh', 400, 60, 0.05, 0.02, 0.2, 0.01, centres=(100, 105))
+    fresh = build_cn_operator('sinh', 400, 60, 0.05, 0.02, 0.2, 0.01, centres=(100, 105), cache=None)
+
+    assert np.array_equal(cached[0], fresh[0])
+    for cached_coefficients, fresh_coefficients in zip(cached[1:], fresh[1:]):
+        for a, b in zip(cached_coefficients, fresh_coefficients):
+            assert np.array_equal(a, b)
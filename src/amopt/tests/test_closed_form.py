@@ -0,0 +1,69 @@
+from amopt.pricers.closed_form import euro_vanilla_price, euro_vanilla_greeks
+
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def option_chain():
+    kind = np.array(['call', 'put', 'call', 'put'])
+    S = np.array([100.0, 100.0, 80.0, 120.0])
+    K = np.array([100.0, 110.0, 90.0, 100.0])
+    T = np.array([1.0, 0.5, 2.0, 0.25])
+    sigma = np.array([0.2, 0.3, 0.25, 0.15])
+
+    return kind, S, K, 0.05, T, sigma, 0.02
+
+
+def test_array_prices_match_scalar_prices(option_chain):
+    kind, S, K, r, T, sigma, q = option_chain
+    prices = euro_vanilla_price(kind, S, K, r, T, sigma, q)
+    scalar_prices = [euro_vanilla_price(*contract, r, t, vol, q) for contract, t, vol in zip(zip(kind, S, K), T, sigma)]
+
+    assert prices == pytest.approx(scalar_prices, rel=1e-14)
+
+
+def test_put_call_parity():
+    call = euro_vanilla_price('call', 100, 95, 0.05, 1.0, 0.2, 0.02)
+    put = euro_vanilla_price('put', 100, 95, 0.05, 1.0, 0.2, 0.02)
+
+    assert call - put == pytest.approx(100 * np.exp(-0.02) - 95 * np.exp(-0.05), rel=1e-12)
+
+
+# Analytic Greeks are checked against central differences of the closed-form price, theta being -dV/dT
+@pytest.mark.parametrize("greek, argument, bump, sign", [("delta", 1, 1e-3, 1), ("vega", 5, 1e-5, 1),
+                                                        ("rho", 3, 1e-5, 1), ("theta", 4, 1e-5, -1)])
+def test_greeks_match_finite_differences(option_chain, greek, argument, bump, sign):
+    greeks = euro_vanilla_greeks(*option_chain)
+
+    up = list(option_chain)
+    down = list(option_chain)
+    up[argument] = up[argument] + bump
+    down[argument] = down[argument] - bump
+    fd_greek = sign * (euro_vanilla_price(*up) - euro_vanilla_price(*down)) / (2 * bump)
+
+    assert greeks[greek] == pytest.approx(fd_greek, rel=1e-5, abs=1e-8)
+
+
+def test_gamma_matches_finite_difference_of_delta(option_chain):
+    kind, S, K, r, T, sigma, q = option_chain
+    bump = 1e-3
+    delta_up = euro_vanilla_greeks(kind, S + bump, K, r, T, sigma, q)['delta']
+    delta_down = euro_vanilla_greeks(kind, S - bump, K, r, T, sigma, q)['delta']
+
+    gamma = euro_vanilla_greeks(*option_chain)['gamma']
+
+    assert gamma == pytest.approx((delta_up - delta_down) / (2 * bump), rel=1e-5)
+
+
+def test_expired_options_return_intrinsic_value():
+    greeks = euro_vanilla_greeks(['call', 'put'], 110, 100, 0.05, 0.0, 0.2, 0.02)
+
+    assert greeks['price'] == pytest.approx([10.0, 0.0])
+    assert greeks['delta'] == pytest.approx([1.0, 0.0])
+    assert greeks['vega'] == pytest.approx([0.0, 0.0])
+
+
+def test_unknown_kind_raises():
+    with pytest.raises(ValueError):
+        euro_vanilla_price('straddle', 100, 100, 0.05, 1.0, 0.2, 0.0)
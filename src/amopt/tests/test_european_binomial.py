@@ -3,7 +3,8 @@ import pytest
 
 from amopt.pricers.closed_form import euro_vanilla_price
 from amopt.pricers.european_fd import european_fd_pricer
-from amopt.pricers.binomial import european_binomial_price
+from amopt.pricers.binomial import european_binomial_price, european_binomial_batch_price
+from amopt.pricers.american_binomial import binomial_backward_induction, binomial_tree_parameters
 
 
 @pytest.fixture
@@ -81,3 +82,70 @@ def test_call_increases_as_spot_increases(binomial_european_price):
 
 
 
+
+
+# Leisen–Reimer trees are centred on the strike: four digits from ~100 steps, with no odd/even oscillation
+@pytest.mark.parametrize("option_type", ['call', 'put'])
+def test_leisen_reimer_tree_vs_closed_form(option_type):
+    closed_form_price = euro_vanilla_price(option_type, 100, 100, 0.05, 1, 0.2, 0.02)
+    lr_price = european_binomial_price(option_type, 100, 100, 0.05, 0.02, 0.2, 1, 101, tree='lr')
+
+    assert lr_price == pytest.approx(closed_form_price, abs=1e-4)
+
+
+def test_leisen_reimer_rounds_even_steps_up():
+    assert european_binomial_price('put', 100, 110, 0.05, 0.02, 0.2, 1, 100, tree='lr') == \
+        european_binomial_price('put', 100, 110, 0.05, 0.02, 0.2, 1, 101, tree='lr')
+
+
+# Saturated Peizer–Pratt probabilities fall back to the CRR lattice instead of giving NaN
+@pytest.mark.parametrize("option_type, K", [('call', 50), ('put', 150)])
+def test_leisen_reimer_far_from_the_money(option_type, K):
+    closed_form_price = euro_vanilla_price(option_type, 100, K, 0.05, 1e-3, 0.2, 0.02)
+    lr_price = european_binomial_price(option_type, 100, K, 0.05, 0.02, 0.2, 1e-3, 101, tree='lr')
+
+    assert lr_price == pytest.approx(closed_form_price, abs=1e-8)
+
+
+def test_unknown_tree_raises():
+    with pytest.raises(ValueError):
+        european_binomial_price('put', 100, 100, 0.05, 0.02, 0.2, 1, 100, tree='jr')
+
+
+# The O(N) weighted sum must reproduce the O(N^2) backward induction of the same tree
+@pytest.mark.parametrize("tree, smooth", [('crr', False), ('crr', True), ('lr', False)])
+def test_summation_matches_backward_induction(tree, smooth):
+    S, K, r, q, sigma, T = (np.array([x]) for x in (100.0, 110.0, 0.05, 0.02, 0.2, 1.0))
+    steps, u, d, p, disc = binomial_tree_parameters(tree, S, K, r, q, sigma, T, 201)
+    smoothing = (r, q, sigma, T / steps) if smooth else None
+    induction_price = binomial_backward_induction(np.array([False]), S, K, u, d, p, disc, steps, american=False,
+                                                  smoothing=smoothing)[0]
+
+    price = european_binomial_price('put', 100, 110, 0.05, 0.02, 0.2, 1, 201, smooth=smooth, tree=tree)
+
+    assert price == pytest.approx(induction_price, rel=1e-10)
+
+
+def test_summation_is_stable_for_large_trees():
+    closed_form_price = euro_vanilla_price('put', 100, 100, 0.05, 1, 0.2, 0.02)
+    price = european_binomial_price('put', 100, 100, 0.05, 0.02, 0.2, 1, 200000)
+
+    assert np.isfinite(price)
+    assert price == pytest.approx(closed_form_price, abs=1e-4)
+
+
+def test_batch_price_matches_scalar_price():
+    kinds = np.array(['call', 'put', 'put'])
+    strikes = np.array([90.0, 100.0, 120.0])
+    vols = np.array([0.15, 0.2, 0.3])
+    batch_prices = european_binomial_batch_price(kinds, 100, strikes, 0.05, 0.02, vols, 1, 400)
+    scalar_prices = [european_binomial_price(kind, 100, K, 0.05, 0.02, vol, 1, 400)
+                     for kind, K, vol in zip(kinds, strikes, vols)]
+
+    assert batch_prices == pytest.approx(scalar_prices, rel=1e-12)
+
+
+def test_batch_price_raises_for_invalid_probability():
+    # sigma sqrt(dt) = 0.0032 < (r - q) dt = 0.01: the CRR up probability exceeds 1
+    with pytest.raises(ValueError):
+        european_binomial_batch_price('call', 100, 100, 0.1, 0.0, 0.01, 1, 10)
@@ -0,0 +1,40 @@
+from amopt.pricers.fd_greeks import american_fd_greeks
+from amopt.pricers.american_fd import american_fd_pricer
+from amopt.pricers.closed_form import euro_vanilla_greeks
+
+import pytest
+import numpy as np
+
+
+# Calls without dividends are solved as European options, so every Greek can be checked against Black–Scholes
+@pytest.mark.parametrize("greek, tolerance", [("delta", 5e-3), ("gamma", 1e-2), ("vega", 5e-3), ("theta", 5e-3),
+                                              ("rho", 1e-2)])
+def test_greeks_match_black_scholes_for_european_calls(greek, tolerance):
+    spots = np.array([90.0, 100.0, 110.0])
+    fd = american_fd_greeks('call', spots, 100, 0.05, 0.0, 0.2, 1.0, 200, 200)
+    exact = euro_vanilla_greeks('call', spots, 100, 0.05, 1.0, 0.2, 0.0)
+
+    assert np.allclose(fd[greek], exact[greek], rtol=tolerance)
+
+
+@pytest.mark.parametrize("lcp_method", ["penalty", "brennan_schwartz"])
+def test_american_put_delta_gamma_match_bump_and_reprice(lcp_method):
+    greeks = american_fd_greeks('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 200, 200, lcp_method=lcp_method)
+
+    h = 0.5
+    up, mid, down = (american_fd_pricer('put', S, 100, 0.05, 0.02, 0.2, 1.0, 200, 200, lcp_method=lcp_method)
+                     for S in (100 + h, 100, 100 - h))
+
+    assert greeks['price'] == pytest.approx(mid, abs=1e-12)
+    assert greeks['delta'] == pytest.approx((up - down) / (2 * h), abs=1e-3)
+    assert greeks['gamma'] == pytest.approx((up - 2 * mid + down) / h ** 2, rel=1e-2)
+
+
+def test_american_put_greek_signs():
+    greeks = american_fd_greeks('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 100, 100)
+
+    assert -1 < greeks['delta'] < 0
+    assert greeks['gamma'] > 0
+    assert greeks['vega'] > 0
+    assert greeks['rho'] < 0
+    assert greeks['theta'] < 0
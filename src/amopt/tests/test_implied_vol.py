@@ -0,0 +1,60 @@
+from amopt.pricers.implied_vol import american_implied_vol, european_implied_vol
+from amopt.pricers.closed_form import euro_vanilla_price
+from amopt.pricers.batch_fd import american_fd_batch_pricer
+from amopt.pricers.american_binomial import american_binomial_batch_price
+
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def smile():
+    strikes = np.linspace(80, 120, 9)
+    vols = 0.18 + 0.1 * ((strikes - 100) / 40) ** 2
+    return strikes, vols
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_european_implied_vol_round_trip(smile, option_type):
+    strikes, vols = smile
+    prices = euro_vanilla_price(option_type, 100, strikes, 0.05, 0.5, vols, 0.02)
+
+    assert np.allclose(european_implied_vol(option_type, prices, 100, strikes, 0.05, 0.02, 0.5), vols, atol=1e-8)
+
+
+def test_american_implied_vol_round_trip_fd(smile):
+    strikes, vols = smile
+    option_types = np.where(strikes < 100, 'call', 'put')
+    prices = american_fd_batch_pricer(option_types, 100, strikes, 0.05, 0.02, vols, 1.0, 100, 100)
+
+    implied = american_implied_vol(option_types, prices, 100, strikes, 0.05, 0.02, 1.0,
+                                   stock_intervals=100, time_intervals=100)
+
+    assert np.allclose(implied, vols, atol=1e-5)
+
+
+def test_american_implied_vol_round_trip_binomial(smile):
+    strikes, vols = smile
+    prices = american_binomial_batch_price('put', 100, strikes, 0.05, 0.02, vols, 1.0, 300)
+
+    implied = american_implied_vol('put', prices, 100, strikes, 0.05, 0.02, 1.0, engine='binomial', steps=300)
+
+    assert np.allclose(implied, vols, atol=1e-5)
+
+
+def test_quotes_without_implied_vol_are_nan():
+    # Below intrinsic value and above the strike, neither has a volatility that reproduces it
+    implied = american_implied_vol('put', [5.0, 120.0], 90, 100, 0.05, 0.02, 1.0, stock_intervals=100,
+                                   time_intervals=100)
+
+    assert np.all(np.isnan(implied))
+
+
+def test_unconverged_quotes_are_nan(smile):
+    strikes, vols = smile
+    prices = euro_vanilla_price('put', 100, strikes, 0.05, 0.5, vols, 0.02)
+
+    # A single step leaves the Brenner–Subrahmanyam start short of 1e-10 away from the money
+    implied = european_implied_vol('put', prices, 100, strikes, 0.05, 0.02, 0.5, max_iter=1)
+    assert np.any(np.isnan(implied))
+    assert np.all(np.isnan(implied) | np.isclose(implied, vols, atol=1e-8))
@@ -0,0 +1,96 @@
+from amopt.pricers.interpolation import interpolate_slice
+from amopt.pricers.pde_operator import build_spatial_operator
+from amopt.pricers.european_fd import european_fd_pricer
+from amopt.pricers.american_fd import american_fd_pricer, american_fd_surface
+from amopt.pricers.strike_ladder import american_fd_strike_ladder
+
+import pytest
+import numpy as np
+
+
+@pytest.mark.parametrize("method, degree", [("linear", 1), ("quadratic", 2), ("cubic", 3)])
+def test_interpolation_is_exact_on_polynomials_of_its_degree(method, degree):
+    # Non-uniform nodes and off-node spots
+    s_grid = np.sort(np.random.default_rng(0).uniform(0, 10, 25))
+    spots = np.array([1.3, 4.71, 8.05])
+    coefficients = np.arange(1, degree + 2)
+
+    polynomial = np.polynomial.Polynomial(coefficients)
+    values = polynomial(s_grid)
+
+    assert np.allclose(interpolate_slice(s_grid, values, spots, method=method), polynomial(spots))
+    assert np.allclose(interpolate_slice(s_grid, values, spots, method=method, derivative=1),
+                       polynomial.deriv(1)(spots))
+    if degree >= 2:
+        assert np.allclose(interpolate_slice(s_grid, values, spots, method=method, derivative=2),
+                           polynomial.deriv(2)(spots))
+
+
+def test_nearest_reproduces_the_closest_grid_node():
+    V, s_grid = american_fd_surface('put', 100, 0.05, 0.02, 0.2, 1.0, 80, 80, store_surface=False)
+    S = 101.3
+
+    nearest = american_fd_pricer('put', S, 100, 0.05, 0.02, 0.2, 1.0, 80, 80, interpolation='nearest')
+    assert nearest == V[np.argmin(np.abs(s_grid - S)), 0]
+
+
+def test_cubic_interpolation_is_smoother_than_nearest_node():
+    # Sweeping the spot across one grid cell: the nearest-node price is a step function, the interpolated price
+    # moves continuously with S
+    spots = np.linspace(100, 104, 9)
+    nearest = european_fd_pricer('put', spots, 100, 0.05, 0.02, 0.2, 1.0, 100, 100, interpolation='nearest')
+    cubic = european_fd_pricer('put', spots, 100, 0.05, 0.02, 0.2, 1.0, 100, 100, interpolation='cubic')
+
+    assert len(np.unique(nearest)) < len(spots)
+    assert np.all(np.diff(cubic) < 0)
+
+
+def test_array_of_spots_matches_scalar_calls():
+    spots = np.array([90.0, 101.3, 110.0])
+    prices = american_fd_pricer('put', spots, 100, 0.05, 0.02, 0.2, 1.0, 80, 80)
+
+    for S, price in zip(spots, prices):
+        assert price == pytest.approx(american_fd_pricer('put', S, 100, 0.05, 0.02, 0.2, 1.0, 80, 80,
+                                                         grid='uniform'), abs=1e-12)
+
+
+@pytest.mark.parametrize("grid", ["uniform", "sinh"])
+def test_align_spot_places_the_spot_on_a_node(grid):
+    s_grid, _ = build_spatial_operator(grid, 400, 80, 0.05, 0.02, 0.2, centres=(100, 101.3), align_to=101.3)
+
+    assert np.any(s_grid == 101.3)
+    assert np.all(np.diff(s_grid) > 0)
+
+    # With the spot on a node every interpolation method returns the node value
+    prices = [european_fd_pricer('put', 101.3, 100, 0.05, 0.02, 0.2, 1.0, 80, 80, grid=grid, align_spot=True,
+                                 interpolation=method) for method in ("nearest", "linear", "cubic")]
+    assert np.allclose(prices, prices[0], atol=1e-12)
+
+
+def test_align_spot_needs_a_single_spot():
+    with pytest.raises(ValueError):
+        european_fd_pricer('put', [95, 105], 100, 0.05, 0.02, 0.2, 1.0, 80, 80, align_spot=True)
+
+
+# Beyond Smax = 4K the cubic stencil would extrapolate the slice without bound
+@pytest.mark.parametrize("S", [500.0, -1.0])
+def test_spot_outside_the_grid_raises(S):
+    with pytest.raises(ValueError):
+        american_fd_pricer('call', S, 100, 0.05, 0.02, 0.2, 1.0, 200, 200)
+
+
+def test_strike_ladder_rejects_moneyness_beyond_the_grid():
+    with pytest.raises(ValueError):
+        american_fd_strike_ladder('call', 100, [20.0, 100.0], 0.05, 0.02, 0.2, 1.0, 200, 200)
+
+
+# The cubic stencil straddles the kink at the exercise boundary, the American price must still not drop below intrinsic
+@pytest.mark.parametrize("option_type, T", [('put', 1.0), ('put', 0.02), ('call', 0.02)])
+@pytest.mark.parametrize("lcp_method", ['penalty', 'brennan_schwartz'])
+def test_american_price_is_never_below_payoff(option_type, T, lcp_method):
+    spots = np.linspace(40, 160, 1201)
+    prices = american_fd_pricer(option_type, spots, 100, 0.05, 0.04 if option_type == 'call' else 0.02, 0.3, T,
+                                100, 50, lcp_method=lcp_method)
+    payoff = np.maximum(spots - 100 if option_type == 'call' else 100 - spots, 0.0)
+
+    assert np.all(prices >= payoff)
@@ -0,0 +1,64 @@
+import amopt.uniform.jit as jit
+import amopt.uniform.tridiagonal as tridiagonal
+import amopt.lcp.psor as psor
+import amopt.pricers.american_binomial as american_binomial
+from amopt.pricers.american_fd import american_fd_pricer
+from amopt.pricers.european_fd import european_fd_pricer
+
+import pytest
+import numpy as np
+
+
+def route_through_kernels(monkeypatch):
+    # Sends the pricers through the kernels as the numba backend would; without Numba they run as plain Python
+    for module in (tridiagonal, psor, american_binomial):
+        monkeypatch.setattr(module, 'use_jit', lambda: True)
+
+
+def test_missing_numba_falls_back_to_numpy():
+    if jit.numba is not None:
+        pytest.skip("numba is installed")
+
+    with pytest.warns(RuntimeWarning):
+        assert jit.set_backend('numba') == 'numpy'
+    assert jit.get_backend() == 'numpy'
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError):
+        jit.set_backend('cuda')
+
+
+def test_thomas_kernel_matches_banded_solver():
+    rng = np.random.default_rng(1)
+    n = 50
+    lower, upper = rng.uniform(-1, 0, n), rng.uniform(-1, 0, n)
+    diag = 3 + rng.uniform(0, 1, n)
+    rhs = rng.uniform(-1, 1, n + 2)
+
+    expected = tridiagonal.solve_interior(np.append(0, np.append(lower, 0)), np.append(1, np.append(diag, 1)),
+                                          np.append(0, np.append(upper, 0)), rhs)
+    assert np.allclose(jit.thomas_solve.py_func(lower, diag, upper, rhs[1:-1]), expected[1:-1], atol=1e-13)
+
+
+@pytest.mark.parametrize("lcp_method", ["penalty", "brennan_schwartz"])
+def test_fd_prices_agree_across_backends(monkeypatch, lcp_method):
+    numpy_price = american_fd_pricer('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 60, 30, lcp_method=lcp_method)
+    numpy_euro = european_fd_pricer('call', 100, 100, 0.05, 0.02, 0.2, 1.0, 60, 30)
+
+    route_through_kernels(monkeypatch)
+
+    assert american_fd_pricer('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 60, 30,
+                              lcp_method=lcp_method) == pytest.approx(numpy_price, abs=1e-10)
+    assert european_fd_pricer('call', 100, 100, 0.05, 0.02, 0.2, 1.0, 60, 30) == pytest.approx(numpy_euro, abs=1e-10)
+
+
+def test_binomial_prices_agree_across_backends(monkeypatch):
+    kinds = np.array(['put', 'call', 'put'])
+    numpy_prices = american_binomial.american_binomial_batch_price(kinds, 100, [90, 100, 110], 0.05, 0.03, 0.2,
+                                                                   1.0, 60)
+
+    route_through_kernels(monkeypatch)
+    jit_prices = american_binomial.american_binomial_batch_price(kinds, 100, [90, 100, 110], 0.05, 0.03, 0.2, 1.0, 60)
+
+    assert np.allclose(jit_prices, numpy_prices, atol=1e-10)
@@ -0,0 +1,56 @@
+from amopt.pricers.log_fd import log_fd_pricer
+from amopt.pricers.closed_form import euro_vanilla_price
+from amopt.pricers.american_binomial import american_binomial_price
+from amopt.uniform.tridiagonal import factorise_tridiagonal, solve_factorised
+
+import pytest
+import numpy as np
+
+
+def test_factorised_solve_matches_dense_solve():
+    n = 8
+    lower = np.full(n - 1, -0.3)
+    diag = np.full(n, 1.7)
+    upper = np.full(n - 1, -0.4)
+    A = np.diag(diag) + np.diag(lower, -1) + np.diag(upper, 1)
+    R = np.arange(2 * n, dtype=float).reshape(n, 2)
+
+    x = solve_factorised(factorise_tridiagonal(lower, diag, upper), R)
+
+    assert x == pytest.approx(np.linalg.solve(A, R), rel=1e-12)
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_log_space_european_vs_closed_form(option_type):
+    fd_price = log_fd_pricer(option_type, 100, 100, 0.05, 0.02, 0.2, 1.0, 200, 200, american=False)
+    bs_price = euro_vanilla_price(option_type, 100, 100, 0.05, 1.0, 0.2, 0.02)
+
+    assert fd_price == pytest.approx(bs_price, abs=5e-3)
+
+
+# Crank–Nicolson in x = ln S is second order: doubling the grid should cut the error roughly by four
+def test_log_space_convergence():
+    bs_price = euro_vanilla_price('put', 100, 100, 0.05, 1.0, 0.2, 0.02)
+    coarse_error = abs(log_fd_pricer('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 100, 100, american=False) - bs_price)
+    fine_error = abs(log_fd_pricer('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 200, 200, american=False) - bs_price)
+
+    assert fine_error < 0.35 * coarse_error
+
+
+def test_log_space_american_put_vs_binomial():
+    fd_price = log_fd_pricer('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 200, 200)
+    binomial_price = american_binomial_price('put', 100, 100, 0.05, 0.02, 0.2, 1, 2000)
+
+    assert fd_price == pytest.approx(binomial_price, rel=1e-3)
+
+
+# A strike ladder shares one factorisation, each strike is a column of the same march
+def test_strike_ladder_matches_single_strikes():
+    strikes = np.array([90.0, 100.0, 110.0])
+    spots = np.array([95.0, 100.0, 105.0])
+
+    ladder = log_fd_pricer('put', spots, strikes, 0.05, 0.02, 0.2, 1.0, 200, 200)
+
+    # A single contract gets its own, narrower grid, so the agreement is to discretisation accuracy
+    for price, S, K in zip(ladder, spots, strikes):
+        assert price == pytest.approx(log_fd_pricer('put', S, K, 0.05, 0.02, 0.2, 1.0, 200, 200), abs=5e-3)
@@ -0,0 +1,56 @@
+from amopt.pricers.maturity_ladder import american_fd_maturity_ladder, maturity_schedule
+from amopt.pricers.closed_form import euro_vanilla_price
+from amopt.pricers.american_binomial import american_binomial_price
+
+import pytest
+import numpy as np
+
+
+def test_schedule_hits_every_expiry():
+    schedule = maturity_schedule(np.array([0.1, 0.25, 1.0]), 100)
+
+    assert [expiry for expiry, _, _ in schedule] == [0.1, 0.25, 1.0]
+    assert sum(dt * steps for _, dt, steps in schedule) == pytest.approx(1.0)
+    assert [steps for _, _, steps in schedule] == [10, 15, 75]
+
+
+def test_expiry_between_time_nodes_is_hit_exactly():
+    # 0.505 is not a multiple of 0.01: its piece takes 50 steps of 0.0101, as when marching to 0.505 alone
+    ladder = american_fd_maturity_ladder('put', 100, 100, 0.05, 0.02, 0.2, [1.0, 0.505], 100, 100)
+    short = american_fd_maturity_ladder('put', 100, 100, 0.05, 0.02, 0.2, [0.505], 100, 50)
+
+    assert ladder[1] == pytest.approx(short[0], abs=1e-12)
+
+
+def test_expiry_shorter_than_the_time_step_is_marched():
+    # One step of 0.001 instead of the payoff (0.0 at the money)
+    ladder = american_fd_maturity_ladder('put', 100, 100, 0.05, 0.02, 0.2, [0.001, 1.0], 1600, 50)
+    tree = american_binomial_price('put', 100, 100, 0.05, 0.02, 0.2, 0.001, 2000)
+
+    assert ladder[0] == pytest.approx(tree, abs=0.05)
+
+
+@pytest.mark.parametrize("lcp_method", ["penalty", "brennan_schwartz", "psor"])
+def test_one_march_matches_marching_to_each_expiry(lcp_method):
+    # With dt = 0.01 throughout, stopping the long march at 0.5 is the same as marching to 0.5 alone
+    ladder = american_fd_maturity_ladder('put', 100, 100, 0.05, 0.02, 0.2, [1.0, 0.5], 100, 100, lcp_method=lcp_method)
+    short = american_fd_maturity_ladder('put', 100, 100, 0.05, 0.02, 0.2, [0.5], 100, 50, lcp_method=lcp_method)
+
+    assert ladder[1] == pytest.approx(short[0], abs=1e-12)
+
+
+def test_european_call_ladder_matches_closed_form():
+    expiries = np.array([0.1, 0.5, 1.0, 2.0])
+    ladder = american_fd_maturity_ladder('call', 100, 100, 0.05, 0.0, 0.2, expiries, 200, 400)
+
+    assert np.allclose(ladder, euro_vanilla_price('call', 100, 100, 0.05, expiries, 0.2, 0.0), atol=0.05)
+
+
+def test_american_put_ladder_matches_binomial():
+    expiries = np.array([0.25, 1.0, 0.5])
+    ladder = american_fd_maturity_ladder('put', [95, 105], 100, 0.05, 0.02, 0.2, expiries, 200, 400)
+
+    assert ladder.shape == (3, 2)
+    for prices, T in zip(ladder, expiries):
+        tree = [american_binomial_price('put', S, 100, 0.05, 0.02, 0.2, T, 2000, smooth=True) for S in (95, 105)]
+        assert np.allclose(prices, tree, atol=0.05)
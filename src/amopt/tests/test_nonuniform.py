@@ -0,0 +1,50 @@
+from amopt.dataclasses.grids import stock_grid, sinh_stock_grid
+from amopt.uniform.operators import bs_spatial_operator
+from amopt.nonuniform.operators import bs_nonuniform_spatial_operator
+from amopt.pricers.american_fd import american_fd_surface
+from amopt.pricers.closed_form import euro_vanilla_price
+
+import pytest
+import numpy as np
+
+
+# On an evenly spaced grid the variable-spacing stencil must collapse to the uniform central differences
+def test_nonuniform_operator_matches_uniform_operator_on_uniform_grid():
+    s_grid = stock_grid(400, 100)
+
+    uniform = bs_spatial_operator(s_grid, 0.05, 0.02, 0.2)
+    nonuniform = bs_nonuniform_spatial_operator(s_grid, 0.05, 0.02, 0.2)
+
+    for expected, actual in zip(uniform, nonuniform):
+        assert actual == pytest.approx(expected, rel=1e-10, abs=1e-10)
+
+
+def test_sinh_grid_clusters_nodes_around_centres():
+    s_grid = sinh_stock_grid(400, 100, (100, 130), 10)
+    spacing = np.diff(s_grid)
+
+    assert s_grid[0] == 0.0 and s_grid[-1] == 400.0
+    assert np.all(spacing > 0)
+    # Finest spacing near the centres, coarsest in the far field
+    assert spacing[np.searchsorted(s_grid, 100)] < 0.5 * (400 / 100)
+    assert spacing[np.searchsorted(s_grid, 130)] < 0.5 * (400 / 100)
+    assert spacing[-1] > 2 * (400 / 100)
+
+
+# The European call (no dividends) is solved without early exercise, so grid values can be compared with the closed
+# form around the strike. The solver's last time step ends at T - dt.
+def test_sinh_grid_is_more_accurate_near_strike():
+    T, time_intervals = 1.0, 1000
+    errors = {}
+    for grid in ('uniform', 'sinh'):
+        V, s_grid = american_fd_surface('call', 100, 0.05, 0.0, 0.2, T, 100, time_intervals, grid=grid)
+        near_strike = (s_grid > 80) & (s_grid < 120)
+        exact = euro_vanilla_price('call', s_grid[near_strike], 100, 0.05, T - T / time_intervals, 0.2, 0.0)
+        errors[grid] = np.max(np.abs(V[near_strike, 0] - exact))
+
+    assert errors['sinh'] < 0.25 * errors['uniform']
+
+
+def test_unknown_grid_raises():
+    with pytest.raises(ValueError):
+        american_fd_surface('put', 100, 0.05, 0.02, 0.2, 1.0, 20, 20, grid='chebyshev')
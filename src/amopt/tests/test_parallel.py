@@ -0,0 +1,45 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from amopt.pricers.parallel import parallel_fd_price
+from amopt.pricers.batch_fd import american_fd_batch_pricer, european_fd_batch_pricer
+
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def chain():
+    strikes = np.linspace(80, 120, 10)
+    option_types = np.where(strikes < 100, 'put', 'call')
+    return option_types, strikes
+
+
+@pytest.mark.parametrize("american, batch_pricer", [(True, american_fd_batch_pricer),
+                                                    (False, european_fd_batch_pricer)])
+def test_pool_matches_the_batch_pricer(chain, american, batch_pricer):
+    option_types, strikes = chain
+    pooled = parallel_fd_price(option_types, 100, strikes, 0.05, 0.02, 0.2, 1.0, 60, 60, american=american,
+                               n_workers=2, chunk_size=3, min_parallel=0)
+
+    assert np.array_equal(pooled, batch_pricer(option_types, 100, strikes, 0.05, 0.02, 0.2, 1.0, 60, 60))
+
+
+def test_executor_is_reused_across_calls(chain):
+    option_types, strikes = chain
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        first = parallel_fd_price(option_types, 100, strikes, 0.05, 0.02, 0.2, 1.0, 40, 40, min_parallel=0,
+                                  executor=executor)
+        second = parallel_fd_price(option_types, 100, strikes, 0.05, 0.02, 0.25, 1.0, 40, 40, min_parallel=0,
+                                   executor=executor)
+
+    assert np.all(second > first)
+
+
+def test_small_batches_run_in_process(chain):
+    option_types, strikes = chain
+    prices = parallel_fd_price(option_types.reshape(2, 5), 100, strikes.reshape(2, 5), 0.05, 0.02, 0.2, 1.0, 40, 40,
+                               min_parallel=64)
+
+    assert prices.shape == (2, 5)
+    assert np.array_equal(prices.ravel(),
+                          american_fd_batch_pricer(option_types, 100, strikes, 0.05, 0.02, 0.2, 1.0, 40, 40))
@@ -1,6 +1,11 @@
 from amopt.pricers.american_fd import american_fd_pricer, american_fd_surface
 from amopt.pricers.closed_form import euro_vanilla_price
 from amopt.pricers.american_binomial import american_binomial_price
+from amopt.lcp.penalty import penalty_pde_solver, penalty_pde_slices
+from amopt.lcp.psor import lcp_pde_solver
+from amopt.dataclasses.grids import stock_grid
+from amopt.uniform.operators import bs_spatial_operator
+from amopt.pricers.pde_operator import crank_nicholson_exp_coefficients, crank_nicholson_imp_coefficients
 
 import pytest
 import numpy as np
@@ -196,3 +201,61 @@ def test_put_value_increases_as_strike_price_increases(default_american_option_p
 
     assert new_p_value >= default_american_option_price
 
+
+@pytest.fixture
+def put_coefficients():
+    s_grid = stock_grid(400, 100)
+    L, D, U = bs_spatial_operator(s_grid, 0.05, 0.02, 0.2)
+    imp = crank_nicholson_imp_coefficients(L, D, U, 0.01)
+    exp = crank_nicholson_exp_coefficients(L, D, U, 0.01)
+
+    return imp, exp, s_grid
+
+
+# Policy iteration settles within a handful of solves and never exceeds the configured cap
+def test_penalty_iterations_are_bounded(put_coefficients):
+    imp, exp, s_grid = put_coefficients
+    V, iterations = penalty_pde_solver('put', *imp, *exp, 100, s_grid, 1.0, 0.05, 0.02, 100,
+                                       return_iterations=True)
+
+    assert iterations.shape == (100,)
+    assert np.all(iterations[:-1] >= 1)
+    assert np.max(iterations) <= 5
+
+    V_capped, capped_iterations = penalty_pde_solver('put', *imp, *exp, 100, s_grid, 1.0, 0.05, 0.02, 100,
+                                                     max_iter=1, return_iterations=True)
+    assert np.max(capped_iterations) == 1
+    assert np.all(V_capped[1:-1, 0] >= np.maximum(100 - s_grid[1:-1], 0.0))
+
+
+# As lambda grows the penalised solution approaches the exact discrete LCP solution
+def test_large_penalty_matches_lcp_solution(put_coefficients):
+    imp, exp, s_grid = put_coefficients
+    lcp_values = lcp_pde_solver('put', *imp, *exp, 100, s_grid, 1.0, 0.05, 0.02, 100)
+    weak_values = penalty_pde_solver('put', *imp, *exp, 100, s_grid, 1.0, 0.05, 0.02, 100, penalty=1e2)
+    strong_values = penalty_pde_solver('put', *imp, *exp, 100, s_grid, 1.0, 0.05, 0.02, 100, penalty=1e8)
+
+    strong_error = np.max(np.abs(strong_values[:, 0] - lcp_values[:, 0]))
+    weak_error = np.max(np.abs(weak_values[:, 0] - lcp_values[:, 0]))
+
+    assert strong_error < 1e-6
+    assert strong_error < weak_error
+
+
+# A neighbouring march's exercise boundary seeds each step's exercise set: same solution in fewer solves
+def test_warm_start_from_neighbour_boundary(put_coefficients):
+    imp, exp, s_grid = put_coefficients
+    boundary = np.zeros(100)
+    for _ in penalty_pde_slices('put', *imp, *exp, 100, s_grid, 1.0, 0.05, 0.02, 100, boundary_log=boundary):
+        pass
+
+    L, D, U = bs_spatial_operator(s_grid, 0.05, 0.02, 0.201)
+    bumped = (crank_nicholson_imp_coefficients(L, D, U, 0.01), crank_nicholson_exp_coefficients(L, D, U, 0.01))
+    cold_iterations, warm_iterations = np.zeros(100, dtype=int), np.zeros(100, dtype=int)
+    cold = dict(penalty_pde_slices('put', *bumped[0], *bumped[1], 100, s_grid, 1.0, 0.05, 0.02, 100,
+                                   iteration_log=cold_iterations))
+    warm = dict(penalty_pde_slices('put', *bumped[0], *bumped[1], 100, s_grid, 1.0, 0.05, 0.02, 100,
+                                   iteration_log=warm_iterations, warm_start=boundary))
+
+    np.testing.assert_allclose(warm[0], cold[0], atol=1e-10)
+    assert warm_iterations.sum() < 0.75 * cold_iterations.sum()
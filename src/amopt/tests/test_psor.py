@@ -0,0 +1,86 @@
+from amopt.lcp.psor import brennan_schwartz_factor, brennan_schwartz_solve, psor_solve
+from amopt.pricers.american_fd import american_fd_pricer, american_fd_surface
+from amopt.dataclasses.grids import stock_grid
+from amopt.uniform.operators import bs_spatial_operator
+from amopt.pricers.pde_operator import crank_nicholson_exp_coefficients, crank_nicholson_imp_coefficients
+from amopt.uniform.tridiagonal import explicit_rhs
+
+import pytest
+import numpy as np
+
+
+# Helper function - textbook Brennan–Schwartz for a put, eliminating from the top and substituting node by node
+def brennan_schwartz_reference(L, D, U, R, payoff):
+    n = len(D)
+    d_prime = D.copy()
+    r_prime = R.copy()
+    for i in range(n - 2, -1, -1):
+        m = U[i] / d_prime[i + 1]
+        d_prime[i] -= m * L[i + 1]
+        r_prime[i] -= m * r_prime[i + 1]
+
+    V = np.zeros(n)
+    V[0] = max(payoff[0], r_prime[0] / d_prime[0])
+    for i in range(1, n):
+        V[i] = max(payoff[i], (r_prime[i] - L[i] * V[i - 1]) / d_prime[i])
+
+    return V
+
+
+@pytest.fixture
+def interior_lcp(request):
+    option_type = request.param
+    K = 100
+    s_grid = stock_grid(4 * K, 120)
+    L, D, U = bs_spatial_operator(s_grid, 0.05, 0.03, 0.2)
+    L_imp, D_imp, U_imp = crank_nicholson_imp_coefficients(L, D, U, 0.05)
+    L_exp, D_exp, U_exp = crank_nicholson_exp_coefficients(L, D, U, 0.05)
+
+    if option_type == 'call':
+        payoff = np.maximum(s_grid - K, 0.0)
+    else:
+        payoff = np.maximum(K - s_grid, 0.0)
+
+    # One step back from maturity, the payoff is the old solution
+    R = explicit_rhs(L_exp, D_exp, U_exp, payoff)
+
+    return option_type, L_imp[1:-1], D_imp[1:-1], U_imp[1:-1], R[1:-1], payoff[1:-1]
+
+
+@pytest.mark.parametrize("interior_lcp", ["put"], indirect=True)
+def test_brennan_schwartz_matches_sequential_reference(interior_lcp):
+    option_type, L, D, U, R, payoff = interior_lcp
+
+    V = brennan_schwartz_solve(brennan_schwartz_factor(option_type, L, D, U), R, payoff)
+
+    assert V == pytest.approx(brennan_schwartz_reference(L, D, U, R, payoff), rel=1e-12, abs=1e-12)
+
+
+@pytest.mark.parametrize("interior_lcp", ["call", "put"], indirect=True)
+def test_psor_matches_brennan_schwartz(interior_lcp):
+    option_type, L, D, U, R, payoff = interior_lcp
+
+    direct = brennan_schwartz_solve(brennan_schwartz_factor(option_type, L, D, U), R, payoff)
+
+    V = payoff.copy()
+    iterations = psor_solve(L, D, U, R, payoff, V, omega=1.3, tolerance=1e-12, max_iter=5000)
+
+    assert iterations < 5000
+    assert V == pytest.approx(direct, abs=1e-9)
+    assert np.all(V >= payoff)
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_lcp_methods_agree_with_penalty(option_type):
+    penalty_price = american_fd_pricer(option_type, 100, 100, 0.05, 0.02, 0.2, 1.0, 100, 100)
+    bs_price = american_fd_pricer(option_type, 100, 100, 0.05, 0.02, 0.2, 1.0, 100, 100,
+                                  lcp_method='brennan_schwartz')
+    psor_price = american_fd_pricer(option_type, 100, 100, 0.05, 0.02, 0.2, 1.0, 100, 100, lcp_method='psor')
+
+    assert bs_price == pytest.approx(penalty_price, rel=1e-3)
+    assert psor_price == pytest.approx(bs_price, abs=1e-6)
+
+
+def test_unknown_lcp_method_raises():
+    with pytest.raises(ValueError):
+        american_fd_surface('put', 100, 0.05, 0.02, 0.2, 1.0, 20, 20, lcp_method='simplex')
@@ -0,0 +1,60 @@
+from amopt.pricers.richardson import richardson_price, richardson_extrapolate
+from amopt.pricers.closed_form import euro_vanilla_price
+from amopt.pricers.european_fd import european_fd_pricer
+from amopt.pricers.binomial import european_binomial_price
+from amopt.pricers.american_binomial import american_binomial_price
+
+import pytest
+import numpy as np
+
+
+def test_extrapolation_removes_the_given_error_terms():
+    h = np.array([0.1, 0.05, 0.025])
+    values = 3.0 + 2.0 * h + 5.0 * h ** 2
+
+    value, error = richardson_extrapolate(values, (1, 2))
+
+    assert value == pytest.approx(3.0, abs=1e-12)
+    assert error > 0
+
+
+def test_extrapolation_needs_enough_values():
+    with pytest.raises(ValueError):
+        richardson_extrapolate([1.0, 2.0], (1, 2))
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_extrapolated_fd_beats_the_finest_level(option_type):
+    exact = euro_vanilla_price(option_type, 100, 100, 0.05, 1.0, 0.2, 0.02)
+
+    price, error = richardson_price('european_fd', option_type, 100, 100, 0.05, 0.02, 0.2, 1.0, 100)
+    finest = european_fd_pricer(option_type, 100, 100, 0.05, 0.02, 0.2, 1.0, 400, 400)
+
+    assert abs(price - exact) < 0.05 * abs(finest - exact)
+    assert abs(price - exact) < error
+
+
+@pytest.mark.parametrize("option_type", ["call", "put"])
+def test_bbsr_tree_matches_closed_form(option_type):
+    exact = euro_vanilla_price(option_type, 100, 100, 0.05, 1.0, 0.2, 0.02)
+
+    price, error = richardson_price('european_binomial', option_type, 100, 100, 0.05, 0.02, 0.2, 1.0, 100)
+    crr = european_binomial_price(option_type, 100, 100, 0.05, 0.02, 0.2, 1.0, 200)
+
+    assert abs(price - exact) < 1e-4
+    assert abs(price - exact) < 0.1 * abs(crr - exact)
+
+
+def test_american_fd_and_bbsr_agree():
+    reference = american_binomial_price('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 10000, smooth=True)
+
+    fd_price, fd_error = richardson_price('american_fd', 'put', 100, 100, 0.05, 0.02, 0.2, 1.0, 100)
+    tree_price, tree_error = richardson_price('american_binomial', 'put', 100, 100, 0.05, 0.02, 0.2, 1.0, 200)
+
+    assert fd_price == pytest.approx(reference, abs=5e-4)
+    assert tree_price == pytest.approx(reference, abs=5e-4)
+
+
+def test_unknown_pricer_raises():
+    with pytest.raises(ValueError):
+        richardson_price('trinomial', 'put', 100, 100, 0.05, 0.02, 0.2, 1.0, 100)
@@ -0,0 +1,26 @@
+from amopt.pricers.american_fd import american_fd_surface, american_fd_slices
+
+import pytest
+import numpy as np
+
+
+@pytest.mark.parametrize("option_type, q", [("put", 0.02), ("call", 0.0)])
+def test_surface_free_mode_matches_full_surface(option_type, q):
+    full_surface, s_grid = american_fd_surface(option_type, 100, 0.05, q, 0.2, 1.0, 80, 80)
+    t0_slice, _ = american_fd_surface(option_type, 100, 0.05, q, 0.2, 1.0, 80, 80, store_surface=False)
+
+    assert t0_slice.shape == (len(s_grid), 1)
+    assert np.array_equal(t0_slice[:, 0], full_surface[:, 0])
+
+
+def test_slices_stream_every_kth_column_of_the_surface():
+    full_surface, s_grid = american_fd_surface('put', 100, 0.05, 0.02, 0.2, 1.0, 60, 60)
+    slices, slice_grid = american_fd_slices('put', 100, 0.05, 0.02, 0.2, 1.0, 60, 60, every=7)
+
+    streamed = dict(slices)
+
+    # Maturity first, then every 7th time index down to t=0
+    assert list(streamed) == [59] + list(range(56, -1, -7))
+    assert np.array_equal(slice_grid, s_grid)
+    for n, V in streamed.items():
+        assert np.array_equal(V, full_surface[:, n])
@@ -0,0 +1,32 @@
+from amopt.pricers.strike_ladder import american_fd_strike_ladder
+from amopt.pricers.american_fd import american_fd_pricer
+
+import pytest
+import numpy as np
+
+
+@pytest.mark.parametrize("option_type, q, lcp_method", [("put", 0.02, "penalty"), ("put", 0.02, "brennan_schwartz"),
+                                                        ("call", 0.03, "penalty"), ("call", 0.0, "penalty")])
+def test_flat_vol_ladder_matches_per_strike_solves(option_type, q, lcp_method):
+    strikes = np.linspace(80, 120, 9)
+    ladder = american_fd_strike_ladder(option_type, 100, strikes, 0.05, q, 0.2, 1.0, 100, 100, lcp_method=lcp_method)
+    single = [american_fd_pricer(option_type, 100, K, 0.05, q, 0.2, 1.0, 100, 100, lcp_method=lcp_method)
+              for K in strikes]
+
+    assert np.allclose(ladder, single, rtol=1e-10, atol=1e-10)
+
+
+def test_smile_vols_fall_back_to_one_solve_per_vol():
+    strikes = np.array([90.0, 100.0, 110.0, 120.0])
+    vols = np.array([0.25, 0.2, 0.2, 0.22])
+
+    ladder = american_fd_strike_ladder('put', 100, strikes, 0.05, 0.02, vols, 1.0, 100, 100)
+    single = [american_fd_pricer('put', 100, K, 0.05, 0.02, vol, 1.0, 100, 100) for K, vol in zip(strikes, vols)]
+
+    assert np.allclose(ladder, single, rtol=1e-10, atol=1e-10)
+
+
+def test_scalar_strike_returns_a_scalar():
+    price = american_fd_strike_ladder('put', 100, 100, 0.05, 0.02, 0.2, 1.0, 50, 50)
+
+    assert np.ndim(price) == 0
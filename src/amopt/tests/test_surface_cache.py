@@ -0,0 +1,47 @@
+from amopt.pricers.surface_cache import cached_american_fd_price, invalidate_surfaces
+from amopt.pricers.american_fd import american_fd_pricer
+from amopt.pricers.cache import LRUCache
+
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def cache():
+    return LRUCache(max_entries=None, max_bytes=2 ** 20)
+
+
+def test_spot_ticks_are_served_from_one_solve(cache):
+    ticks = [99.5, 100.0, 100.7, 101.2]
+    prices = [cached_american_fd_price('put', S, 100, 0.05, 0.02, 0.2, 1.0, 100, 100, cache=cache) for S in ticks]
+
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hits'] == len(ticks) - 1
+    assert np.allclose(prices, [american_fd_pricer('put', S, 100, 0.05, 0.02, 0.2, 1.0, 100, 100) for S in ticks],
+                       atol=1e-12)
+
+
+def test_invalidation_after_a_vol_update(cache):
+    for sigma in (0.2, 0.25):
+        cached_american_fd_price('put', 100, 100, 0.05, 0.02, sigma, 1.0, 50, 50, cache=cache)
+
+    assert invalidate_surfaces(cache=cache, sigma=0.2) == 1
+    assert len(cache) == 1
+
+    assert invalidate_surfaces(cache=cache) == 1
+    assert len(cache) == 0
+
+
+def test_memory_bound_evicts_old_surfaces():
+    # Each cached (grid, slice) pair of a 100-interval grid takes 2 * 101 * 8 bytes
+    small_cache = LRUCache(max_entries=None, max_bytes=3 * 2 * 101 * 8)
+    for K in (90, 95, 100, 105):
+        cached_american_fd_price('put', 100, K, 0.05, 0.02, 0.2, 1.0, 100, 50, cache=small_cache)
+
+    assert len(small_cache) == 3
+    assert small_cache.evictions == 1
+
+
+def test_spot_outside_the_grid_raises(cache):
+    with pytest.raises(ValueError):
+        cached_american_fd_price('put', 500, 100, 0.05, 0.02, 0.2, 1.0, 50, 50, cache=cache)
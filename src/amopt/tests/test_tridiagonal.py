@@ -0,0 +1,72 @@
+from amopt.uniform.tridiagonal import explicit_rhs, solve_interior
+from amopt.dataclasses.grids import stock_grid
+from amopt.uniform.operators import bs_spatial_operator
+from amopt.pricers.pde_operator import crank_nicholson_exp_coefficients, crank_nicholson_imp_coefficients
+
+import pytest
+import numpy as np
+
+
+# Helper function - reference Thomas sweep on the interior nodes, as previously written inside the solvers
+def thomas_reference(L, D, U, R):
+    n = len(R)
+    c_star = np.zeros(n)
+    d_star = np.zeros(n)
+    V = np.zeros(n)
+
+    d_star[1] = R[1] / D[1]
+    c_star[1] = U[1] / D[1]
+    for i in range(2, n - 1):
+        denom = D[i] - c_star[i - 1] * L[i]
+        c_star[i] = U[i] / denom
+        d_star[i] = (R[i] - d_star[i - 1] * L[i]) / denom
+
+    for i in range(n - 2, 0, -1):
+        V[i] = d_star[i] - c_star[i] * V[i + 1]
+
+    return V
+
+
+@pytest.fixture
+def cn_coefficients():
+    s_grid = stock_grid(400, 100)
+    L, D, U = bs_spatial_operator(s_grid, 0.05, 0.02, 0.2)
+    imp = crank_nicholson_imp_coefficients(L, D, U, 0.01)
+    exp = crank_nicholson_exp_coefficients(L, D, U, 0.01)
+    return s_grid, imp, exp
+
+
+def test_explicit_rhs_matches_loop(cn_coefficients):
+    s_grid, imp, (L_exp, D_exp, U_exp) = cn_coefficients
+    V = np.maximum(s_grid - 100, 0.0)
+
+    R = explicit_rhs(L_exp, D_exp, U_exp, V)
+
+    expected = np.zeros(len(s_grid))
+    for k in range(1, len(s_grid) - 1):
+        expected[k] = L_exp[k] * V[k - 1] + D_exp[k] * V[k] + U_exp[k] * V[k + 1]
+
+    assert np.allclose(R, expected, rtol=1e-14, atol=1e-12)
+
+
+def test_solve_interior_matches_thomas(cn_coefficients):
+    s_grid, (L_imp, D_imp, U_imp), exp = cn_coefficients
+    R = np.sin(s_grid / 40.0)
+
+    V = solve_interior(L_imp, D_imp, U_imp, R)
+
+    assert V[0] == 0.0 and V[-1] == 0.0
+    assert np.allclose(V, thomas_reference(L_imp, D_imp, U_imp, R), rtol=1e-12, atol=1e-12)
+
+
+# A stack of independent systems must give the same answer as solving each row on its own
+def test_stacked_systems_are_independent(cn_coefficients):
+    s_grid, (L_imp, D_imp, U_imp), exp = cn_coefficients
+    R = np.vstack([np.sin(s_grid / 40.0), np.cos(s_grid / 25.0), s_grid / 400.0])
+    D_stack = D_imp + np.array([[0.0], [0.5], [2.0]])
+
+    V = solve_interior(L_imp, D_stack, U_imp, R)
+
+    for row in range(R.shape[0]):
+        expected = thomas_reference(L_imp, D_stack[row], U_imp, R[row])
+        assert np.allclose(V[row], expected, rtol=1e-12, atol=1e-12)
@@ -0,0 +1,85 @@
+from amopt.uniform.workspace import Workspace
+from amopt.pricers.batch_fd import american_fd_batch_pricer, european_fd_batch_pricer
+from amopt.pricers.american_fd import american_fd_surface, american_fd_pricer
+
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def chain():
+    option_type = np.array(['put', 'call', 'put', 'call'])
+    S = np.array([90.0, 100.0, 110.0, 95.0])
+    K = np.array([100.0, 100.0, 100.0, 90.0])
+    return option_type, S, K, 0.05, 0.02, np.array([0.2, 0.25, 0.3, 0.2]), np.array([0.5, 1.0, 1.0, 0.25])
+
+
+def test_buffers_are_reused():
+    workspace = Workspace()
+    first = workspace.get('V', (3, 5))
+    assert workspace.get('V', (3, 5)) is first
+    assert workspace.nbytes == 3 * 5 * 8
+
+    # A new shape replaces the buffer instead of adding one
+    assert workspace.get('V', (2, 5)).shape == (2, 5)
+    assert workspace.nbytes == 2 * 5 * 8
+    assert np.all(workspace.zeros('V', (2, 5)) == 0.0)
+
+
+def test_invalid_dtype_raises():
+    with pytest.raises(ValueError):
+        Workspace(np.int64)
+
+
+@pytest.mark.parametrize("pricer", [american_fd_batch_pricer, european_fd_batch_pricer])
+def test_float32_matches_float64(chain, pricer):
+    double = pricer(*chain, 200, 200)
+    single = pricer(*chain, 200, 200, dtype=np.float32)
+
+    assert single.dtype == np.float64
+    np.testing.assert_allclose(single, double, rtol=1e-4, atol=1e-4)
+
+
+def test_shared_workspace_gives_identical_prices(chain):
+    workspace = Workspace()
+    first = american_fd_batch_pricer(*chain, 100, 100, workspace=workspace)
+    allocated = workspace.nbytes
+    second = american_fd_batch_pricer(*chain, 100, 100, workspace=workspace)
+
+    assert workspace.nbytes == allocated
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_array_equal(first, american_fd_batch_pricer(*chain, 100, 100))
+
+
+@pytest.mark.parametrize("lcp_method", ['penalty', 'psor', 'brennan_schwartz'])
+def test_surface_free_march_matches_full_surface(lcp_method):
+    full, _ = american_fd_surface('put', 100.0, 0.05, 0.02, 0.2, 1.0, 100, 100, lcp_method=lcp_method)
+    last, _ = american_fd_surface('put', 100.0, 0.05, 0.02, 0.2, 1.0, 100, 100, lcp_method=lcp_method,
+                                  store_surface=False)
+
+    np.testing.assert_array_equal(last[:, 0], full[:, 0])
+
+
+@pytest.mark.parametrize("lcp_method", ['penalty', 'psor', 'brennan_schwartz'])
+def test_american_fd_pricer_float32_matches_float64(lcp_method):
+    double = american_fd_pricer('put', [90.0, 100.0, 110.0], 100.0, 0.05, 0.02, 0.2, 1.0, 200, 200,
+                                lcp_method=lcp_method)
+    single = american_fd_pricer('put', [90.0, 100.0, 110.0], 100.0, 0.05, 0.02, 0.2, 1.0, 200, 200,
+                                lcp_method=lcp_method, dtype=np.float32)
+
+    assert single.dtype == np.float64
+    np.testing.assert_allclose(single, double, atol=1e-4)
+
+
+@pytest.mark.parametrize("lcp_method", ['penalty', 'psor', 'brennan_schwartz'])
+def test_american_fd_pricer_reuses_workspace(lcp_method):
+    workspace = Workspace()
+    first = american_fd_pricer('put', 100.0, 100.0, 0.05, 0.02, 0.2, 1.0, 100, 100, lcp_method=lcp_method,
+                               workspace=workspace)
+    allocated = workspace.nbytes
+    second = american_fd_pricer('put', 100.0, 100.0, 0.05, 0.02, 0.2, 1.0, 100, 100, lcp_method=lcp_method,
+                                workspace=workspace)
+
+    assert workspace.nbytes == allocated
+    assert second == first
+    assert first == american_fd_pricer('put', 100.0, 100.0, 0.05, 0.02, 0.2, 1.0, 100, 100, lcp_method=lcp_method)
@@ -0,0 +1,120 @@
+import warnings
+
+import numpy as np
+
+# Numba is optional: without it every kernel below runs as plain Python and the pricers keep their NumPy code paths
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ('numpy', 'numba')
+_active_backend = 'numpy'
+
+
+def set_backend(name):
+    """
+        Selects the kernel backend at runtime. 'numba' compiles the scalar kernels in nopython, nogil mode with an
+        on-disk compile cache, so they run at compiled speed and can be called from threads without holding the GIL.
+        When Numba is not installed a warning is issued and the NumPy backend stays active.
+
+        Parameters:
+            name (string): 'numpy' or 'numba'
+
+        Returns:
+            (string) the backend now active
+        """
+    global _active_backend
+
+    if name not in BACKENDS:
+        raise ValueError("backend must be 'numpy' or 'numba'")
+
+    if name == 'numba' and numba is None:
+        warnings.warn("numba is not installed, keeping the NumPy backend", RuntimeWarning)
+        name = 'numpy'
+
+    _active_backend = name
+    return _active_backend
+
+
+def get_backend():
+    return _active_backend
+
+
+def use_jit():
+    return _active_backend == 'numba'
+
+
+def jit_kernel(func):
+    """Compiles func with numba.njit(nogil=True, cache=True) when Numba is available; the plain Python function
+    is always reachable as .py_func, as on a compiled dispatcher."""
+    if numba is None:
+        func.py_func = func
+        return func
+
+    return numba.njit(nogil=True, cache=True)(func)
+
+
+@jit_kernel
+def thomas_solve(lower, diag, upper, rhs):
+    """Thomas algorithm for a single tri-diagonal system: lower[0] and upper[-1] are ignored."""
+    n = len(diag)
+    c = np.empty(n)
+    x = np.empty(n)
+
+    c[0] = upper[0] / diag[0]
+    x[0] = rhs[0] / diag[0]
+    for i in range(1, n):
+        m = diag[i] - lower[i] * c[i - 1]
+        c[i] = upper[i] / m
+        x[i] = (rhs[i] - lower[i] * x[i - 1]) / m
+
+    for i in range(n - 2, -1, -1):
+        x[i] -= c[i] * x[i + 1]
+
+    return x
+
+
+@jit_kernel
+def brennan_schwartz_eliminate(L, D, U):
+    """Upward elimination of brennan_schwartz_factor: returns the reduced diagonal and the multipliers."""
+    n = len(D)
+    d_prime = np.zeros(n)
+    multiplier = np.zeros(n)
+
+    d_prime[-1] = D[-1]
+    for i in range(n - 2, -1, -1):
+        multiplier[i] = U[i] / d_prime[i + 1]
+        d_prime[i] = D[i] - multiplier[i] * L[i + 1]
+
+    return d_prime, multiplier
+
+
+@jit_kernel
+def binomial_induction(sign, S, K, u, d, p, disc, steps, american):
+    """Backward induction of binomial_backward_induction for every contract, one row at a time and in place, without
+    the per-level temporaries of the vectorised form."""
+    n_options = len(S)
+    prices = np.empty(n_options)
+    values = np.empty(steps + 1)
+
+    for k in range(n_options):
+        ratio = u[k] / d[k]
+
+        # At maturity (t=T) the option's value equals the payoff
+        node = S[k] * d[k] ** steps
+        for j in range(steps + 1):
+            values[j] = max(sign[k] * (node - K[k]), 0.0)
+            node *= ratio
+
+        for i in range(steps - 1, -1, -1):
+            node = S[k] * d[k] ** i
+            for j in range(i + 1):
+                values[j] = disc[k] * (p[k] * values[j + 1] + (1 - p[k]) * values[j])
+                if american:
+                    values[j] = max(values[j], sign[k] * (node - K[k]))
+                node *= ratio
+
+        prices[k] = values[0]
+
+    return prices
@@ -1,21 +1,33 @@
 import numpy as np
 
 
+# S may be a single grid of shape (n_nodes,) or a stack of grids of shape (n_options, n_nodes), in which case r, q and
+# sigma are expected to broadcast against it, e.g. with shape (n_options, 1).
 def bs_spatial_operator(S, r, q, sigma):
-    M = len(S)
-    dS = S[1] - S[0]
+    S = np.asarray(S, dtype=float)
+    dS = S[..., 1:2] - S[..., 0:1]
 
-    L = np.zeros(M)
-    D = np.zeros(M)
-    U = np.zeros(M)
+    L = np.zeros(np.broadcast_shapes(S.shape, np.shape(r), np.shape(q), np.shape(sigma)))
+    D = np.zeros(L.shape)
+    U = np.zeros(L.shape)
 
-    for i in range(1, M-1):
-        alpha = 0.5 * (sigma**2 * S[i]**2) / dS ** 2
-        beta = 0.5 * ((r-q) * S[i]) / dS
+    S_int = S[..., 1:-1]
+    alpha = 0.5 * (sigma**2 * S_int**2) / dS ** 2
+    beta = 0.5 * ((r-q) * S_int) / dS
 
-        L[i] = alpha - beta
-        D[i] = -2 * alpha - r
-        U[i] = alpha + beta
+    L[..., 1:-1] = alpha - beta
+    D[..., 1:-1] = -2 * alpha - r
+    U[..., 1:-1] = alpha + beta
 
     return L, D, U
 
+
+# Black–Scholes operator in x = ln S. The coefficients no longer depend on the node, so the operator is returned as
+# the three scalars (l, d, u) of a constant-coefficient tri-diagonal stencil on a uniform x grid with spacing dx.
+def bs_log_operator(dx, r, q, sigma):
+    drift = r - q - 0.5 * sigma**2
+
+    alpha = 0.5 * sigma**2 / dx ** 2
+    beta = 0.5 * drift / dx
+
+    return alpha - beta, -2 * alpha - r, alpha + beta
@@ -0,0 +1,89 @@
+import numpy as np
+from scipy.linalg import solve_banded, get_lapack_funcs
+
+from amopt.uniform.jit import use_jit, thomas_solve
+
+
+# Crank–Nicolson explicit half-step: R = L_exp * V[k-1] + D_exp * V[k] + U_exp * V[k+1] on the interior nodes.
+# Works on a single slice of shape (n_nodes,) or on a stack of slices of shape (n_options, n_nodes).
+def explicit_rhs(L_exp, D_exp, U_exp, V, out=None):
+    if out is None:
+        out = np.zeros(np.shape(V))
+    else:
+        out[..., 0] = 0.0
+        out[..., -1] = 0.0
+
+    out[..., 1:-1] = (L_exp[..., 1:-1] * V[..., :-2]) + (D_exp[..., 1:-1] * V[..., 1:-1]) + (U_exp[..., 1:-1] * V[..., 2:])
+    return out
+
+
+# Solves the tri-diagonal system on the interior nodes 1 ... n_nodes-2 (boundary values are injected into R by the
+# caller) using LAPACK's banded solver instead of a Python Thomas sweep.
+# Stacked systems of shape (n_options, n_nodes) are solved in one call by laying them out as a single block-diagonal
+# banded matrix, the coupling between neighbouring blocks being zero. On the numba backend a single system is solved
+# by the compiled Thomas kernel instead. A Workspace, if given, provides the banded matrix buffer.
+def solve_interior(L_imp, D_imp, U_imp, R, out=None, workspace=None):
+    R = np.asarray(R)
+    n_nodes = R.shape[-1]
+    n_int = n_nodes - 2
+    batch_shape = R.shape[:-1]
+
+    lower = np.broadcast_to(L_imp, R.shape)[..., 1:-1]
+    diag = np.broadcast_to(D_imp, R.shape)[..., 1:-1]
+    upper = np.broadcast_to(U_imp, R.shape)[..., 1:-1]
+
+    # Single system on the numba backend: compiled Thomas sweep
+    if use_jit() and R.ndim == 1:
+        if out is None:
+            out = np.zeros(R.shape)
+        else:
+            out[0] = 0.0
+            out[-1] = 0.0
+        out[1:-1] = thomas_solve(np.ascontiguousarray(lower, dtype=float), np.ascontiguousarray(diag, dtype=float),
+                                 np.ascontiguousarray(upper, dtype=float), np.ascontiguousarray(R[1:-1], dtype=float))
+        return out
+
+    # LAPACK banded storage: row 0 = super-diagonal (shifted right), row 1 = diagonal, row 2 = sub-diagonal
+    if workspace is None:
+        ab = np.zeros((3,) + batch_shape + (n_int,), dtype=np.result_type(diag, R))
+    else:
+        ab = workspace.get('banded', (3,) + batch_shape + (n_int,))
+        ab[0][..., 0] = 0.0
+        ab[2][..., -1] = 0.0
+    ab[0][..., 1:] = upper[..., :-1]
+    ab[1] = diag
+    ab[2][..., :-1] = lower[..., 1:]
+
+    solution = solve_banded((1, 1), ab.reshape(3, -1), R[..., 1:-1].reshape(-1),
+                            overwrite_ab=True, check_finite=False)
+
+    if out is None:
+        out = np.zeros(R.shape, dtype=solution.dtype)
+    else:
+        out[..., 0] = 0.0
+        out[..., -1] = 0.0
+
+    out[..., 1:-1] = solution.reshape(batch_shape + (n_int,))
+    return out
+
+
+# LU factorisation of a tri-diagonal matrix (LAPACK gttrf) for systems whose matrix does not change between time
+# steps. lower and upper have length n-1, diag has length n.
+def factorise_tridiagonal(lower, diag, upper):
+    diag = np.asarray(diag)
+    gttrf, = get_lapack_funcs(('gttrf',), (diag,))
+    dl, d, du, du2, ipiv, info = gttrf(lower, diag, upper)
+    if info != 0:
+        raise np.linalg.LinAlgError("singular tri-diagonal matrix")
+
+    return dl, d, du, du2, ipiv
+
+
+# Forward/back substitution with a factorise_tridiagonal factor (LAPACK gttrs). R may be a single right-hand side of
+# shape (n,) or several right-hand sides stacked as columns of shape (n, n_rhs).
+def solve_factorised(factor, R):
+    dl, d, du, du2, ipiv = factor
+    gttrs, = get_lapack_funcs(('gttrs',), (d,))
+    x, info = gttrs(dl, d, du, du2, ipiv, R)
+
+    return x